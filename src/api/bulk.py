@@ -1,8 +1,6 @@
 import asyncio
 import random
 
-import aiohttp
-
 
 def get_random_user_agent():
     if random.randint(0, 3) <= 2:
@@ -26,17 +24,20 @@ def get_random_user_agent():
 
 
 async def fetch_html(session, url):
+    from api.core import scrape_semaphore
     user_agent = get_random_user_agent()
     headers = {"User-agent": user_agent}
-    async with session.get(url, headers=headers) as response:
-        res = await response.text()
-        return res
+    async with scrape_semaphore:
+        async with session.get(url, headers=headers) as response:
+            res = await response.text()
+            return res
 
 
 async def fetch_htmls(urls):
-    async with aiohttp.ClientSession() as session:
-        tasks = [fetch_html(session, url) for url in urls]
-        return await asyncio.gather(*tasks)
+    from api.core import get_session
+    session = await get_session()
+    tasks = [fetch_html(session, url) for url in urls]
+    return await asyncio.gather(*tasks)
 
 
 async def fetch(urls):
@@ -1,17 +1,19 @@
+import asyncio
 import re
 
-import aiohttp
 from bs4 import BeautifulSoup
 
 from api.bulk import get_random_user_agent
+from api.core import get_session, scrape_semaphore
 from utils import urls, dates
 
 
 async def get_competition_info(date, period, sort="points", results_per_page=20, universe="play"):
     url = urls.competition(date, period, sort, results_per_page, universe)
     headers = {"User-Agent": get_random_user_agent()}
-    async with aiohttp.ClientSession(headers=headers) as session:
-        async with session.get(url) as response:
+    session = await get_session()
+    async with scrape_semaphore:
+        async with session.get(url, headers=headers) as response:
             if response.status != 200:
                 return None
             html = await response.text()
@@ -19,6 +21,10 @@ async def get_competition_info(date, period, sort="points", results_per_page=20,
     if "No results" in html:
         return None
 
+    return await asyncio.to_thread(parse_competition, html, date, period)
+
+
+def parse_competition(html, date, period):
     soup = BeautifulSoup(html, "html.parser")
     table = soup.find("table", class_="scoresTable")
 
@@ -58,8 +64,10 @@ async def get_competition_info(date, period, sort="points", results_per_page=20,
 
 
 async def get_competition(date, period):
-    point_competition = await get_competition_info(date, period, "points", 100)
-    race_competition = await get_competition_info(date, period, "races", 100)
+    point_competition, race_competition = await asyncio.gather(
+        get_competition_info(date, period, "points", 100),
+        get_competition_info(date, period, "races", 100),
+    )
     point_leaders = point_competition["competitors"]
     race_leaders = race_competition["competitors"]
 
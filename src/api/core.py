@@ -1,14 +1,15 @@
 import asyncio
 import base64
+import codecs
 import csv
 import sys
-from datetime import datetime, timezone
-from io import StringIO
+import time
 
 import aiohttp
 
 from api.bulk import get_random_user_agent
-from config import api_credentials
+from api.timestamps import date_to_timestamp, timestamp_to_date
+from config import api_credentials, api_requests_per_second, scrape_concurrency
 
 csv.field_size_limit(131072*2)
 
@@ -16,6 +17,8 @@ base_url = "https://data.typeracer.com/api/v1"
 session = None
 auth_index = 0
 index_lock = asyncio.Lock()
+next_request_times = {}
+scrape_semaphore = asyncio.Semaphore(scrape_concurrency)
 
 
 def auth_header(creds):
@@ -31,12 +34,29 @@ async def cycle_auth():
     async with index_lock:
         creds = api_credentials[auth_index]
         auth_index = (auth_index + 1) % len(api_credentials)
+
+        # Reserving the credential's next slot in its request budget
+        now = time.monotonic()
+        request_time = max(now, next_request_times.get(creds, 0))
+        next_request_times[creds] = request_time + 1 / api_requests_per_second
+
+    if request_time > now:
+        await asyncio.sleep(request_time - now)
+
     return auth_header(creds)
 
 
 async def start_session():
+    # One pooled session shared by the API client and the site scrapers, keeping connections alive
     global session
-    session = aiohttp.ClientSession()
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=60, ttl_dns_cache=300)
+    session = aiohttp.ClientSession(connector=connector)
+
+
+async def get_session():
+    if session is None or session.closed:
+        await start_session()
+    return session
 
 
 async def end_session():
@@ -44,14 +64,6 @@ async def end_session():
     await session.close()
 
 
-def date_to_timestamp(date):
-    return datetime.strptime(date, "%Y-%m-%d %H:%M:%S.%f").timestamp()
-
-
-def timestamp_to_date(timestamp):
-    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
-
-
 async def get(endpoint, params=None):
     url = base_url + endpoint
     headers = await cycle_auth()
@@ -60,35 +72,76 @@ async def get(endpoint, params=None):
         return await response.json()
 
 
-async def get_csv(endpoint, params=None):
+async def stream_csv(endpoint, params=None, chunk_size=65536):
+    # Yields batches of races as the response arrives, only handing complete
+    # records to the parser so quoted fields can span chunks and lines
     url = base_url + endpoint
     headers = await cycle_auth() | {"Accept": "text/csv"}
     async with session.get(url, headers=headers, params=params) as response:
         response.raise_for_status()
-        text = await response.text(encoding="utf-8", errors="replace")
-        return csv_to_dict(text)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        columns = {}
+        pending = []
+        partial = ""
+        quoted = False
+
+        def parse(lines):
+            rows = csv.reader(lines)
+            if not columns:
+                header = next(rows, None)
+                if header is None:
+                    return []
+                columns.update({name: i for i, name in enumerate(header)})
+            return rows_to_races(rows, columns)
+
+        async for chunk in response.content.iter_chunked(chunk_size):
+            lines = (partial + decoder.decode(chunk)).split("\n")
+            partial = lines.pop()
+            complete = []
+            for line in lines:
+                pending.append(line + "\n")
+                if line.count('"') % 2:
+                    quoted = not quoted
+                if not quoted:
+                    complete += pending
+                    pending = []
+
+            race_list = parse(complete) if complete else []
+            if race_list:
+                yield race_list
+
+        partial += decoder.decode(b"", final=True)
+        race_list = parse(pending + ([partial] if partial else []))
+        if race_list:
+            yield race_list
+
+
+def rows_to_races(rows, columns):
+    universe, race_id, text_id, skill_level, date, accuracy, wpm, points, number, racers, rank, keylog = (
+        columns[name] for name in [
+            "Universe", "Race ID", "Text ID", "Skill Level", "Date/Time (UTC)", "Accuracy",
+            "WPM", "Points", "Race #", "# Racers", "Rank", "Keylog",
+        ]
+    )
 
-
-def csv_to_dict(text):
     race_list = []
-    reader = csv.DictReader(StringIO(text))
-    rows = list(reader)
     for row in rows:
-        if float(row["WPM"]) == 0.0:
+        if not row or float(row[wpm]) == 0.0:
             continue
         race_list.append({
-            "univ": row["Universe"],
-            "rid": row["Race ID"],
-            "tid": int(row["Text ID"]),
-            "sl": row["Skill Level"],
-            "t": date_to_timestamp(row["Date/Time (UTC)"]),
-            "acc": 0.0 if row["Accuracy"] == "None" else float(row["Accuracy"]),
-            "wpm": float(row["WPM"]),
-            "pts": float(row["Points"]),
-            "rn": int(row["Race #"]),
-            "nr": int(row["# Racers"]),
-            "r": int(row["Rank"]),
-            "kl": row["Keylog"],
+            "univ": row[universe],
+            "rid": row[race_id],
+            "tid": int(row[text_id]),
+            "sl": row[skill_level],
+            "t": date_to_timestamp(row[date]),
+            "acc": 0.0 if row[accuracy] == "None" else float(row[accuracy]),
+            "wpm": float(row[wpm]),
+            "pts": float(row[points]),
+            "rn": int(row[number]),
+            "nr": int(row[racers]),
+            "r": int(row[rank]),
+            "kl": row[keylog],
         })
 
     return race_list
+
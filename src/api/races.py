@@ -1,6 +1,6 @@
 import copy
 
-from api.core import get, timestamp_to_date, date_to_timestamp, get_csv
+from api.core import get, timestamp_to_date, date_to_timestamp, stream_csv
 from database.main import texts
 from utils import logs
 from utils.stats import calculate_points
@@ -36,19 +36,19 @@ async def get_race(username, race_number, universe="play", get_typos=False, get_
 
 
 async def get_races_historical(username, universe, bucket):
-    data = await get_csv(f"/racers/{username}/historical/races", {
+    # Yields the bucket's races one parsed chunk at a time
+    async for race_list in stream_csv(f"/racers/{username}/historical/races", {
         "universe": universe,
         "bucket": bucket,
-    })
-
-    return data
+    }):
+        yield race_list
 
 
 async def get_race_details(data, get_typos=False, get_keystrokes=False):
     universe = data["univ"]
     global text_cache
     if not text_cache or universe != text_cache["universe"]:
-        text_list = texts.get_texts(as_dictionary=True, universe=universe)
+        text_list = texts.get_texts(as_dictionary=True, universe=universe, read_only=True)
         text_cache = {
             "universe": universe,
             "texts": text_list,
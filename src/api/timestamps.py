@@ -0,0 +1,64 @@
+import math
+from datetime import date
+
+import numpy as np
+
+# Dates from the API are UTC in a fixed "%Y-%m-%d %H:%M:%S.%f" layout
+epoch_ordinal = date(1970, 1, 1).toordinal()
+day_seconds = {}
+day_strings = {}
+
+
+def get_day_seconds(day):
+    seconds = day_seconds.get(day)
+    if seconds is None:
+        seconds = (date(int(day[:4]), int(day[5:7]), int(day[8:10])).toordinal() - epoch_ordinal) * 86400
+        day_seconds[day] = seconds
+
+    return seconds
+
+
+def date_to_timestamp(date_string):
+    seconds = (
+        get_day_seconds(date_string[:10]) + int(date_string[11:13]) * 3600
+        + int(date_string[14:16]) * 60 + int(date_string[17:19])
+    )
+    fraction = date_string[20:]
+
+    return seconds + int(fraction.ljust(6, "0")) / 1e6 if fraction else float(seconds)
+
+
+def dates_to_timestamps(date_strings):
+    # Batch version of date_to_timestamp, returns a float array
+    microseconds = np.array(date_strings, dtype="datetime64[us]").astype(np.int64)
+    seconds, fractions = np.divmod(microseconds, 1_000_000)
+
+    return seconds + fractions / 1e6
+
+
+def get_day_string(day):
+    day_string = day_strings.get(day)
+    if day_string is None:
+        day_string = date.fromordinal(day + epoch_ordinal).isoformat()
+        day_strings[day] = day_string
+
+    return day_string
+
+
+def timestamp_to_date(timestamp):
+    # Rounds to the microsecond the same way as datetime.fromtimestamp
+    fraction, seconds = math.modf(timestamp)
+    seconds = int(seconds)
+    microseconds = round(fraction * 1e6)
+    if microseconds >= 1_000_000:
+        seconds += 1
+        microseconds -= 1_000_000
+    elif microseconds < 0:
+        seconds -= 1
+        microseconds += 1_000_000
+
+    day, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+
+    return f"{get_day_string(day)} {hours:02d}:{minutes:02d}:{seconds:02d}.{microseconds:06d}"
@@ -0,0 +1,115 @@
+import random
+import sys
+import time
+
+from utils import logs, vectorized_logs
+
+# Compares the NumPy typing log engine against the list based one on a generated corpus,
+# then times both. Run from src with: python -m benchmarks.log_stats [corpus size]
+
+alphabet = "abcdefghijklmnopqrstuvwxyz,.'-;0123456789ABC"
+
+
+def make_log(rng, words=None):
+    quote = " ".join(
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 9)))
+        for _ in range(words or rng.randint(1, 120))
+    )
+
+    delay_data = ""
+    for i, char in enumerate(quote):
+        delay = rng.choice([0, 1, 1]) if i < 3 and rng.random() < 0.3 else rng.randint(20, 300)
+        if rng.random() < 0.02:
+            delay = rng.randint(1000, 5000)
+        delay_data += ("\x08" + char if char.isdigit() else char) + str(delay)
+
+    # Typing word by word with typos, substitutions, pasted runs and corrections
+    quote_words = [word + " " for word in quote.split(" ")]
+    quote_words[-1] = quote_words[-1][:-1]
+    actions = []
+    text_box = ""
+    word_index = 0
+    first = True
+    while word_index < len(quote_words):
+        delay = rng.randint(0, 300) if rng.random() > 0.02 else rng.randint(1000, 4000)
+        word = quote_words[word_index]
+        correct = len(text_box) <= len(word) and word.startswith(text_box)
+        next_char = word[len(text_box)] if correct and len(text_box) < len(word) else None
+        roll = rng.random()
+
+        if (not correct or roll < 0.05) and text_box:
+            operations = f"{len(text_box) - 1}-{text_box[-1]}"
+            text_box = text_box[:-1]
+        elif roll < 0.08 and text_box:
+            char = rng.choice(alphabet)
+            operations = f"{len(text_box) - 1}${char}"
+            text_box = text_box[:-1] + char
+        elif roll < 0.12 and next_char is not None:
+            char = rng.choice(alphabet)
+            operations = f"{len(text_box)}+{char}"
+            text_box += char
+        elif roll < 0.15 and next_char is not None:
+            operations = ""
+            for _ in range(rng.randint(2, 4)):
+                if len(text_box) < len(word) and word.startswith(text_box):
+                    operations += f"{len(text_box)}+{word[len(text_box)]}"
+                    text_box += word[len(text_box)]
+        elif next_char is not None:
+            operations = f"{len(text_box)}+{next_char}"
+            text_box += next_char
+        else:
+            continue
+
+        if not operations:
+            continue
+        # The first action carries the two leading fields of the action data
+        actions.append(f"{'1,2,' if first else ''}{delay},{operations},")
+        first = False
+        while word_index < len(quote_words) and text_box.startswith(quote_words[word_index]):
+            text_box = text_box[len(quote_words[word_index]):]
+            word_index += 1
+
+    return quote, delay_data, "".join(actions)
+
+
+def compare(corpus):
+    # Every field has to match exactly, including int/float types, since sums depend on them
+    mismatches = 0
+    for _, delay_data, action_data in corpus:
+        expected = logs.get_log_stats(delay_data, action_data, typos=True)
+        result = vectorized_logs.get_log_stats(delay_data, action_data, typos=True)
+        fields = [key for key in expected.keys() | result.keys() if repr(expected.get(key)) != repr(result.get(key))]
+        if fields:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"Mismatch in {', '.join(sorted(fields))}: {delay_data!r} {action_data!r}")
+
+    print(f"Compared {len(corpus):,} logs, {mismatches:,} mismatches")
+    return mismatches
+
+
+def benchmark(rng, words, races=300):
+    corpus = [make_log(rng, words)[1:] for _ in range(races)]
+    speeds = []
+    for engine in [logs.get_log_stats, vectorized_logs.get_log_stats]:
+        start = time.perf_counter()
+        for delay_data, action_data in corpus:
+            engine(delay_data, action_data)
+        speeds.append(races / (time.perf_counter() - start))
+
+    print(f"{words:>4} words: {speeds[0]:,.0f} races/s list based, {speeds[1]:,.0f} races/s NumPy")
+
+
+def main():
+    rng = random.Random(0)
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    mismatches = compare([make_log(rng) for _ in range(size)])
+
+    for words in [30, 60, 200]:
+        benchmark(rng, words)
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
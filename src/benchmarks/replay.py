@@ -0,0 +1,133 @@
+import random
+import re
+import sys
+import time
+
+from benchmarks.log_stats import make_log
+from utils import logs
+
+# Compares the typo replay against the original word joining implementation on a generated corpus,
+# then times both on long quotes. Run from src with: python -m benchmarks.replay [corpus size]
+
+action_pattern = re.compile(r"\d+,(?:\d+[+\-$].?)+,")
+
+
+def reference_mistakes(quote, action_list):
+    typos = []
+    typo_flag = False
+    quote_words = [word + " " for word in quote.split(" ")]
+    quote_words[-1] = quote_words[-1][:-1]
+    processed_actions = []
+
+    current_word_index = 0
+    completed_words = []
+    text_box = []
+
+    for action in action_list:
+        delay, action = action.split(",", 1)
+        delay = int(delay)
+        sub_list = re.findall(r"(\d+[+\-$].)", action)
+
+        for sub_action in sub_list:
+            operator = sub_action[-2]
+            index, char = int(sub_action[:-2]), sub_action[-1]
+
+            if operator == "+":
+                text_box.insert(index, char)
+            elif operator == "$":
+                text_box[index] = char
+            else:
+                text_box.pop(index)
+
+            current_word = quote_words[current_word_index]
+            text_string = "".join(text_box)
+
+            is_typo = text_string[:len(current_word)] != current_word[:len(text_string)]
+
+            if is_typo and not typo_flag and operator != "-":
+                typo_flag = True
+                typo_index = len("".join(completed_words) + "".join(text_box)) - 1
+                word = current_word.rstrip()
+                typos.append((current_word_index, typo_index, word))
+            elif not is_typo and typo_flag:
+                typo_flag = False
+
+        processed_actions.append({
+            "typoFlag": typo_flag,
+            "timeDelta": delay,
+            "input": "".join(completed_words) + "".join(text_box),
+            "targetWord": quote_words[current_word_index].strip(),
+        })
+
+        while "".join(text_box).startswith(quote_words[current_word_index]):
+            completed_words.append(quote_words[current_word_index])
+            current_word_index += 1
+            text_box = list("".join(text_box)[len(quote_words[current_word_index - 1]):])
+
+            if current_word_index >= len(quote_words):
+                break
+
+        if "".join(completed_words) == quote:
+            break
+
+    return typos, processed_actions
+
+
+def get_inputs(quote, processed_actions):
+    # Joins the input the same way the replay page does
+    return [{
+        "typoFlag": action["typoFlag"],
+        "timeDelta": action["timeDelta"],
+        "input": quote[:action["completed"]] + action["textBox"],
+        "targetWord": action["targetWord"],
+    } for action in processed_actions]
+
+
+def get_actions(rng, words=None):
+    quote, _, action_data = make_log(rng, words)
+    return quote, action_pattern.findall(action_data)
+
+
+def compare(corpus):
+    mismatches = 0
+    for quote, actions in corpus:
+        typos, processed_actions = logs.get_mistakes(quote, actions)
+        if (typos, get_inputs(quote, processed_actions)) != reference_mistakes(quote, actions):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"Mismatch: {quote!r} {actions!r}")
+
+    print(f"Compared {len(corpus):,} logs, {mismatches:,} mismatches")
+    return mismatches
+
+
+def benchmark(rng, words, races=20):
+    corpus = [get_actions(rng, words) for _ in range(races)]
+    times = []
+    for replay in [reference_mistakes, logs.get_mistakes]:
+        start = time.perf_counter()
+        for quote, actions in corpus:
+            replay(quote, actions)
+        times.append((time.perf_counter() - start) / races * 1000)
+
+    characters = sum(len(quote) for quote, _ in corpus) // races
+    actions = sum(len(actions) for _, actions in corpus) // races
+    print(
+        f"{characters:>6,} characters, {actions:,} actions: "
+        f"{times[0]:,.1f}ms original, {times[1]:,.1f}ms incremental"
+    )
+
+
+def main():
+    rng = random.Random(0)
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    mismatches = compare([get_actions(rng) for _ in range(size)])
+
+    for words in [100, 400, 1000, 2000]:
+        benchmark(rng, words)
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
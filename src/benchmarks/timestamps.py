@@ -0,0 +1,92 @@
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from api.timestamps import date_to_timestamp, dates_to_timestamps, timestamp_to_date
+
+# Compares the timestamp codec against strptime and strftime around DST changes, leap days
+# and year ends, then times both. Run from src with: python -m benchmarks.timestamps [dates per day]
+
+date_format = "%Y-%m-%d %H:%M:%S.%f"
+
+# US and EU DST changes, leap days with the days around them, and year ends
+boundary_days = [
+    "2010-03-14", "2010-11-07", "2016-03-13", "2016-11-06", "2024-03-10", "2024-11-03",
+    "2010-03-28", "2010-10-31", "2019-03-31", "2019-10-27", "2024-03-31", "2024-10-27",
+    "2008-02-28", "2008-02-29", "2008-03-01", "2012-02-29", "2016-02-29", "2020-02-29", "2024-02-29",
+    "2023-02-28", "2023-03-01", "2025-02-28", "2025-03-01",
+    "2008-12-31", "2009-01-01", "2015-12-31", "2016-01-01", "2024-12-31", "2025-01-01",
+]
+
+
+def reference_timestamp(date_string):
+    return datetime.strptime(date_string, date_format).replace(tzinfo=timezone.utc).timestamp()
+
+
+def reference_date(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime(date_format)
+
+
+def make_dates(rng, per_day):
+    # Every second around midnight and the DST change hours, plus random times, with varied fraction lengths
+    date_strings = []
+    for day in boundary_days:
+        start = datetime.strptime(day, "%Y-%m-%d")
+        seconds = [*range(-120, 120), *range(3600 - 60, 3 * 3600 + 60, 7)]
+        seconds += [rng.randrange(86400) for _ in range(per_day)]
+        for second in seconds:
+            date_string = (start + timedelta(seconds=second)).strftime("%Y-%m-%d %H:%M:%S")
+            digits = rng.randint(1, 6)
+            date_strings.append(f"{date_string}.{rng.randrange(10 ** digits):0{digits}d}")
+
+    return date_strings
+
+
+def compare(date_strings):
+    mismatches = 0
+    batch = dates_to_timestamps(date_strings).tolist()
+    for date_string, batch_timestamp in zip(date_strings, batch):
+        expected = reference_timestamp(date_string)
+        timestamp = date_to_timestamp(date_string)
+        if timestamp != expected or batch_timestamp != expected or timestamp_to_date(expected) != reference_date(expected):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"Mismatch: {date_string} {expected!r} {timestamp!r} {batch_timestamp!r}")
+
+    print(f"Compared {len(date_strings):,} dates, {mismatches:,} mismatches")
+    return mismatches
+
+
+def time_per_date(function, values):
+    start = time.perf_counter()
+    function(values)
+    return (time.perf_counter() - start) / len(values) * 1e6
+
+
+def benchmark(date_strings):
+    timestamps = [reference_timestamp(date_string) for date_string in date_strings]
+    results = [
+        ("strptime", time_per_date(lambda values: [reference_timestamp(value) for value in values], date_strings)),
+        ("date_to_timestamp", time_per_date(lambda values: [date_to_timestamp(value) for value in values], date_strings)),
+        ("dates_to_timestamps", time_per_date(dates_to_timestamps, date_strings)),
+        ("strftime", time_per_date(lambda values: [reference_date(value) for value in values], timestamps)),
+        ("timestamp_to_date", time_per_date(lambda values: [timestamp_to_date(value) for value in values], timestamps)),
+    ]
+
+    for name, microseconds in results:
+        print(f"{name:>20}: {microseconds:.2f}us per date")
+
+
+def main():
+    rng = random.Random(0)
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    mismatches = compare(make_dates(rng, per_day))
+
+    benchmark(make_dates(rng, 5000))
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import asyncio
-import zlib
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 from aiohttp import ClientResponseError
 from discord import Embed
@@ -7,23 +9,30 @@ from discord.ext import commands
 
 import database.main.club_races as club_races
 import database.main.competition_results as competition_results
+import database.main.leaderboards as leaderboards
 import database.main.races as races
 import database.main.text_results as text_results
 import database.main.texts as texts
 import database.main.users as users
-from api.core import date_to_timestamp
 from api.races import get_races, get_universe_multiplier, get_races_historical
 from api.texts import get_text
+from api.timestamps import dates_to_timestamps
 from api.users import get_stats, get_racer, get_joined
 from commands.locks import import_lock
 from commands.stats.stats import get_args
+from config import import_concurrency, log_workers, sync_interval
 from database.bot.users import get_user
-from database.main import deleted_races, typing_logs
-from utils import errors, colors, strings, logs, dates
+from database.main import deleted_races, typing_logs, race_cache
+from utils import errors, colors, strings, logs, dates, workers
 from utils.embeds import Page, Message, is_embed
 from utils.logging import log
 from utils.stats import calculate_points, calculate_ms
 
+log_executor = None
+recent_syncs = {}
+pending_syncs = {}
+sync_counts = {"hits": 0, "misses": 0, "joined": 0}
+
 command = {
     "name": "download",
     "aliases": ["getdata", "import", "dl", "gd", "i"],
@@ -119,16 +128,18 @@ async def run(username=None, racer={}, ctx=None, bot_user=None, universe="play")
                 raise e
 
     if not user_data:
-        users.create_user_data(racer)
+        await users.create_user_data(racer)
     if not user_stats:
-        users.create_user_stats(racer)
+        await users.create_user_stats(racer)
 
-    users.update_user_data(racer)
-    users.update_user_stats(racer)
+    await users.update_user_data(racer)
+    await users.update_user_stats(racer)
 
     if races_left > 0:
-        users.update_user_aggregate_stats(username, universe, points_retroactive, total_time, characters)
-        users.update_text_stats(username, universe)
+        await users.update_user_aggregate_stats(username, universe, points_retroactive, total_time, characters)
+        await users.update_text_stats(username, universe)
+        if universe == "play":
+            leaderboards.mark_stale(leaderboards.import_categories)
 
     if invoked:
         await send_completion(ctx, bot_user, username, races_left, universe)
@@ -140,6 +151,60 @@ async def run(username=None, racer={}, ctx=None, bot_user=None, universe="play")
         log(f"Finished importing {username}")
 
 
+async def sync_user(username, universe="play"):
+    # Fetches a user's profile and imports any new races, reusing a sync from the last
+    # few seconds and sharing one in progress between concurrent callers
+    key = (universe, username)
+    prune_syncs()
+    recent = recent_syncs.get(key)
+    if recent:
+        sync_counts["hits"] += 1
+        return dict(recent[1])
+
+    task = pending_syncs.get(key)
+    if task:
+        sync_counts["joined"] += 1
+    else:
+        sync_counts["misses"] += 1
+        task = asyncio.create_task(run_sync(key, username, universe))
+        pending_syncs[key] = task
+
+    stats = await asyncio.shield(task)
+
+    return dict(stats) if stats else stats
+
+
+async def run_sync(key, username, universe):
+    try:
+        stats = await get_stats(username, universe=universe)
+        if stats:
+            await run(racer=dict(stats), universe=universe)
+            # Re-inserting keeps the syncs ordered oldest first for pruning
+            recent_syncs.pop(key, None)
+            recent_syncs[key] = (time.monotonic(), stats)
+        return stats
+    finally:
+        pending_syncs.pop(key, None)
+
+
+def prune_syncs():
+    now = time.monotonic()
+    while recent_syncs:
+        key, (synced_at, _) = next(iter(recent_syncs.items()))
+        if now - synced_at < sync_interval:
+            break
+        del recent_syncs[key]
+
+
+def get_sync_stats():
+    prune_syncs()
+    return dict(
+        recent=len(recent_syncs),
+        pending=len(pending_syncs),
+        **sync_counts,
+    )
+
+
 def extract_racer_data(stats):
     return dict(
         username=stats["username"],
@@ -167,7 +232,6 @@ async def process_races(race_list, universe, username, imported_races, batch_siz
     for i in range(0, len(race_list), batch_size):
         batch = race_list[i:i + batch_size]
         races_batch = []
-        logs_batch = []
 
         for race_data in batch:
             race = await processor.process_race(universe, username, race_data)
@@ -177,19 +241,26 @@ async def process_races(race_list, universe, username, imported_races, batch_siz
             number = race["number"]
             if number not in seen:
                 seen.add(number)
-                characters += race["characters"]
-                total_time += race["duration"]
-                if race["retroactive"]:
-                    points_retroactive += race["points"]
-
                 races_batch.append(race)
-                if race["typing_log"]:
-                    logs_batch.append(race)
 
+        await processor.process_logs(races_batch, universe)
+
+        # Races stored by an earlier import are skipped, so the totals and rollups count each race once
         if races_batch:
-            races.add_races(races_batch)
+            races_batch = await races.add_races(races_batch)
+
+        logs_batch = []
+        for race in races_batch:
+            characters += race["characters"]
+            total_time += race["duration"]
+            if race["retroactive"]:
+                points_retroactive += race["points"]
+            if race["typing_log"]:
+                logs_batch.append(race)
+
+        race_cache.add_races(username, universe, races_batch)
         if logs_batch:
-            typing_logs.add_logs(logs_batch)
+            await typing_logs.add_logs(logs_batch)
 
         del races_batch, logs_batch, batch
         await asyncio.sleep(0.1)
@@ -206,8 +277,8 @@ async def get_recent_races(username, universe, start_time):
         if not race_data:
             break
 
-        for i in range(len(race_data)):
-            race_data[i]["t"] = date_to_timestamp(race_data[i]["t"])
+        for race, timestamp in zip(race_data, dates_to_timestamps([race["t"] for race in race_data]).tolist()):
+            race["t"] = timestamp
 
         race_list += race_data
         end_time = min(race_data, key=lambda r: r["t"])["t"] - 0.0001
@@ -216,28 +287,81 @@ async def get_recent_races(username, universe, start_time):
     return race_list
 
 
-async def get_historical_races(username, universe, cutoff, imported_races):
+async def get_historical_races(username, universe, cutoff, imported_races, min_races=500):
     races_left = cutoff - imported_races
-    all_historical_races = []
-
-    if races_left > 0:
-        log(f"Downloading {races_left:,} historical races in chunks")
-        bucket = cutoff // 1000
-        final_bucket = imported_races // 1000
+    if races_left <= 0:
+        return
+
+    # Buckets stream concurrently into small queues and are read back in order,
+    # so only a few parsed chunks per bucket are held at once
+    log(f"Downloading {races_left:,} historical races in chunks")
+    buckets = iter(range(cutoff // 1000, imported_races // 1000 - 1, -1))
+    pending = deque()
+
+    def schedule():
+        while len(pending) < import_concurrency:
+            bucket = next(buckets, None)
+            if bucket is None:
+                break
+            queue = asyncio.Queue(maxsize=4)
+            pending.append((bucket, queue, asyncio.create_task(fetch_bucket(username, universe, bucket, queue))))
+
+    historical_races = []
+    schedule()
+    try:
+        while pending:
+            bucket, queue, _ = pending[0]
+            race_list = await queue.get()
+            if isinstance(race_list, Exception):
+                raise race_list
+
+            if race_list is None:
+                pending.popleft()
+                schedule()
+                log(f"Fetched races {max(bucket * 1000, 1):,} - {min(bucket * 1000 + 999, cutoff):,}")
+                continue
 
-        while bucket >= final_bucket:
-            race_list = await get_races_historical(username, universe, bucket)
-            all_historical_races.extend(race_list)
-            log(f"Fetched races {max(bucket * 1000, 1):,} - {min(bucket * 1000 + 999, cutoff):,}")
+            # Grouping small chunks so each batch of processing isn't just a handful of races
+            historical_races += race_list
+            if len(historical_races) >= min_races:
+                yield historical_races
+                historical_races = []
+    finally:
+        for _, _, task in pending:
+            task.cancel()
+
+    if historical_races:
+        yield historical_races
+
+
+async def fetch_bucket(username, universe, bucket, queue, retries=3, max_wait=60):
+    # Puts each parsed chunk on the queue, then None when done or the error that stopped it
+    # Rate limits are only retried before any races arrived, so no chunk is sent twice
+    try:
+        for attempt in range(retries + 1):
+            streamed = False
+            try:
+                async for race_list in get_races_historical(username, universe, bucket):
+                    streamed = True
+                    await queue.put(race_list)
+                break
+            except ClientResponseError as e:
+                if streamed or e.status != 429 or attempt == retries:
+                    raise e
 
-            if len(all_historical_races) >= 5000:
-                yield all_historical_races
-                all_historical_races = []
+                try:
+                    wait = float(e.headers.get("Retry-After"))
+                except (AttributeError, TypeError, ValueError):
+                    wait = 2 ** attempt
+                if wait > max_wait:
+                    raise e
 
-            bucket -= 1
+                log(f"Rate limited on bucket {bucket}, retrying in {wait:,.0f}s")
+                await asyncio.sleep(wait)
 
-    if all_historical_races:
-        yield all_historical_races
+        await queue.put(None)
+    except Exception as e:
+        await queue.put(e)
 
 
 async def send_start(ctx, bot_user, username, races_left, universe):
@@ -311,7 +435,7 @@ class RaceProcesser:
             return None
         elif wpm == 0.0:
             log(f"Adding deleted race {race_id}")
-            deleted_races.add_race(universe, username, number, typing_log)
+            await deleted_races.add_race(universe, username, number, typing_log)
             return None
 
         # Checking for new texts
@@ -333,25 +457,13 @@ class RaceProcesser:
             points = calculate_points(quote, wpm)
             retroactive = True
 
-        # Typing log data
-        multiplier = get_universe_multiplier(universe)
+        # Typing logs are parsed afterwards in process_logs
         if not typing_log:
             race.update({
                 "unlagged": wpm,
                 "adjusted": wpm,
                 "duration": calculate_ms(quote, wpm)
             })
-        else:
-            try:
-                delay_data, action_data = logs.split_log(typing_log)
-            except TypeError:
-                typing_log = zlib.decompress(typing_log).decode("utf-8")
-                delay_data, action_data = logs.split_log(typing_log)
-            if not action_data:
-                log_details = logs.get_old_log_stats(delay_data, quote, multiplier)
-            else:
-                log_details = logs.get_log_stats(delay_data, action_data, multiplier)
-            race.update(log_details)
 
         return dict(
             universe=universe,
@@ -366,9 +478,9 @@ class RaceProcesser:
             racers=race["nr"],
             race_id=race["rid"],
             timestamp=race["t"],
-            unlagged=race["unlagged"],
-            adjusted=race["adjusted"],
-            duration=race["duration"],
+            unlagged=race.get("unlagged", None),
+            adjusted=race.get("adjusted", None),
+            duration=race.get("duration", None),
             raw_adjusted=race.get("raw_adjusted", None),
             pauseless_adjusted=race.get("pauseless_adjusted", None),
             start=race.get("start", None),
@@ -378,6 +490,36 @@ class RaceProcesser:
             retroactive=retroactive,
         )
 
+    async def process_logs(self, race_list, universe):
+        log_races = [race for race in race_list if race["typing_log"]]
+        if not log_races:
+            return
+
+        multiplier = get_universe_multiplier(universe)
+        jobs = [
+            (race["typing_log"], self.text_list[race["text_id"]]["quote"], multiplier)
+            for race in log_races
+        ]
+
+        loop = asyncio.get_running_loop()
+        executor = get_log_executor()
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(executor, logs.get_import_stats_batch, jobs[i:i + 100])
+            for i in range(0, len(jobs), 100)
+        ])
+
+        results = [result for chunk in chunks for result in chunk]
+        for race, (typing_log, log_details) in zip(log_races, results):
+            race["typing_log"] = typing_log
+            race.update(log_details)
+
+
+def get_log_executor():
+    global log_executor
+    if log_executor is None:
+        log_executor = ProcessPoolExecutor(max_workers=log_workers, mp_context=workers.get_context())
+    return log_executor
+
 
 def rate_limit_exceeded():
     return Embed(
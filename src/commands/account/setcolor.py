@@ -1,11 +1,13 @@
+from functools import partial
+
 from discord import Embed, File
 from discord.ext import commands
 
 from config import prefix, bot_owner
 from database.bot.users import get_user, update_colors
-from graphs import sample_graph
+from graphs import sample_graph, renderer
 from graphs.core import plt
-from utils import errors, colors, strings, files
+from utils import errors, colors, strings
 
 elements = {
     "embed": "Embed",
@@ -122,14 +124,12 @@ async def run(ctx, user, element, color):
 
     update_colors(ctx.author.id, user["colors"])
 
-    file_name = sample_graph.render(user)
+    image = await renderer.render(partial(sample_graph.render, user))
 
-    file = File(file_name, filename=file_name)
-    embed.set_image(url=f"attachment://{file_name}")
+    file = File(image, filename=image.name)
+    embed.set_image(url=f"attachment://{image.name}")
     await ctx.send(embed=embed, file=file)
 
-    files.remove_file(file_name)
-
 
 async def view(ctx, user):
     user_colors = user["colors"]
@@ -157,19 +157,17 @@ async def view(ctx, user):
 async def reset(ctx, user):
     user["colors"] = colors.default_colors
     update_colors(ctx.author.id, user["colors"])
-    file_name = sample_graph.render(user)
+    image = await renderer.render(partial(sample_graph.render, user))
 
     embed = Embed(
         title=f"Colors Reset To Default",
         color=user["colors"]["embed"],
     )
 
-    file = File(file_name, filename=file_name)
-    embed.set_image(url=f"attachment://{file_name}")
+    file = File(image, filename=image.name)
+    embed.set_image(url=f"attachment://{image.name}")
     await ctx.send(embed=embed, file=file)
 
-    files.remove_file(file_name)
-
 
 def invalid_color():
     return Embed(
@@ -119,10 +119,10 @@ async def run(ctx, user, username):
     new_races, log_list, points_retroactive, total_time, characters = await process_races(
         found_races, universe, username, 0
     )
-    races.add_races(new_races)
-    typing_logs.add_logs(log_list)
-    users.update_user_aggregate_stats(username, universe, points_retroactive, total_time, characters)
-    users.update_text_stats(username, universe)
+    await races.add_races(new_races)
+    await typing_logs.add_logs(log_list)
+    await users.update_user_aggregate_stats(username, universe, points_retroactive, total_time, characters)
+    await users.update_text_stats(username, universe)
 
     skipped_groups = []
     for group in group_numbers([r["rn"] for r in found_races], proximity=1):
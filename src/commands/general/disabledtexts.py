@@ -27,7 +27,7 @@ async def run(ctx, user):
     disabled_text_ids = texts.get_disabled_text_ids()
     description = ", ".join([
         f"[{text_id}]({urls.trdata_text(text_id)})"
-        for text_id in disabled_text_ids
+        for text_id in sorted(disabled_text_ids)
     ])
 
     embed = Embed(
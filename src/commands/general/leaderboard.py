@@ -4,17 +4,15 @@ from discord import File
 from discord.ext import commands
 
 import database.main.competition_results as competition_results
+import database.main.leaderboards as leaderboards
 import database.main.text_results as top_tens
 import database.main.texts as texts
 import database.main.users as users
-from commands.locks import leaderboard_lock
 from config import prefix
 from database.bot.users import get_user
-from database.main.alts import get_alts
-from database.main.users import get_disqualified_users
+from database.main.leaderboards import filter_users
 from utils import errors, urls, strings, dates, files
 from utils.embeds import Page, Message
-from utils.errors import command_in_use
 
 categories = [
     "races", "wins", "points", "awards", "textbests", "textstyped", "toptens", "textrepeats",
@@ -38,29 +36,25 @@ class Leaderboard(commands.Cog):
 
     @commands.command(aliases=command["aliases"])
     async def leaderboard(self, ctx, *args):
-        if leaderboard_lock.locked():
-            return await ctx.send(embed=command_in_use())
+        user = get_user(ctx)
+        secondary = None
 
-        async with leaderboard_lock:
-            user = get_user(ctx)
-            secondary = None
+        if not args:
+            return await ctx.send(embed=errors.missing_argument(command))
 
-            if not args:
-                return await ctx.send(embed=errors.missing_argument(command))
+        category_string = args[0]
 
-            category_string = args[0]
-
-            if category_string.isnumeric() and 1 <= int(category_string) <= 10:
-                category = category_string
-            else:
-                category = strings.get_category(categories, category_string)
-                if not category:
-                    return await ctx.send(embed=errors.invalid_choice("category", categories))
+        if category_string.isnumeric() and 1 <= int(category_string) <= 10:
+            category = category_string
+        else:
+            category = strings.get_category(categories, category_string)
+            if not category:
+                return await ctx.send(embed=errors.invalid_choice("category", categories))
 
-            if len(args) > 1:
-                secondary = args[1]
+        if len(args) > 1:
+            secondary = args[1]
 
-            await run(ctx, user, category, secondary)
+        await run(ctx, user, category, secondary)
 
 
 async def run(ctx, user, category, secondary):
@@ -69,37 +63,37 @@ async def run(ctx, user, category, secondary):
 
     if category == "races":
         title = "Races"
-        description = leaderboard_races()
+        description = await leaderboard_races()
 
     elif category == "wins":
         title = "Wins"
-        description = leaderboard_wins()
+        description = await leaderboard_wins()
 
     elif category == "points":
         title = "Points"
-        description = leaderboard_points()
+        description = await leaderboard_points()
 
     elif category == "awards":
         title = "Awards"
-        description = leaderboard_awards()
+        description = await leaderboard_awards()
         total_competitions = competition_results.get_competition_count()
         page.footer = f"Across {total_competitions:,} competitions"
 
     elif category == "textbests":
         title = "Text Bests"
-        description = leaderboard_text_bests()
+        description = await leaderboard_text_bests()
         text_count = texts.get_text_count()
         min_texts = int(text_count * 0.2)
         page.footer = f"Minimum {min_texts:,} Texts Typed (20%)"
 
     elif category == "textstyped":
         title = "Texts Typed"
-        description = leaderboard_texts_typed()
+        description = await leaderboard_texts_typed()
 
     elif category == "textrepeats":
         if secondary is None:
             title = "Text Repeats"
-            description = leaderboard_text_repeats()
+            description = await leaderboard_text_repeats()
         else:
             text_id = secondary
             text = texts.get_text(text_id)
@@ -111,23 +105,23 @@ async def run(ctx, user, category, secondary):
 
     elif category == "totaltextwpm":
         title = "Total Text WPM"
-        description = leaderboard_total_text_wpm()
+        description = await leaderboard_total_text_wpm()
 
     elif category == "wpm":
         title = "Best WPM"
-        description = leaderboard_wpm()
+        description = await leaderboard_wpm()
 
     elif category == "racetime":
         title = "Race Time"
-        description = leaderboard_race_time()
+        description = await leaderboard_race_time()
 
     elif category == "characters":
         title = "Characters Typed"
-        description = leaderboard_characters()
+        description = await leaderboard_characters()
 
     elif category == "captcha":
         title = "Captcha WPM"
-        description = leaderboard_captcha()
+        description = await leaderboard_captcha()
 
     elif category in ["racesover", "textsover"]:
         try:
@@ -156,7 +150,7 @@ async def run(ctx, user, category, secondary):
             return await export_top_n(ctx, n)
 
         title = f"Top {n} Appearances"
-        description, text_count, user_count = leaderboard_top_n(n)
+        description, text_count, user_count = await leaderboard_top_n(n)
         page.footer = f"{text_count:,} total texts\n{user_count:,} total users"
 
     page.title = title + " Leaderboard"
@@ -170,39 +164,13 @@ async def run(ctx, user, category, secondary):
     await message.send()
 
 
-def filter_users(user_list):
-    countries = users.get_countries()
-    alts = get_alts()
-    filtered = []
-    added_users = set()
-    banned_users = get_disqualified_users()
-
-    i = 0
-    for user in user_list:
-        user = dict(user)
-        username = user["username"]
-        if username in banned_users:
-            continue
-        alt_accounts = {username} | set(alts.get(username, []))
-
-        if not alt_accounts & added_users:
-            user["country"] = countries.get(username, None)
-            filtered.append(user)
-            added_users.update(alt_accounts)
-            i += 1
-            if i == 20:
-                break
-
-    return filtered
-
-
 def user_rank(user, i):
     flag = f":flag_{user['country']}: " if user['country'] else ""
     return f"{strings.rank(i + 1)} {flag}{user['username']}"
 
 
-def leaderboard_races():
-    leaders = filter_users(users.get_most("races", 30))
+async def leaderboard_races():
+    leaders = await leaderboards.get_leaders("races")
     description = ""
     for i, leader in enumerate(leaders):
         description += f"{user_rank(leader, i)} - {leader['races']:,}\n"
@@ -210,8 +178,8 @@ def leaderboard_races():
     return description
 
 
-def leaderboard_wins():
-    leaders = filter_users(users.get_most("wins", 30))
+async def leaderboard_wins():
+    leaders = await leaderboards.get_leaders("wins")
     description = ""
     for i, leader in enumerate(leaders):
         description += f"{user_rank(leader, i)} - {leader['wins']:,}\n"
@@ -219,8 +187,8 @@ def leaderboard_wins():
     return description
 
 
-def leaderboard_points():
-    leaders = filter_users(users.get_most_total_points(30))
+async def leaderboard_points():
+    leaders = await leaderboards.get_leaders("points")
     description = ""
     for i, leader in enumerate(leaders):
         description += f"{user_rank(leader, i)} - {leader['points_total']:,.0f}\n"
@@ -228,8 +196,8 @@ def leaderboard_points():
     return description
 
 
-def leaderboard_awards():
-    leaders = filter_users(users.get_most_awards(30))
+async def leaderboard_awards():
+    leaders = await leaderboards.get_leaders("awards")
     description = ""
     for i, leader in enumerate(leaders):
         first = leader["awards_first"]
@@ -244,8 +212,8 @@ def leaderboard_awards():
     return description
 
 
-def leaderboard_text_bests():
-    leaders = filter_users(users.get_top_text_best(30))
+async def leaderboard_text_bests():
+    leaders = await leaderboards.get_leaders("textbests")
     description = ""
     for i, leader in enumerate(leaders):
         description += f"{user_rank(leader, i)} - {leader['text_best_average']:,.2f} WPM\n"
@@ -253,8 +221,8 @@ def leaderboard_text_bests():
     return description
 
 
-def leaderboard_texts_typed():
-    leaders = filter_users(users.get_most_texts_typed(30))
+async def leaderboard_texts_typed():
+    leaders = await leaderboards.get_leaders("textstyped")
     description = ""
     for i, leader in enumerate(leaders):
         min_repeats = leader["min_repeats"]
@@ -266,8 +234,8 @@ def leaderboard_texts_typed():
     return description
 
 
-def leaderboard_text_repeats():
-    leaders = filter_users(users.get_most("text_repeat_times", 30))
+async def leaderboard_text_repeats():
+    leaders = await leaderboards.get_leaders("textrepeats")
     description = ""
     for i, leader in enumerate(leaders):
         description += (
@@ -292,8 +260,8 @@ async def leaderboard_text_id_repeats(text_id):
     return description
 
 
-def leaderboard_total_text_wpm():
-    leaders = filter_users(users.get_most("text_wpm_total", 30))
+async def leaderboard_total_text_wpm():
+    leaders = await leaderboards.get_leaders("totaltextwpm")
     description = ""
     for i, leader in enumerate(leaders):
         description += (
@@ -304,8 +272,8 @@ def leaderboard_total_text_wpm():
     return description
 
 
-def leaderboard_wpm():
-    leaders = filter_users(users.get_best_wpm(50))
+async def leaderboard_wpm():
+    leaders = await leaderboards.get_leaders("wpm")
     description = ""
     for i, leader in enumerate(leaders):
         description += f"{user_rank(leader, i)} - {leader['wpm']:,.2f} WPM\n"
@@ -313,8 +281,8 @@ def leaderboard_wpm():
     return description
 
 
-def leaderboard_race_time():
-    leaders = filter_users(users.get_most("total_time", 30))
+async def leaderboard_race_time():
+    leaders = await leaderboards.get_leaders("racetime")
     description = ""
     for i, leader in enumerate(leaders):
         description += f"{user_rank(leader, i)} - {strings.format_duration(leader['total_time'] / 1000)}\n"
@@ -322,8 +290,8 @@ def leaderboard_race_time():
     return description
 
 
-def leaderboard_characters():
-    leaders = filter_users(users.get_most("characters", 30))
+async def leaderboard_characters():
+    leaders = await leaderboards.get_leaders("characters")
     description = ""
     for i, leader in enumerate(leaders):
         description += f"{user_rank(leader, i)} - {leader['characters']:,}\n"
@@ -331,8 +299,8 @@ def leaderboard_characters():
     return description
 
 
-def leaderboard_captcha():
-    leaders = filter_users(users.get_most("wpm_verified", 50))
+async def leaderboard_captcha():
+    leaders = await leaderboards.get_leaders("captcha")
     description = ""
     for i, leader in enumerate(leaders):
         description += f"{user_rank(leader, i)} - {leader['wpm_verified']:,.2f} WPM\n"
@@ -359,7 +327,7 @@ async def leaderboard_texts_over(wpm):
 
 
 async def leaderboard_performance():
-    leaders = filter_users(await users.get_most_performance())
+    leaders = await leaderboards.get_leaders("performance")
     description = ""
     for i, leader in enumerate(leaders):
         description += (
@@ -370,9 +338,9 @@ async def leaderboard_performance():
     return description
 
 
-def leaderboard_top_n(n):
+async def leaderboard_top_n(n):
     countries = users.get_countries()
-    leaders, text_count = top_tens.get_top_n_counts(n)
+    leaders, text_count = await top_tens.get_top_n_counts(n)
     description = ""
     for i, leader in enumerate(leaders[:20]):
         leader = {
@@ -386,7 +354,7 @@ def leaderboard_top_n(n):
 
 
 async def export_top_n(ctx, n):
-    leaders, text_count = top_tens.get_top_n_counts(n)
+    leaders, text_count = await top_tens.get_top_n_counts(n)
     export_data = {
         "timestamp": dates.now().timestamp(),
         "total_texts": text_count,
@@ -1,11 +1,11 @@
 import re
-from datetime import datetime, timezone
+from functools import partial
 
 from discord.ext import commands
 
 from commands.stats.stats import get_args
 from config import prefix
-from database.main import races, users
+from database.main import races, users, user_activity
 from database.bot.users import get_user
 from graphs import clock_graph, bar_graph
 from utils import errors, strings, dates
@@ -48,26 +48,30 @@ async def run(ctx, user, username, offset):
     if not stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    race_list = await races.get_races(
-        username, columns=["timestamp"], universe=universe,
-        start_date=user["start_date"], end_date=user["end_date"],
-        text_pool=user["settings"]["text_pool"],
-    )
-    if not race_list:
+    text_pool = user["settings"]["text_pool"]
+    if text_pool == "all" or universe != "play":
+        users.update_last_accessed(universe, username)
+        hour_counts = await user_activity.get_activity(
+            username, universe, user["start_date"], user["end_date"]
+        )
+    else:
+        race_list = await races.get_races(
+            username, columns=["timestamp"], universe=universe,
+            start_date=user["start_date"], end_date=user["end_date"],
+            text_pool=text_pool,
+        )
+        hour_counts = user_activity.count_races(race["timestamp"] for race in race_list)
+
+    race_count = sum(hour_counts)
+    if not race_count:
         return await ctx.send(embed=errors.no_races_in_range(universe))
 
-    daily = [0] * 24
-    weekly = [0] * 7
+    daily = [sum(hour_counts[hour::24]) for hour in range(24)]
     days = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
 
-    for race in race_list:
-        dt = datetime.fromtimestamp(race["timestamp"], timezone.utc)
-        hour = dt.hour
-        day = (dt.weekday() + 1) % 7
-        daily[hour] += 1
-        weekly[day] += 1
-
-    race_count = len(race_list)
+    # Weekdays follow the requested offset by rotating the hour of week bins
+    local_counts = hour_counts[-offset:] + hour_counts[:-offset] if offset else hour_counts
+    weekly = [sum(local_counts[day * 24:(day + 1) * 24]) for day in range(7)]
     daily_max_index = daily.index(max(daily))
     daily_min_index = daily.index(min(daily))
     weekly_max_index = weekly.index(max(weekly))
@@ -119,13 +123,13 @@ async def run(ctx, user, username, offset):
             title="Daily Typing Activity",
             description=daily_description,
             button_name="Daily",
-            render=lambda: clock_graph.render(user, username, daily, universe, offset),
+            render=partial(clock_graph.render, user, username, daily, universe, offset),
         ),
         Page(
             title="Weekly Typing Activity",
             description=weekly_description,
             button_name="Weekly",
-            render=lambda: bar_graph.render(user, username, weekly, universe),
+            render=partial(bar_graph.render, user, username, weekly, universe),
         )
     ]
 
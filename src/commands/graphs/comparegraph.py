@@ -1,3 +1,5 @@
+from functools import partial
+
 from discord.ext import commands
 
 from commands.texts.compare import get_args
@@ -55,11 +57,11 @@ async def run(ctx, user, username1, username2):
         text_bests2 = [(text["text_id"], text["wpm"]) for text in text_bests2]
 
     else:
-        text_bests1 = get_text_bests(username1, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
+        text_bests1 = await get_text_bests(username1, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
         if not text_bests1:
             return await ctx.send(embed=errors.import_required(username1, universe))
 
-        text_bests2 = get_text_bests(username2, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
+        text_bests2 = await get_text_bests(username2, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
         if not text_bests2:
             return await ctx.send(embed=errors.import_required(username2, universe))
 
@@ -153,7 +155,7 @@ async def run(ctx, user, username1, username2):
             Field(strings.escape_formatting(username1), stats1),
             Field(strings.escape_formatting(username2), stats2),
         ],
-        render=lambda: compare_graph.render(user, (username1, data1), (username2, data2), universe),
+        render=partial(compare_graph.render, user, (username1, data1), (username2, data2), universe),
     )
 
     message = Message(
@@ -1,4 +1,5 @@
 from collections import Counter
+from functools import partial
 from statistics import mode
 
 import numpy as np
@@ -79,7 +80,8 @@ async def run(ctx, user, username, category):
         description=distribution_stats,
         default=category == "wpm",
         button_name="WPM",
-        render=lambda: histogram.render(
+        render=partial(
+            histogram.render,
             user, username, wpm_values, "WPM", "WPM", "auto", universe
         ),
     )
@@ -105,7 +107,8 @@ async def run(ctx, user, username, category):
             description=distribution_stats,
             default=category == "accuracy",
             button_name="Accuracy",
-            render=lambda: histogram.render(
+            render=partial(
+                histogram.render,
                 user, username, accuracy_values, "Accuracy", "Accuracy %", bins, universe
             ),
         )
@@ -114,7 +117,7 @@ async def run(ctx, user, username, category):
         text_bests = await users.get_text_bests_time_travel(username, universe, user, wpm=wpm_metric, text_pool=text_pool)
         text_bests = [(text["text_id"], text["wpm"]) for text in text_bests]
     else:
-        text_bests = users.get_text_bests(username, universe=universe, wpm=wpm_metric, text_pool=text_pool)
+        text_bests = await users.get_text_bests(username, universe=universe, wpm=wpm_metric, text_pool=text_pool)
     text_best_values = [race[1] for race in text_bests]
     distribution_stats = get_distribution_stats(text_best_values, " WPM")
 
@@ -123,7 +126,8 @@ async def run(ctx, user, username, category):
         description=distribution_stats,
         default=category == "textbests",
         button_name="Text Bests",
-        render=lambda: histogram.render(
+        render=partial(
+            histogram.render,
             user, username, text_best_values, "Text Bests", "Text Bests", "auto", universe
         ),
     )
@@ -1,14 +1,15 @@
+from functools import partial
+
+import numpy as np
 from discord.ext import commands
 
-import database.main.races as races
 import database.main.users as users
-import utils.stats
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from commands.locks import LargeQueryLock
 from commands.races.races import get_args
 from config import prefix
 from database.bot.users import get_user
+from database.main import race_cache
 from database.main.texts import get_texts
 from graphs import improvement_graph
 from utils import errors, strings, dates
@@ -66,8 +67,7 @@ async def run(ctx, user, username, start_date, end_date, start_number, end_numbe
     wpm_metric = user["settings"]["wpm"]
 
     async with LargeQueryLock(stats["races"] > 100_000):
-        api_stats = await get_stats(username, universe=universe)
-        await download(racer=api_stats, universe=universe)
+        api_stats = await sync_user(username, universe)
         if era_string:
             api_stats = await users.filter_stats(api_stats, user)
 
@@ -81,79 +81,61 @@ async def run(ctx, user, username, start_date, end_date, start_number, end_numbe
 
         title = "WPM Improvement"
         suffix = "WPM"
-        columns = [wpm_metric, "timestamp", "text_id"]
+        race_columns = await race_cache.get_columns(username, universe)
         if start_date is None and start_number is None:
             timeframe = f" (All-Time)"
             title += " - All-Time"
-            race_list = await races.get_races(
-                username, columns=columns, universe=universe,
-                text_pool=text_pool
+            race_columns = race_cache.filter_races(
+                race_columns, wpm_metric, universe=universe, text_pool=text_pool,
             )
 
         elif start_date is None:
             end_number = min(end_number, api_stats["races"])
             timeframe = f" {start_number:,} - {end_number:,}"
             title += f" - Races{timeframe}"
-            race_list = await races.get_races(
-                username, columns=columns, start_number=start_number,
-                end_number=end_number, universe=universe,
-                text_pool=text_pool
+            race_columns = race_cache.filter_races(
+                race_columns, wpm_metric, start_number=start_number,
+                end_number=end_number, universe=universe, text_pool=text_pool,
             )
 
         else:
             timeframe = f" ({strings.get_display_date_range(start_date, end_date)})"
             title += f" - {strings.get_display_date_range(start_date, end_date)}"
-            race_list = await races.get_races(
-                username, columns=columns, start_date=start_date.timestamp(),
-                end_date=end_date.timestamp(), universe=universe,
-                text_pool=text_pool
+            race_columns = race_cache.filter_races(
+                race_columns, wpm_metric, start_date=start_date.timestamp(),
+                end_date=end_date.timestamp(), universe=universe, text_pool=text_pool,
             )
 
         if era_string:
-            race_list = utils.stats.time_travel_races(race_list, user)
-
-        if len(race_list) == 0:
-            return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
+            race_columns = race_cache.filter_races(
+                race_columns, start_date=user["start_date"], end_date=user["end_date"],
+            )
 
+        wpm = race_columns["wpm"]
+        timestamps = race_columns["timestamp"]
         if performance:
             title = "Performance Improvement"
             suffix = "pf"
-            text_list = get_texts(as_dictionary=True, universe=universe)
-            for i in range(len(race_list)):
-                race = list(race_list[i])
-                difficulty = text_list[race[2]]["difficulty"]
-                if difficulty:
-                    race[0] = calculate_performance(race[0], difficulty)
-                else:
-                    race[0] = 0
-                race_list[i] = race
-            race_list = [race for race in race_list if race[0] > 0]
-
-        race_list.sort(key=lambda x: x[1])
-        wpm = []
-        timestamps = []
-        best = 0
-        average = 0
-        recent_average = 0
-        race_count = len(race_list)
-        worst = float("inf")
-        moving = min(max(race_count // 15, 1), 500)
-
-        for race in race_list:
-            race_wpm = race[0]
-            wpm.append(race_wpm)
-            timestamps.append(race[1])
-            if race_wpm > best:
-                best = race_wpm
-            if race_wpm < worst:
-                worst = race_wpm
-            average += race_wpm
-
-        for race in race_list[::-1][:moving]:
-            recent_average += race[0]
+            text_list = get_texts(as_dictionary=True, universe=universe, read_only=True)
+            difficulties = np.array([
+                text_list[text_id]["difficulty"] or 0 for text_id in race_columns["text_id"].tolist()
+            ], dtype=np.float64)
+            wpm = calculate_performance(wpm, difficulties)
+            valid = (difficulties > 0) & (wpm > 0)
+            wpm, timestamps = wpm[valid], timestamps[valid]
+
+        wpm = wpm.tolist()
+        timestamps = timestamps.tolist()
+
+        race_count = len(wpm)
+        if race_count == 0:
+            return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
 
-        average /= race_count
-        recent_average /= moving
+        moving = min(max(race_count // 15, 1), 500)
+        best = max(wpm)
+        worst = min(wpm)
+        average = sum(wpm) / race_count
+        recent_average = sum(wpm[-moving:]) / moving
 
     description = (
         f"**Races:** {race_count:,}\n"
@@ -166,12 +148,12 @@ async def run(ctx, user, username, start_date, end_date, start_number, end_numbe
     pages = [
         Page(
             button_name="Over Races",
-            render=lambda: improvement_graph.render(user, wpm, title, timeframe, universe=universe),
+            render=partial(improvement_graph.render, user, wpm, title, timeframe, universe=universe),
             default=time,
         ),
         Page(
             button_name="Over Time",
-            render=lambda: improvement_graph.render(user, wpm, title, timeframe, timestamps, universe),
+            render=partial(improvement_graph.render, user, wpm, title, timeframe, timestamps, universe),
             default=time,
         ),
     ]
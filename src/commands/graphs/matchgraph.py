@@ -1,9 +1,10 @@
+from functools import partial
+
 from discord.ext import commands
 
 import database.bot.recent_text_ids as recent
 from api.races import get_race_by_id
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from commands.races.realspeed import get_args
 from commands.locks import match_lock
 from config import prefix
@@ -56,8 +57,7 @@ async def run(ctx, user, username, race_number, universe):
     if not db_stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    stats = await get_stats(username, universe=universe)
-    await download(racer=stats, universe=universe)
+    stats = await sync_user(username, universe)
 
     if race_number < 1:
         race_number = stats["races"] + race_number
@@ -114,7 +114,8 @@ async def run(ctx, user, username, race_number, universe):
     url = urls.replay(username, race_number, universe, timestamp=race['timestamp'])
 
     def render(key):
-        return lambda: match_graph.render(
+        return partial(
+            match_graph.render,
             user, match[key], graph_title, "WPM", universe,
             limit_y="*" not in ctx.invoked_with
         )
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from functools import partial
 
 from dateutil.relativedelta import relativedelta
 from discord.ext import commands
@@ -143,7 +144,8 @@ async def run(ctx, user, username, number, category, rate):
         timestamps.append(predicted_timestamp)
         values.append(number)
 
-        render = lambda: line_graph.render(
+        render = partial(
+            line_graph.render,
             user, [[username, timestamps, values]],
             f"Races Over Time Projection - {username}",
             "Date", "Races"
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from functools import partial
 
 from dateutil.relativedelta import relativedelta
 from discord.ext import commands
@@ -170,7 +171,8 @@ async def run(ctx, user, username1, username2, category, rate1, rate2=None):
                     user_list[i]["timestamps"],
                     user_list[i]["values"],
                 ])
-            render = lambda: line_graph.render(
+            render = partial(
+                line_graph.render,
                 user, lines,
                 f"Races Over Time Projection\n"
                 f"{user_list[0]['username']} vs. {user_list[1]['username']}",
@@ -1,3 +1,5 @@
+from functools import partial
+
 from discord.ext import commands
 
 import database.main.races as races
@@ -108,14 +110,14 @@ async def run(ctx, user, username, category):
         Page(
             title=title,
             description=race_description,
-            render=lambda: personal_best_graph.render(user, username, numbers, wpms, "races", universe),
+            render=partial(personal_best_graph.render, user, username, numbers, wpms, "races", universe),
             button_name="Over Races",
             default=category == "races",
         ),
         Page(
             title=title + " (Over Time)",
             description=time_description,
-            render=lambda: personal_best_graph.render(user, username, timestamps, wpms, "time", universe),
+            render=partial(personal_best_graph.render, user, username, timestamps, wpms, "time", universe),
             button_name="Over Time",
             default=category == "time",
         )
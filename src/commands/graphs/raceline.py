@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from functools import partial
 
 from dateutil import parser
 from discord import Embed, File
@@ -9,8 +10,8 @@ import database.main.races as races
 import database.main.users as users
 from database.bot.users import get_user
 from database.main.texts import get_disabled_text_ids
-from graphs import line_graph
-from utils import errors, colors, strings, dates, embeds, files
+from graphs import line_graph, renderer
+from utils import errors, colors, strings, dates, embeds
 from utils.errors import command_in_use
 
 command = {
@@ -215,13 +216,11 @@ async def run(ctx, user, usernames, column="number"):
 
     lines.sort(key=lambda x: x[3], reverse=True)
 
-    file_name = line_graph.render(user, lines, title, "Date", kind)
+    image = await renderer.render(partial(line_graph.render, user, lines, title, "Date", kind))
 
-    file = File(file_name, filename=file_name)
+    file = File(image, filename=image.name)
     await ctx.send(file=file, content=era_string)
 
-    files.remove_file(file_name)
-
 
 def too_many_usernames():
     return Embed(
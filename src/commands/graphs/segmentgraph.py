@@ -1,9 +1,10 @@
+from functools import partial
+
 from discord.ext import commands
 
 import database.bot.recent_text_ids as recent
 from api.races import get_universe_multiplier
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from commands.races.realspeed import get_args
 from database.bot.users import get_user
 from database.main import users, races
@@ -42,8 +43,7 @@ async def run(ctx, user, username, race_number, universe):
     if not db_stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    stats = await get_stats(username, universe=universe)
-    await download(racer=stats, universe=universe)
+    stats = await sync_user(username, universe)
 
     if race_number < 1:
         race_number = stats["races"] + race_number
@@ -125,7 +125,8 @@ async def run(ctx, user, username, race_number, universe):
     segment_page = Page(
         title=f"WPM Segments - Race #{race_number:,}",
         description=segment_description,
-        render=lambda: segment_graph.render(
+        render=partial(
+            segment_graph.render,
             user, segments, f"WPM Segments - {username} - Race #{race_number:,}",
             "Words", universe
         ),
@@ -145,7 +146,8 @@ async def run(ctx, user, username, race_number, universe):
                 value="\n".join(format_segment(word) for word in slowest[:10]),
             )
         ],
-        render=lambda: segment_graph.render(
+        render=partial(
+            segment_graph.render,
             user, word_segments, f"Words - {username} - Race #{race_number:,}",
             "Words", universe
         ),
@@ -20,7 +20,6 @@ class LargeQueryLock:
             self.lock.release()
 
 
-leaderboard_lock = asyncio.Lock()
 average_lock = asyncio.Lock()
 import_lock = asyncio.Lock()
 match_lock = asyncio.Lock()
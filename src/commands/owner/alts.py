@@ -2,6 +2,7 @@ from discord import Embed
 from discord.ext import commands
 
 import database.main.alts as alts
+import database.main.leaderboards as leaderboards
 from api.users import get_stats
 from commands.checks import owner_check
 from database.bot.users import get_user
@@ -72,6 +73,7 @@ async def add(ctx, user, new_username, existing_username):
         description = f"{new_username} is already part of:\n{alt_list}"
         return await send_embed(ctx, user, description)
 
+    leaderboards.mark_stale()
     alt_list = ", ".join(alts.get_username_alts(new_username))
     description = f"Added {new_username} to:\n{alt_list}"
     await send_embed(ctx, user, description)
@@ -79,6 +81,7 @@ async def add(ctx, user, new_username, existing_username):
 
 async def remove(ctx, user, username):
     alts.remove_alt(username)
+    leaderboards.mark_stale()
 
     description = f"Removed {username} for alts"
 
@@ -2,8 +2,10 @@ from discord import Embed
 from discord.ext import commands
 
 import database.main.users as users
+from commands.account.download import get_sync_stats
 from commands.checks import owner_check
 from database.bot.users import get_user
+from database.main import db
 
 command = {
     "name": "databasestats",
@@ -26,6 +28,8 @@ class DatabaseStats(commands.Cog):
 
 async def run(ctx, user):
     race_count, text_count, user_count, universe_count = users.get_database_stats()
+    pool = db.read_pool.stats()
+    syncs = get_sync_stats()
 
     embed = Embed(
         title="Database Stats",
@@ -33,7 +37,17 @@ async def run(ctx, user):
             f"Races: {race_count:,}\n"
             f"Texts: {text_count:,}\n"
             f"Users: {user_count:,}\n"
-            f"Universes: {universe_count:,}"
+            f"Universes: {universe_count:,}\n\n"
+            f"**Read Pool**\n"
+            f"Connections: {pool['open']} / {pool['size']} ({pool['idle']} idle)\n"
+            f"Acquisitions: {pool['acquisitions']:,} ({pool['timeouts']:,} timed out)\n"
+            f"Average Wait: {pool['average_wait'] * 1000:,.2f}ms\n"
+            f"Max Wait: {pool['max_wait'] * 1000:,.2f}ms\n\n"
+            f"**User Syncs**\n"
+            f"Fetched: {syncs['misses']:,}\n"
+            f"Reused Recent: {syncs['hits']:,}\n"
+            f"Joined In Progress: {syncs['joined']:,}\n"
+            f"Cached: {syncs['recent']:,} ({syncs['pending']:,} in progress)"
         ),
         color=user["colors"]["embed"],
     )
@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
 
+import numpy as np
 from discord import Embed
 from discord.ext import commands
 
-import database.main.races as races
 import database.main.users as users
 from database.bot.users import get_user
-from utils import errors, colors, strings, dates
+from database.main import race_cache
+from utils import errors, colors, strings, dates, windows
 from utils.embeds import Message, Page, is_embed
 
 command = {
@@ -64,55 +65,37 @@ async def run(ctx, user, username, n):
     if n > stats["races"]:
         return await ctx.send(embed=not_enough_races(), content=era_string)
 
-    race_list = await races.get_races(
-        username, columns=[wpm_metric, "number", "timestamp"], universe=universe,
+    race_columns = race_cache.filter_races(
+        await race_cache.get_columns(username, universe), wpm_metric,
         start_date=user["start_date"], end_date=user["end_date"],
-        text_pool=text_pool,
+        universe=universe, text_pool=text_pool, order_by="timestamp",
     )
-    race_list.sort(key=lambda x: x[2])
-
-    averages = [sum([race[0] for race in race_list[:n]])]
-    start_index = 0
-    end_index = n
-    while end_index < len(race_list):
-        average = averages[start_index]
-        average -= race_list[start_index][0]
-        average += race_list[end_index][0]
-        averages.append(average)
-        start_index += 1
-        end_index += 1
+    numbers, timestamps, wpms = race_columns["number"], race_columns["timestamp"], race_columns["wpm"]
+    if n > len(numbers):
+        return await ctx.send(embed=not_enough_races(), content=era_string)
 
-    pages = []
     page_count = 10
-    per_page = min(10, len(averages) // 10 + 1)
+    per_page = min(10, (len(numbers) - n + 1) // 10 + 1)
+    averages = windows.window_sums(wpms, n) / n
+    starts = np.arange(len(averages))
+    top_windows = [
+        window for window in windows.top_disjoint(starts, starts + n, averages, page_count * per_page)
+        if window[2] > 0
+    ]
 
-    for _ in range(page_count):
+    pages = []
+    for i in range(0, max(len(top_windows), 1), per_page):
         description = ""
-        for _ in range(per_page):
-            best = max(averages)
-            if best == 0:
-                break
-            best_index = averages.index(best)
-            for i in range(-n + 1, n):
-                target_index = best_index + i
-                if 0 <= target_index < len(averages):
-                    averages[target_index] = 0
-
-            start_number = race_list[best_index][1]
-            end_number = race_list[best_index + n - 1][1]
-            start_timestamp = race_list[best_index][2]
-            end_timestamp = race_list[best_index + n - 1][2]
+        for start, end, average in top_windows[i:i + per_page]:
             date_range = strings.get_display_date_range(
-                datetime.fromtimestamp(start_timestamp, tz=timezone.utc),
-                datetime.fromtimestamp(end_timestamp, tz=timezone.utc),
+                datetime.fromtimestamp(timestamps[start], tz=timezone.utc),
+                datetime.fromtimestamp(timestamps[end - 1], tz=timezone.utc),
             )
             description += (
-                f"**{date_range}**\n{best / n:,.2f} WPM: "
-                f"(Races {start_number:,} - {end_number:,})\n\n"
+                f"**{date_range}**\n{average:,.2f} WPM: "
+                f"(Races {int(numbers[start]):,} - {int(numbers[end - 1]):,})\n\n"
             )
         pages.append(Page(description=description))
-        if sum(averages) == 0:
-            break
 
     title = f"Best Last {n:,} Averages"
 
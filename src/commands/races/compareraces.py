@@ -1,9 +1,11 @@
+from functools import partial
+
 from discord import Embed
 from discord.ext import commands
 
 import database.bot.recent_text_ids as recent
 from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import run as download, sync_user
 from config import prefix
 from database.bot.users import get_user
 from database.main import races
@@ -205,7 +207,7 @@ async def run(ctx, user, username1, username2, race_number1, race_number2, unive
     page = Page(
         title="Race Comparison",
         description=description,
-        render=lambda: match_graph.render(user, rankings, graph_title, "WPM", universe),
+        render=partial(match_graph.render, user, rankings, graph_title, "WPM", universe),
     )
 
     profile = None
@@ -228,8 +230,7 @@ async def run(ctx, user, username1, username2, race_number1, race_number2, unive
 
 
 async def run_text(ctx, user, username, username2, text_id, universe):
-    stats = await get_stats(username, universe=universe)
-    await download(racer=stats, universe=universe)
+    stats = await sync_user(username, universe)
     wpm_metric = user["settings"]["wpm"]
 
     race_list = races.get_text_races(username, text_id, universe, wpm=wpm_metric)
@@ -7,8 +7,7 @@ from discord.ext import commands
 import database.main.races as races
 import database.main.users as users
 from api.competitions import get_competition_info
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from commands.races.races import get_stats_fields
 from config import prefix
 from database.bot.users import get_user
@@ -78,8 +77,7 @@ async def run(ctx, user, username, date):
     if not date:
         date = datetime.now(timezone.utc)
 
-    api_stats = await get_stats(username, universe=universe)
-    await download(racer=api_stats, universe=universe)
+    api_stats = await sync_user(username, universe)
 
     command_name = strings.get_category([
         "day", "yesterday", "miniday", "miniyesterday",
@@ -146,7 +144,7 @@ async def run(ctx, user, username, date):
     if not race_list:
         page = Page(description="No races completed")
     else:
-        fields, footer = get_stats_fields(
+        fields, footer = await get_stats_fields(
             username, race_list, start_time, end_time, universe, detailed,
             wpm_metric=wpm_metric, text_pool=text_pool,
         )
@@ -1,5 +1,6 @@
 import copy
 import statistics
+from functools import partial
 from statistics import StatisticsError
 
 from discord import Embed
@@ -256,7 +257,8 @@ async def run(ctx, user, username1, username2):
         graph_title = f"Match Graph - {match[0]['username']} - Race #{match[0]['number']:,}"
 
         def render(rankings):
-            return lambda: match_graph.render(
+            return partial(
+                match_graph.render,
                 user, rankings, graph_title, "WPM", universe,
                 limit_y="*" not in ctx.invoked_with
             )
@@ -266,7 +268,8 @@ async def run(ctx, user, username1, username2):
         )
 
     def render(encounters):
-        return lambda: encounters_graph.render(
+        return partial(
+            encounters_graph.render,
             user, f"Race Encounters\n{username1} vs. {username2}", encounters, universe
         )
 
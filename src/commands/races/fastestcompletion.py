@@ -1,15 +1,14 @@
+import numpy as np
 from discord import Embed
 from discord.ext import commands
 
 import database.main.races as races
 import database.main.users as users
 from commands.races.races import get_stats_fields
-from commands.locks import LargeQueryLock
 from database.bot.users import get_user
-from database.main import texts
-from utils import errors, colors, strings, dates
+from database.main import texts, race_cache
+from utils import errors, colors, strings, dates, windows
 from utils.embeds import Message, Page, is_embed
-from utils.stats import get_top_disjoint_windows
 
 categories = ["races", "points"]
 command = {
@@ -70,68 +69,43 @@ async def run(ctx, user, username, number, category):
     if (category == "races" and number > stats["races"]) or number > stats["points"] + stats["points_retroactive"]:
         return await ctx.send(embed=no_milestone(category, universe), content=era_string)
 
-    async with LargeQueryLock(stats["races"] > 100_000):
-        text_list = texts.get_texts(universe=universe)
-        text_lengths = {text["text_id"]: len(text["quote"]) for text in text_list}
-
-        columns = [
-            "text_id", "number", wpm_metric, "accuracy", "points", "characters", "rank", "racers",
-            "timestamp", "wpm_raw AS wpm_raw", "start_time", "total_time", "correction_time", "pause_time",
-        ]
-        race_list = await races.get_races(
-            username, columns=columns, universe=universe,
-            start_date=user["start_date"], end_date=user["end_date"],
-            text_pool=text_pool,
-        )
-        race_list.sort(key=lambda x: x["timestamp"])
-
-        windows = []
-        race_count = len(race_list)
-
-        if category == "races":
-            number = round(number)
-            for start_index in range(race_count - number + 1):
-                end_index = start_index + number
-                start_race = race_list[start_index]
-                start_time = get_start_time(start_race, text_lengths)
-                end_race = race_list[end_index - 1]
-                duration = end_race["timestamp"] - start_time
-                windows.append([start_index, end_index, duration])
-
-        else:
-            start_index = 0
-            total_points = 0
-            for end_index in range(race_count):
-                total_points += race_list[end_index]["points"]
-                while total_points >= number:
-                    start_race = race_list[start_index]
-                    start_time = get_start_time(start_race, text_lengths)
-                    end_time = race_list[end_index]["timestamp"]
-                    duration = end_time - start_time
-                    windows.append((start_index, end_index + 1, duration))
-                    total_points -= race_list[start_index]["points"]
-                    start_index += 1
-
-        if not windows:
-            return await ctx.send(embed=errors.no_valid_windows(universe))
-
-        windows.sort(key=lambda x: x[2])
-        top_windows = get_top_disjoint_windows(windows, 10)
-        fastest = top_windows[0]
-        race_range = race_list[fastest[0]:fastest[1]]
-        start_time = race_range[0]["timestamp"]
-        end_time = race_range[-1]["timestamp"]
-        fields, footer = get_stats_fields(
-            username, race_range, start_time, end_time, universe,
-            wpm_metric=wpm_metric, text_pool=text_pool,
-        )
+    text_list = texts.get_texts(universe=universe, read_only=True)
+    text_lengths = {text["text_id"]: len(text["quote"]) for text in text_list}
+    race_columns = race_cache.filter_races(
+        await race_cache.get_columns(username, universe), wpm_metric,
+        start_date=user["start_date"], end_date=user["end_date"],
+        universe=universe, text_pool=text_pool, order_by="timestamp",
+    )
+    numbers, timestamps, total_times, text_ids, wpms, points = (
+        race_columns[column] for column in ["number", "timestamp", "total_time", "text_id", "wpm", "points"]
+    )
+    start_times = windows.get_start_times(timestamps, total_times, text_ids, wpms, text_lengths)
+
+    if category == "races":
+        number = round(number)
+        starts, ends, durations = windows.fastest_race_windows(timestamps, start_times, number)
+    else:
+        starts, ends, durations = windows.fastest_sum_windows(timestamps, start_times, points, number)
+
+    if not len(starts):
+        return await ctx.send(embed=errors.no_valid_windows(universe))
+
+    top_windows = windows.top_disjoint(starts, ends, durations, 10, reverse=False)
+    fastest = top_windows[0]
+    race_range = await get_window_races(username, universe, text_pool, wpm_metric, timestamps, fastest)
+    start_time = race_range[0]["timestamp"]
+    end_time = race_range[-1]["timestamp"]
+    fields, footer = await get_stats_fields(
+        username, race_range, start_time, end_time, universe,
+        wpm_metric=wpm_metric, text_pool=text_pool,
+    )
 
     description = ""
     for i in range(len(top_windows)):
         window = top_windows[i]
         duration = window[2]
-        start_number = race_list[window[0]]["number"]
-        end_number = race_list[window[1] - 1]["number"]
+        start_number = int(numbers[window[0]])
+        end_number = int(numbers[window[1] - 1])
         description += (
             f"{i + 1}. {strings.format_duration(duration, False)} "
             f"(Races {start_number:,} - {end_number:,})\n"
@@ -162,14 +136,20 @@ async def run(ctx, user, username, number, category):
     await message.send()
 
 
-def get_start_time(start_race, text_lengths):
-    race_time = start_race["total_time"] / 1000
-    if race_time:
-        start_time = start_race["timestamp"] - race_time
-    else:
-        start_time = start_race["timestamp"] = (text_lengths[start_race["text_id"]] * 12) / start_race["wpm"]
+async def get_window_races(username, universe, text_pool, wpm_metric, timestamps, window):
+    # Full race details for a window found on the timestamp-sorted race list
+    columns = [
+        "text_id", "number", wpm_metric, "accuracy", "points", "characters", "rank", "racers",
+        "timestamp", "wpm_raw AS wpm_raw", "start_time", "total_time", "correction_time", "pause_time",
+    ]
+    start, end = window[0], window[1]
+    race_list = await races.get_races(
+        username, columns=columns, universe=universe,
+        start_date=timestamps[start].item(), end_date=np.nextafter(timestamps[end - 1], np.inf).item(),
+        text_pool=text_pool, order_by="timestamp",
+    )
 
-    return start_time
+    return race_list
 
 
 def no_milestone(category, universe):
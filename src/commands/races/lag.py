@@ -4,8 +4,7 @@ import database.bot.recent_text_ids as recent
 import database.main.races as races
 import database.main.texts as texts
 from api.races import get_universe_multiplier
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from commands.races.realspeed import get_args
 from config import prefix
 from database.bot.users import get_user
@@ -50,8 +49,7 @@ async def run(ctx, user, username, race_number, universe):
     if not db_stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    stats = await get_stats(username, universe=universe)
-    await download(racer=stats, universe=universe)
+    stats = await sync_user(username, universe)
 
     if race_number < 1:
         race_number = stats["races"] + race_number
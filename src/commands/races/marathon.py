@@ -1,16 +1,13 @@
 from discord import Embed
 from discord.ext import commands
 
-import database.main.races as races
 import database.main.users as users
-from commands.races.fastestcompletion import get_start_time
+from commands.races.fastestcompletion import get_window_races
 from commands.races.races import get_stats_fields
-from commands.locks import LargeQueryLock
 from database.bot.users import get_user
-from database.main import texts
-from utils import errors, colors, strings, dates
+from database.main import texts, race_cache
+from utils import errors, colors, strings, dates, windows
 from utils.embeds import Page, Message, is_embed
-from utils.stats import get_top_disjoint_windows
 
 categories = ["races", "points"]
 command = {
@@ -67,68 +64,43 @@ async def run(ctx, user, username, category, seconds):
     text_pool = user["settings"]["text_pool"]
     wpm_metric = user["settings"]["wpm"]
 
-    async with LargeQueryLock(stats["races"] > 100_000):
-        text_list = texts.get_texts(universe=universe)
-        text_lengths = {text["text_id"]: len(text["quote"]) for text in text_list}
-
-        columns = [
-            "text_id", "number", wpm_metric, "accuracy", "points", "characters", "rank", "racers",
-            "timestamp", "wpm_raw AS wpm_raw", "start_time", "total_time", "correction_time", "pause_time",
-        ]
-        race_list = await races.get_races(
-            username, columns=columns, universe=universe,
-            start_date=user["start_date"], end_date=user["end_date"],
-            text_pool=text_pool,
-        )
-        if not race_list:
-            return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
-
-        race_list.sort(key=lambda x: x["timestamp"])
-
-        windows = []
-        if category == "races":
-            start_index = 0
-            end_index = 0
-            race_count = len(race_list)
-            while start_index < race_count:
-                start_race = race_list[start_index]
-                start_time = get_start_time(start_race, text_lengths)
-                while end_index < race_count and race_list[end_index]["timestamp"] - start_time <= seconds:
-                    end_index += 1
-                count = end_index - start_index
-                if count > 0:
-                    windows.append((start_index, end_index - 1, count))
-                start_index += 1
-
-        else:
-            start_index = 0
-            total_points = 0
-            for end_index in range(len(race_list)):
-                end_time = race_list[end_index]["timestamp"]
-                total_points += race_list[end_index]["points"]
-                while start_index <= end_index and end_time - get_start_time(race_list[start_index], text_lengths) > seconds:
-                    total_points -= race_list[start_index]["points"]
-                    start_index += 1
-                windows.append((start_index, end_index, total_points))
-
-        windows.sort(key=lambda x: -x[2])
-        top_windows = get_top_disjoint_windows(windows, 10)
-
-        best = top_windows[0]
-        race_range = race_list[best[0]:best[1] + 1]
-        start_time = race_range[0]["timestamp"]
-        end_time = race_range[-1]["timestamp"]
-        fields, footer = get_stats_fields(
-            username, race_range, start_time, end_time, universe,
-            text_pool=text_pool,
-        )
+    text_list = texts.get_texts(universe=universe, read_only=True)
+    text_lengths = {text["text_id"]: len(text["quote"]) for text in text_list}
+    race_columns = race_cache.filter_races(
+        await race_cache.get_columns(username, universe), wpm_metric,
+        start_date=user["start_date"], end_date=user["end_date"],
+        universe=universe, text_pool=text_pool, order_by="timestamp",
+    )
+    if not len(race_columns["number"]):
+        return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
+
+    numbers, timestamps, total_times, text_ids, wpms, points = (
+        race_columns[column] for column in ["number", "timestamp", "total_time", "text_id", "wpm", "points"]
+    )
+    start_times = windows.get_start_times(timestamps, total_times, text_ids, wpms, text_lengths)
+
+    if category == "races":
+        starts, ends, amounts = windows.duration_counts(timestamps, start_times, seconds)
+    else:
+        starts, ends, amounts = windows.duration_sums(timestamps, start_times, points, seconds)
+
+    top_windows = windows.top_disjoint(starts, ends, amounts, 10)
+
+    best = top_windows[0]
+    race_range = await get_window_races(username, universe, text_pool, wpm_metric, timestamps, best)
+    start_time = race_range[0]["timestamp"]
+    end_time = race_range[-1]["timestamp"]
+    fields, footer = await get_stats_fields(
+        username, race_range, start_time, end_time, universe,
+        text_pool=text_pool,
+    )
 
     description = ""
     for i in range(len(top_windows)):
         window = top_windows[i]
         amount = window[2]
-        start_number = race_list[window[0]]["number"]
-        end_number = race_list[window[1]]["number"]
+        start_number = int(numbers[window[0]])
+        end_number = int(numbers[window[1] - 1])
         description += f"{i + 1}. {amount:,.0f} (Races {start_number:,} - {end_number:,})\n"
 
     period_string = strings.format_duration(seconds, False)
@@ -76,7 +76,7 @@ async def run(ctx, user, username, milestone, category):
 
     race_info = await races.get_race(username, milestone_number, universe, get_log=True)
     if not race_info:
-        text_list = texts.get_texts(as_dictionary=True, universe=universe)
+        text_list = texts.get_texts(as_dictionary=True, universe=universe, read_only=True)
         race_info = dict(await races.get_race(username, milestone_number, universe))
         text = text_list[race_info["text_id"]]
         race_info["quote"] = text["quote"]
@@ -1,10 +1,10 @@
 from collections import defaultdict
+from functools import partial
 
 from discord.ext import commands
 
 import database.bot.recent_text_ids as recent
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from commands.races.realspeed import get_args
 from config import prefix
 from database.bot.users import get_user
@@ -51,8 +51,7 @@ async def run(ctx, user, username, race_number, universe):
     if not db_stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    stats = await get_stats(username, universe=universe)
-    await download(racer=stats, universe=universe)
+    stats = await sync_user(username, universe)
 
     if race_number < 1:
         race_number = stats["races"] + race_number
@@ -94,13 +93,14 @@ async def run(ctx, user, username, race_number, universe):
 
     typo_page = Page(
         description=typo_description,
-        render=lambda: match_graph.render(user, rankings, title, y_label, universe, typos=typos),
+        render=partial(match_graph.render, user, rankings, title, y_label, universe, typos=typos),
         button_name="Mistakes",
     )
 
     pause_page = Page(
         description=pause_description,
-        render=lambda: match_graph.render(
+        render=partial(
+            match_graph.render,
             user, rankings, title, y_label, universe,
             typos=typos, markers=[[], race["pauses"]]
         ),
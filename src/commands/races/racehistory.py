@@ -6,9 +6,9 @@ from discord.ext import commands
 
 import database.main.races as races
 import database.main.texts as texts
+import database.main.user_daily_stats as user_daily_stats
 import database.main.users as users
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from database.bot.users import get_user
 from utils import errors, urls, strings, dates
 from utils.embeds import Message, get_pages, is_embed
@@ -73,8 +73,7 @@ async def run(ctx, user, username, time_period, sort, reverse):
     text_pool = user["settings"]["text_pool"]
     wpm_metric = user["settings"]["wpm"]
 
-    api_stats = await get_stats(username, universe=universe)
-    await download(racer=api_stats, universe=universe)
+    api_stats = await sync_user(username, universe)
 
     if time_period == "races":
         columns = ["number", wpm_metric, "accuracy", "points", "rank", "racers", "timestamp"]
@@ -126,13 +125,58 @@ async def run(ctx, user, username, time_period, sort, reverse):
 
 async def get_history(username, category, sort, universe, start_date, end_date, reverse, wpm_metric, text_pool):
     sort_key = {"points": 3, "races": 2, "time": 5, "wpm": 4, "accuracy": 6}.get(sort, 0)
+    if wpm_metric == "wpm_adjusted" and (text_pool == "all" or universe != "play"):
+        history = await get_rollup_history(username, category, universe, start_date, end_date)
+    else:
+        history = await get_race_history(username, category, universe, start_date, end_date, wpm_metric, text_pool)
+
+    for stats in history:
+        start = datetime.fromtimestamp(stats[0], tz=timezone.utc)
+        end = datetime.fromtimestamp(stats[1], tz=timezone.utc)
+        if category == "day":
+            stats[1] = strings.get_display_date(start)
+        elif category == "week":
+            stats[1] = strings.get_display_date_range(start, end - relativedelta(days=1))
+        elif category == "month":
+            stats[1] = start.strftime("%B %Y")
+        else:
+            stats[1] = start.strftime("%Y")
+        stats[4] = stats[4] / stats[2]
+        stats[6] = stats[6] / stats[2]
+
+    history = sorted(history, key=lambda x: x[sort_key], reverse=reverse)
+
+    return history
+
+
+async def get_rollup_history(username, category, universe, start_date, end_date):
+    users.update_last_accessed(universe, username)
+    days = await user_daily_stats.get_days(username, universe, start_date, end_date)
+    history = []
+
+    for day in days:
+        timestamp = day["day"] * 86400
+        if len(history) == 0 or timestamp >= history[-1][1]:
+            start, end = dates.get_start_end(datetime.fromtimestamp(timestamp, tz=timezone.utc), category)
+            history.append([start.timestamp(), end.timestamp(), 0, 0, 0, 0, 0])
+
+        history[-1][2] += day["races"]
+        history[-1][3] += day["points"]
+        history[-1][4] += day["wpm_total"]
+        history[-1][5] += day["typing_time"]
+        history[-1][6] += day["accuracy_total"]
+
+    return history
+
+
+async def get_race_history(username, category, universe, start_date, end_date, wpm_metric, text_pool):
     columns = ["text_id", wpm_metric, "points", "timestamp", "accuracy"]
     race_list = await races.get_races(
         username, columns=columns, universe=universe, start_date=start_date, end_date=end_date,
         text_pool=text_pool
     )
     race_list.sort(key=lambda x: x[3])
-    text_list = texts.get_texts(as_dictionary=True, get_disabled=True, universe=universe)
+    text_list = texts.get_texts(as_dictionary=True, get_disabled=True, universe=universe, read_only=True)
     history = []
 
     for race in race_list:
@@ -165,22 +209,6 @@ async def get_history(username, category, sort, universe, start_date, end_date,
             history[-1][5] += seconds
             history[-1][6] += accuracy
 
-    for stats in history:
-        start = datetime.fromtimestamp(stats[0], tz=timezone.utc)
-        end = datetime.fromtimestamp(stats[1], tz=timezone.utc)
-        if category == "day":
-            stats[1] = strings.get_display_date(start)
-        elif category == "week":
-            stats[1] = strings.get_display_date_range(start, end - relativedelta(days=1))
-        elif category == "month":
-            stats[1] = start.strftime("%B %Y")
-        else:
-            stats[1] = start.strftime("%Y")
-        stats[4] = stats[4] / stats[2]
-        stats[6] = stats[6] / stats[2]
-
-    history = sorted(history, key=lambda x: x[sort_key], reverse=reverse)
-
     return history
 
 
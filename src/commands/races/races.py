@@ -184,7 +184,7 @@ async def run(ctx, user, username, start_date, end_date, start_number, end_numbe
             return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
         race_list.sort(key=lambda x: x["timestamp"])
 
-        fields, footer = get_stats_fields(
+        fields, footer = await get_stats_fields(
             username, race_list, start, end, universe,
             wpm_metric=wpm_metric, text_pool=text_pool,
         )
@@ -202,7 +202,7 @@ async def run(ctx, user, username, start_date, end_date, start_number, end_numbe
     await message.send()
 
 
-def get_stats_fields(username, race_list, start_time, end_time, universe="play", detailed=True, wpm_metric="wpm", text_pool="all"):
+async def get_stats_fields(username, race_list, start_time, end_time, universe="play", detailed=True, wpm_metric="wpm", text_pool="all"):
     fields = []
     footer = None
 
@@ -224,7 +224,7 @@ def get_stats_fields(username, race_list, start_time, end_time, universe="play",
     total_time = 0
     text_improvements = 0
     total_wpm_gain = 0
-    text_best_list = users.get_text_bests(username, universe=universe, until=race_list[0][8], wpm=wpm_metric, text_pool=text_pool)
+    text_best_list = await users.get_text_bests(username, universe=universe, until=race_list[0][8], wpm=wpm_metric, text_pool=text_pool)
     text_bests = {text_id: wpm for text_id, wpm in text_best_list}
     disabled_text_ids = texts.get_disabled_text_ids()
     unique_texts = set()
@@ -1,8 +1,9 @@
+from functools import partial
+
 from discord.ext import commands
 
 import database.bot.recent_text_ids as recent
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from commands.races.realspeed import get_args
 from config import prefix
 from database.bot.users import get_user
@@ -50,8 +51,7 @@ async def run(ctx, user, username, race_number, universe):
     if not db_stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    stats = await get_stats(username, universe=universe)
-    await download(racer=stats, universe=universe)
+    stats = await sync_user(username, universe)
 
     if race_number < 1:
         race_number = stats["races"] + race_number
@@ -68,33 +68,31 @@ async def run(ctx, user, username, race_number, universe):
         "keystroke_wpm": race["keystroke_wpm_adjusted"],
     }
 
-    def render_raw():
-        rankings = [
-            {
-                "username": "Raw Adjusted",
-                "keystroke_wpm": race["keystroke_wpm_raw_adjusted"],
-            },
-            adjusted_ranking
-        ]
-
-        return match_graph.render(
-            user, rankings, graph_title, y_label, universe,
-            markers=[race["typos"], []]
-        )
-
-    def render_pauseless():
-        rankings = [
-            {
-                "username": "Pauseless",
-                "keystroke_wpm": race["keystroke_wpm_pauseless_adjusted"],
-            },
-            adjusted_ranking,
-        ]
-
-        return match_graph.render(
-            user, rankings, graph_title, y_label, universe,
-            markers=[race["typos"], race["pauses"]]
-        )
+    raw_rankings = [
+        {
+            "username": "Raw Adjusted",
+            "keystroke_wpm": race["keystroke_wpm_raw_adjusted"],
+        },
+        adjusted_ranking
+    ]
+    render_raw = partial(
+        match_graph.render,
+        user, raw_rankings, graph_title, y_label, universe,
+        markers=[race["typos"], []]
+    )
+
+    pauseless_rankings = [
+        {
+            "username": "Pauseless",
+            "keystroke_wpm": race["keystroke_wpm_pauseless_adjusted"],
+        },
+        adjusted_ranking,
+    ]
+    render_pauseless = partial(
+        match_graph.render,
+        user, pauseless_rankings, graph_title, y_label, universe,
+        markers=[race["typos"], race["pauses"]]
+    )
 
     pages = [
         Page(
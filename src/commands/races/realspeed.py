@@ -1,8 +1,9 @@
+from functools import partial
+
 from discord.ext import commands
 
 import database.bot.recent_text_ids as recent
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from config import prefix
 from database.bot.users import get_user
 from database.main import users, races
@@ -76,8 +77,7 @@ async def run(ctx, user, username, race_number, graph, universe, raw=False):
     if not db_stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    stats = await get_stats(username, universe=universe)
-    await download(racer=stats, universe=universe)
+    stats = await sync_user(username, universe)
 
     if race_number < 1:
         race_number = stats["races"] + race_number
@@ -106,11 +106,11 @@ async def run(ctx, user, username, race_number, graph, universe, raw=False):
             y_label = "WPM"
             ranking["keystroke_wpm"] = race["keystroke_wpm"]
 
-        def render():
-            return match_graph.render(
-                user, [ranking], f"Race Graph - {username} - Race #{race_number:,}",
-                y_label, universe, limit_y="*" not in ctx.invoked_with
-            )
+        render = partial(
+            match_graph.render,
+            user, [ranking], f"Race Graph - {username} - Race #{race_number:,}",
+            y_label, universe, limit_y="*" not in ctx.invoked_with
+        )
 
     page = Page(
         title=f"{'Raw' if raw else 'Real'} Speeds - Race #{race_number:,}",
@@ -2,8 +2,7 @@ from discord import Embed
 from discord.ext import commands
 
 from api.races import get_universe_multiplier
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from commands.races.realspeed import run as run_realspeed
 from config import prefix
 from database.bot.users import get_user
@@ -66,8 +65,7 @@ async def run(ctx, user, username, start_number, end_number, universe, raw=False
     if not db_stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    profile = await get_stats(username, universe=universe)
-    await download(racer=profile, universe=universe)
+    profile = await sync_user(username, universe)
 
     total_races = profile["races"]
     if end_number is None:
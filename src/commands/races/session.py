@@ -1,15 +1,12 @@
 from discord.ext import commands
 
-import database.main.races as races
 import database.main.users as users
-from commands.races.fastestcompletion import get_start_time
+from commands.races.fastestcompletion import get_window_races
 from commands.races.races import get_stats_fields
-from commands.locks import LargeQueryLock
 from database.bot.users import get_user
-from database.main import texts
-from utils import errors, strings, dates
+from database.main import texts, race_cache
+from utils import errors, strings, dates, windows
 from utils.embeds import Page, Message, is_embed
-from utils.stats import get_top_disjoint_windows
 
 command = {
     "name": "session",
@@ -62,65 +59,31 @@ async def run(ctx, user, username, category, seconds):
     text_pool = user["settings"]["text_pool"]
     wpm_metric = user["settings"]["wpm"]
 
-    async with LargeQueryLock(stats["races"] > 100_000):
-        text_list = texts.get_texts(universe=universe)
-        text_lengths = {text["text_id"]: len(text["quote"]) for text in text_list}
-
-        columns = [
-            "text_id", "number", wpm_metric, "accuracy", "points", "characters", "rank", "racers",
-            "timestamp", "wpm_raw AS wpm_raw", "start_time", "total_time", "correction_time", "pause_time",
-        ]
-        race_list = await races.get_races(
-            username, columns=columns, universe=universe,
-            start_date=user["start_date"], end_date=user["end_date"],
-            text_pool=text_pool,
-        )
-        if not race_list:
-            return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
-        race_list.sort(key=lambda x: x["timestamp"])
-
-        windows = []
-        start_index = 0
-
-        if category == "races":
-            current_session = 1
-            for i in range(1, len(race_list)):
-                start_time = get_start_time(race_list[i - 1], text_lengths)
-                time_difference = race_list[i]["timestamp"] - start_time
-                if time_difference < seconds:
-                    current_session += 1
-                else:
-                    end_index = i - 1
-                    windows.append((start_index, end_index, current_session))
-                    start_index = i
-                    current_session = 1
+    text_list = texts.get_texts(universe=universe, read_only=True)
+    text_lengths = {text["text_id"]: len(text["quote"]) for text in text_list}
+    race_columns = race_cache.filter_races(
+        await race_cache.get_columns(username, universe), wpm_metric,
+        start_date=user["start_date"], end_date=user["end_date"],
+        universe=universe, text_pool=text_pool, order_by="timestamp",
+    )
+    if not len(race_columns["number"]):
+        return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
 
-        else:
-            current_session = 0
-            for i in range(1, len(race_list)):
-                start_time = get_start_time(race_list[i - 1], text_lengths)
-                time_difference = race_list[i]["timestamp"] - start_time
-                if time_difference < seconds:
-                    current_session += time_difference
-                else:
-                    end_index = i - 1
-                    windows.append((start_index, end_index, current_session))
-                    start_index = i
-                    current_session = 0
-
-        end_index = len(race_list) - 1
-        windows.append((start_index, end_index, current_session))
-        windows.sort(key=lambda x: -x[2])
-        top_windows = get_top_disjoint_windows(windows, 10)
-
-        best = top_windows[0]
-        race_range = race_list[best[0]:best[1] + 1]
-        start_time = get_start_time(race_range[0], text_lengths)
-        end_time = race_range[-1]["timestamp"]
-        fields, footer = get_stats_fields(
-            username, race_range, start_time, end_time, universe,
-            wpm_metric=wpm_metric, text_pool=text_pool,
-        )
+    numbers, timestamps, total_times, text_ids, wpms = (
+        race_columns[column] for column in ["number", "timestamp", "total_time", "text_id", "wpm"]
+    )
+    start_times = windows.get_start_times(timestamps, total_times, text_ids, wpms, text_lengths)
+    starts, ends, counts, durations = windows.sessions(timestamps, start_times, seconds)
+    top_windows = windows.top_disjoint(starts, ends, counts if category == "races" else durations, 10)
+
+    best = top_windows[0]
+    race_range = await get_window_races(username, universe, text_pool, wpm_metric, timestamps, best)
+    start_time = start_times[best[0]].item()
+    end_time = race_range[-1]["timestamp"]
+    fields, footer = await get_stats_fields(
+        username, race_range, start_time, end_time, universe,
+        wpm_metric=wpm_metric, text_pool=text_pool,
+    )
 
     interval = f" ({strings.format_duration(seconds, False)} interval)"
     title = f"{'Longest' if category == 'time' else 'Highest Race'} Session"
@@ -129,8 +92,8 @@ async def run(ctx, user, username, category, seconds):
     for i in range(len(top_windows)):
         window = top_windows[i]
         value = window[2]
-        start_number = race_list[window[0]]["number"]
-        end_number = race_list[window[1]]["number"]
+        start_number = int(numbers[window[0]])
+        end_number = int(numbers[window[1] - 1])
         if category == "races":
             formatted = f"{value:,.0f}"
         else:
@@ -3,8 +3,7 @@ import tempfile
 from discord import File
 from discord.ext import commands
 
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from commands.races.realspeed import get_args
 from database.bot.users import get_user
 from database.main import users
@@ -42,11 +41,10 @@ async def run(ctx, user, username, race_number, universe):
     if not stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    api_stats = await get_stats(username, universe=universe)
+    api_stats = await sync_user(username, universe)
     if race_number < 1:
         race_number = api_stats["races"] + race_number
 
-    await download(racer=api_stats, universe=universe)
     typing_log = await get_log(username, race_number, universe)
 
     title = f"{username} - Race #{race_number:,} (Universe: {universe})"
@@ -1,3 +1,5 @@
+from functools import partial
+
 from discord.ext import commands
 
 import database.main.competition_results as competition_results
@@ -70,7 +72,7 @@ async def run(ctx, user, username, show_graph):
         if show_graph:
             competitions = list(await competition_results.get_competitions(user["start_date"], user["end_date"]))
             competitions.sort(key=lambda x: x["end_time"])
-            render = lambda: awards_graph.render(user, username, competitions)
+            render = partial(awards_graph.render, user, username, competitions)
 
     page = Page(
         title=f"Awards ({total:,})",
@@ -4,6 +4,7 @@ from dateutil.relativedelta import relativedelta
 from discord.ext import commands
 
 import database.main.races as races
+import database.main.user_daily_stats as user_daily_stats
 import database.main.users as users
 from database.bot.users import get_user
 from utils import errors, strings, dates
@@ -127,6 +128,21 @@ async def run(ctx, user, username, n, time_period):
 
 
 async def get_history(username, kind, universe, start_date, end_date, text_pool):
+    if text_pool == "all" or universe != "play":
+        users.update_last_accessed(universe, username)
+        days = await user_daily_stats.get_days(username, universe, start_date, end_date)
+
+        history = []
+        for day in days:
+            timestamp = day["day"] * 86400
+            if len(history) == 0 or timestamp >= history[-1][1]:
+                start, end = dates.get_start_end(datetime.fromtimestamp(timestamp, tz=timezone.utc), kind)
+                history.append([start.timestamp(), end.timestamp(), day["races"]])
+            else:
+                history[-1][2] += day["races"]
+
+        return history
+
     race_list = await races.get_races(
         username, columns=["timestamp"], universe=universe, start_date=start_date, end_date=end_date,
         text_pool=text_pool,
@@ -80,63 +80,59 @@ async def run(ctx, user, username, category, n, less_than):
             category = wpm_metric
         columns += [category]
         category = "wpm"
-    race_list = await races.get_races(
-        username, columns,
-        start_date=user["start_date"], end_date=user["end_date"],
-        universe=universe,
-    )
-    race_list.sort(key=lambda x: x["timestamp"])
 
     windows = []
-    current_streak = {"start_index": None, "end_index": None, "streak": 0}
-    prev_text_id = -1
-    race_count = len(race_list)
+    current_streak = {"start": None, "end": None, "streak": 0}
+    previous_race = None
     if category == "accuracy" and n > 1:
         n /= 100
-    for i, race in enumerate(race_list):
-        if category == "wins":
-            result = race["rank"] == 1 and race["racers"] > 1
-        elif category == "losses":
-            result = race["rank"] > 1
-        elif category in ["wpm", "accuracy"]:
-            if less_than:
-                result = race[category] < n
-            else:
-                result = race[category] >= n
-        else:
-            text_id = race["text_id"]
-            result = text_id == prev_text_id
-            prev_text_id = text_id
-
-        if result:
-            updated_streak = {"end_index": i}
-            if current_streak["streak"] == 0:
-                if category == "text":
-                    updated_streak["streak"] = 2
-                    updated_streak["start_index"] = i - 1
+
+    async for race_batch in races.stream_races(
+        username, columns,
+        start_date=user["start_date"], end_date=user["end_date"],
+        universe=universe,
+    ):
+        for race in race_batch:
+            if category == "wins":
+                result = race["rank"] == 1 and race["racers"] > 1
+            elif category == "losses":
+                result = race["rank"] > 1
+            elif category in ["wpm", "accuracy"]:
+                if less_than:
+                    result = race[category] < n
                 else:
-                    updated_streak["streak"] = 1
-                    updated_streak["start_index"] = i
+                    result = race[category] >= n
             else:
-                updated_streak["streak"] = (
-                    race_list[current_streak["end_index"] + 1]["number"]
-                    - race_list[current_streak["start_index"]]["number"] + 1
-                )
-            current_streak.update(updated_streak)
-        if not result or i == race_count - 1:
-            if current_streak["streak"] > 0:
+                result = previous_race is not None and race["text_id"] == previous_race["text_id"]
+
+            race_info = (race["number"], race["timestamp"])
+            if result:
+                if current_streak["streak"] == 0:
+                    if category == "text":
+                        current_streak["start"] = (previous_race["number"], previous_race["timestamp"])
+                        current_streak["streak"] = 2
+                    else:
+                        current_streak["start"] = race_info
+                        current_streak["streak"] = 1
+                else:
+                    current_streak["streak"] = race_info[0] - current_streak["start"][0] + 1
+                current_streak["end"] = race_info
+            elif current_streak["streak"] > 0:
                 windows.append(current_streak.copy())
-            current_streak.update({"start_index": None, "end_index": None, "streak": 0})
+                current_streak.update({"start": None, "end": None, "streak": 0})
+
+            previous_race = race
+
+    if current_streak["streak"] > 0:
+        windows.append(current_streak.copy())
 
     def formatter(data):
-        start_race = race_list[data["start_index"]]
-        end_race = race_list[data["end_index"]]
-        start_number = start_race["number"]
-        end_number = end_race["number"]
+        start_number, start_timestamp = data["start"]
+        end_number, end_timestamp = data["end"]
         return (
             f"{data['streak']:,} - Races "
-            f"[{start_number:,}]({urls.replay(username, start_number, universe, timestamp=race["timestamp"])}) - "
-            f"[{end_number:,}]({urls.replay(username, end_number, universe, timestamp=race["timestamp"])})\n"
+            f"[{start_number:,}]({urls.replay(username, start_number, universe, timestamp=start_timestamp)}) - "
+            f"[{end_number:,}]({urls.replay(username, end_number, universe, timestamp=end_timestamp)})\n"
         )
 
     if not windows:
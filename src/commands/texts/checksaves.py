@@ -6,8 +6,7 @@ import database.main.races as races
 import database.bot.recent_text_ids as recent
 import database.main.texts as texts
 import database.main.users as users
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from database.bot.users import get_user
 from utils import errors, urls, strings
 from utils.embeds import Page, Message, is_embed
@@ -60,8 +59,7 @@ async def run(ctx, user, username, text_id):
     if not stats:
         return await ctx.send(embed=errors.import_required(username, universe))
 
-    api_stats = await get_stats(username, universe=universe)
-    await download(racer=api_stats, universe=universe)
+    api_stats = await sync_user(username, universe)
 
     if text_id is None:
         if ctx.author.id == 108328502591250432:
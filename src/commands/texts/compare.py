@@ -66,11 +66,11 @@ async def run(ctx, user, username1, username2):
         text_bests2 = [(text["text_id"], text["wpm"], text["number"], text["timestamp"], text["accuracy"], text["points"]) for text in text_bests2]
 
     else:
-        text_bests1 = get_text_bests(username1, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
+        text_bests1 = await get_text_bests(username1, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
         if not text_bests1:
             return await ctx.send(embed=errors.import_required(username1, universe))
 
-        text_bests2 = get_text_bests(username2, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
+        text_bests2 = await get_text_bests(username2, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
         if not text_bests2:
             return await ctx.send(embed=errors.import_required(username2, universe))
 
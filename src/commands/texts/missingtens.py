@@ -55,9 +55,9 @@ async def run(ctx, user, username, sort):
     if not stats:
         return await ctx.send(embed=errors.import_required(username))
 
-    text_list = texts.get_texts(as_dictionary=True)
-    text_bests = users.get_text_bests(username, text_pool=user["settings"]["text_pool"])
-    top_10s = text_results.get_top_10s()
+    text_list = texts.get_texts(as_dictionary=True, read_only=True)
+    text_bests = await users.get_text_bests(username, text_pool=user["settings"]["text_pool"])
+    top_10s = await text_results.get_top_10s()
     missing_texts = []
 
     for text in text_bests:
@@ -1,3 +1,5 @@
+from functools import partial
+
 from discord import Embed
 from discord.ext import commands
 
@@ -6,8 +8,7 @@ import database.bot.recent_text_ids as recent
 import database.main.text_results as top_tens
 import database.main.texts as texts
 import database.main.users as users
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from config import prefix
 from database.bot.users import get_user
 from graphs import improvement_graph
@@ -67,8 +68,7 @@ async def run(ctx, user, username, text_id=None, race_number=None):
     era_string = strings.get_era_string(user)
     wpm_metric = user["settings"]["wpm"]
 
-    api_stats = await get_stats(username, universe=universe)
-    await download(racer=api_stats, universe=universe)
+    api_stats = await sync_user(username, universe)
     if era_string:
         api_stats = await users.filter_stats(api_stats, user)
 
@@ -162,7 +162,7 @@ async def run(ctx, user, username, text_id=None, race_number=None):
                 f"{recent_race['wpm'] - previous_best['wpm']:,.2f} WPM)"
             )
             if not disabled:
-                rank, percentile, performance = get_performance_stats(
+                rank, percentile, performance = await get_performance_stats(
                     username, universe, text_id, recent_race["wpm"], text["difficulty"]
                 )
                 score_display += f"\n{get_score_string(rank, percentile, performance)}"
@@ -182,7 +182,7 @@ async def run(ctx, user, username, text_id=None, race_number=None):
         color = colors.success
         score_display = f"**New Text!** +{recent_race['wpm']:,.2f} WPM"
         if not disabled:
-            rank, percentile, performance = get_performance_stats(
+            rank, percentile, performance = await get_performance_stats(
                 username, universe, text_id, recent_race["wpm"], text["difficulty"]
             )
             score_display += f"\n{get_score_string(rank, percentile, performance)}"
@@ -198,7 +198,7 @@ async def run(ctx, user, username, text_id=None, race_number=None):
     if graph:
         title = f"WPM Improvement - {username} - Text #{text_id}"
         wpm = [race["wpm"] for race in race_list]
-        page.render = lambda: improvement_graph.render(user, wpm, title, universe=universe)
+        page.render = partial(improvement_graph.render, user, wpm, title, universe=universe)
 
     message = Message(
         ctx, user, page, title,
@@ -217,8 +217,8 @@ async def run(ctx, user, username, text_id=None, race_number=None):
         await top_10_display(ctx, username, text_id, recent_race)
 
 
-def get_performance_stats(username, universe, text_id, wpm, difficulty):
-    text_bests = users.get_text_bests(username, universe=universe)
+async def get_performance_stats(username, universe, text_id, wpm, difficulty):
+    text_bests = await users.get_text_bests(username, universe=universe)
     calculate_text_performances(text_bests, universe)
     text_bests.sort(key=lambda x: x["performance"], reverse=True)
     text_ids = [t["text_id"] for t in text_bests]
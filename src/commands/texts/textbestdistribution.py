@@ -52,12 +52,12 @@ async def run(ctx, user, username, binned):
     if era_string or user["settings"]["text_pool"] != "all" or wpm_metric != "wpm":
         stats = await users.filter_stats(stats, user, wpm_metric=wpm_metric)
 
-    text_list = texts.get_texts(get_disabled=False, universe=universe)
+    text_list = texts.get_texts(get_disabled=False, universe=universe, read_only=True)
 
     if era_string:
         text_bests = await users.get_text_bests_time_travel(username, universe, user, wpm=wpm_metric, text_pool=text_pool)
     else:
-        text_bests = users.get_text_bests(username, universe=universe, wpm=wpm_metric, text_pool=text_pool)
+        text_bests = await users.get_text_bests(username, universe=universe, wpm=wpm_metric, text_pool=text_pool)
 
     if len(text_bests) == 0:
         return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
@@ -84,11 +84,11 @@ async def run(ctx, user, username, sort, n):
     if era_string:
         stats = await users.filter_stats(stats, user)
 
-    text_list = texts.get_texts(as_dictionary=True, universe=universe)
+    text_list = texts.get_texts(as_dictionary=True, universe=universe, read_only=True)
     if era_string:
         text_bests = await users.get_text_bests_time_travel(username, universe, user, race_stats=True, wpm=wpm_metric, text_pool=text_pool)
     else:
-        text_bests = users.get_text_bests(
+        text_bests = await users.get_text_bests(
             username, universe=universe, race_stats=True, wpm=wpm_metric, text_pool=text_pool
         )
 
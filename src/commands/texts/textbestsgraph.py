@@ -1,4 +1,5 @@
 import math
+from functools import partial
 
 from discord.ext import commands
 
@@ -126,7 +127,7 @@ async def run(ctx, user, username, category):
     }
 
     def render(category):
-        return lambda: text_bests_graph.render(user, username, x_axes[category], averages, category, universe)
+        return partial(text_bests_graph.render, user, username, x_axes[category], averages, category, universe)
 
     title = "Text Best Progression"
     pages = [
@@ -1,8 +1,7 @@
 from discord.ext import commands
 
 import database.main.users as users
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from database.main import races
 from database.bot.users import get_user
 from utils import errors, urls, strings, dates
@@ -56,8 +55,7 @@ async def run(ctx, user, username, sort):
         return await ctx.send(embed=errors.import_required(username, universe))
     era_string = strings.get_era_string(user)
 
-    api_stats = await get_stats(username, universe=universe)
-    await download(racer=api_stats, universe=universe)
+    api_stats = await sync_user(username, universe)
 
     race_list = await races.get_races(
         username, columns=["text_id", "number", "wpm", "timestamp"], universe=universe,
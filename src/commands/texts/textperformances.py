@@ -48,7 +48,7 @@ def get_args(user, args, info):
 
 async def run_all(ctx, user, sort):
     text_bests = []
-    top_10s = text_results.get_top_10s()
+    top_10s = await text_results.get_top_10s()
     for text_id, results in top_10s.items():
         text_bests.append(dict(results[0]))
 
@@ -95,7 +95,7 @@ async def run(ctx, user, username, sort):
     if era_string:
         text_bests = await users.get_text_bests_time_travel(username, universe, user, race_stats=True, wpm=wpm_metric, text_pool=text_pool)
     else:
-        text_bests = users.get_text_bests(username, universe=universe, race_stats=True, wpm=wpm_metric, text_pool=text_pool)
+        text_bests = await users.get_text_bests(username, universe=universe, race_stats=True, wpm=wpm_metric, text_pool=text_pool)
 
     if not text_bests:
         return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
@@ -119,7 +119,7 @@ async def run(ctx, user, username, sort):
     texts_typed = len(text_bests)
     total = sum([text["performance"] for text in text_bests])
     average = total / texts_typed
-    text_list = texts.get_texts(as_dictionary=True, universe=universe)
+    text_list = texts.get_texts(as_dictionary=True, universe=universe, read_only=True)
     performance = calculate_total_performance(text_bests, text_list)
 
     header = (
@@ -65,12 +65,12 @@ async def run(ctx, user, username, threshold, category, sort, over=True):
     wpm_metric = user["settings"]["wpm"]
 
     texts_typed = stats["texts_typed"]
-    text_list = texts.get_texts(as_dictionary=True, universe=universe)
+    text_list = texts.get_texts(as_dictionary=True, universe=universe, read_only=True)
 
     if era_string:
         text_bests = await users.get_text_bests_time_travel(username, universe, user, race_stats=True, wpm=wpm_metric, text_pool=text_pool)
     else:
-        text_bests = users.get_text_bests(username, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
+        text_bests = await users.get_text_bests(username, race_stats=True, universe=universe, wpm=wpm_metric, text_pool=text_pool)
 
     if len(text_bests) == 0:
         return await ctx.send(embed=errors.no_races_in_range(universe), content=era_string)
@@ -51,7 +51,7 @@ async def run(ctx, user, username):
         start_date=user["start_date"], end_date=user["end_date"],
         text_pool=user["settings"]["text_pool"],
     )
-    text_list = texts.get_texts(get_disabled=False, universe=universe)
+    text_list = texts.get_texts(get_disabled=False, universe=universe, read_only=True)
     disabled_ids = texts.get_disabled_text_ids()
 
     times_typed = {text["text_id"]: 0 for text in text_list}
@@ -53,7 +53,7 @@ class TopTens(commands.Cog):
 
 
 async def export(ctx, username):
-    top_10s = top_tens.get_top_10s()
+    top_10s = await top_tens.get_top_10s()
     unraced_text_ids = [text["text_id"] for text in users.get_unraced_texts(username)]
     export_data = {
         "timestamp": dates.now().timestamp(),
@@ -92,7 +92,7 @@ async def run(ctx, user, username, best):
     embed = Embed(title="Top 10 Rankings", color=user["colors"]["embed"])
     embeds.add_profile(embed, stats)
 
-    top_10_counts = top_tens.get_top_10_counts(username, text_pool=text_pool)
+    top_10_counts = await top_tens.get_top_10_counts(username, text_pool=text_pool)
     top_10_count = sum(top_10_counts)
     total_texts = top_tens.get_count()
     if text_pool == "maintrack":
@@ -118,7 +118,7 @@ async def run(ctx, user, username, best):
     )
 
     if best:
-        top_10s = top_tens.get_top_10s()
+        top_10s = await top_tens.get_top_10s()
         performances = []
 
         for text_id in top_10s:
@@ -56,3 +56,13 @@ typeracer_stats_channel_id = 746460695670816798
 donate_link = "https://www.paypal.com/donate/?business=X9JW4MC3CLNAE&no_recurring=0&currency_code=USD&item_name=TypeRacer+Stats"
 web_server = f"http://{os.getenv('ip')}"
 api_credentials = os.getenv("api_credentials").split(",")
+api_requests_per_second = float(os.getenv("api_requests_per_second", 4))  # Per credential
+sync_interval = float(os.getenv("sync_interval", 30))  # Seconds before a user's races are rechecked
+import_concurrency = int(os.getenv("import_concurrency", 4))
+scrape_concurrency = int(os.getenv("scrape_concurrency", 4))
+log_workers = int(os.getenv("log_workers", 2))
+render_workers = int(os.getenv("render_workers", 2))
+render_cache_size = int(os.getenv("render_cache_size", 64 * 1024 * 1024))  # Bytes
+leaderboard_interval = float(os.getenv("leaderboard_interval", 600))  # Seconds before leaderboards are rebuilt
+leaderboard_cooldown = float(os.getenv("leaderboard_cooldown", 120))  # Minimum seconds between leaderboard rebuilds
+race_cache_size = int(os.getenv("race_cache_size", 256 * 1024 * 1024))  # Bytes
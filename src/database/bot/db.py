@@ -1,11 +1,19 @@
 import sqlite3
 
-db = sqlite3.connect("./data/users.db")
-db.row_factory = sqlite3.Row
+db = None
+
+
+def get_db():
+    # Opened on first use, so importing this module in a worker process opens nothing
+    global db
+    if db is None:
+        db = sqlite3.connect("./data/users.db")
+        db.row_factory = sqlite3.Row
+    return db
 
 
 def fetch(query, params=[]):
-    cursor = db.cursor()
+    cursor = get_db().cursor()
     try:
         cursor.execute(query, params)
 
@@ -16,11 +24,11 @@ def fetch(query, params=[]):
 
 
 def run(query, params=[]):
-    cursor = db.cursor()
+    cursor = get_db().cursor()
 
     try:
         cursor.execute(query, params)
-        db.commit()
+        get_db().commit()
 
     finally:
         cursor.close()
@@ -16,6 +16,8 @@ def add_alt(new_username, existing_username):
         group_id = result[0][0]
 
     db.run("INSERT OR IGNORE INTO alts VALUES (?, ?)", [new_username, group_id])
+    _invalidate_top_10s(get_username_alts(new_username))
+
     return True
 
 
@@ -51,4 +53,11 @@ def get_groups():
 
 
 def remove_alt(username):
+    group = get_username_alts(username)
     db.run("DELETE FROM alts WHERE username = ?", [username])
+    _invalidate_top_10s(group)
+
+
+def _invalidate_top_10s(usernames):
+    from database.main.text_results import invalidate_alts
+    invalidate_alts(usernames)
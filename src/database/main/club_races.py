@@ -3,10 +3,10 @@ from database.main.alts import get_alts
 from utils.logging import log
 
 
-def add_race(username, race_number, race):
+async def add_race(username, race_number, race):
     if not race_exists(username, race_number):
         log(f"New 300 WPM! {username}|{race_number}")
-        db.run("""
+        await db.run_async("""
             INSERT INTO club_races VALUES (?, ?, ?, ?)
         """, [
             username, race_number, race["adjusted"], race["timestamp"]
@@ -1,25 +1,48 @@
+import asyncio
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
 import aiosqlite
 
 file = "./data/main.db"
+pragmas = [
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA cache_size = -100000",
+]
 
-reader = sqlite3.connect(file)
-reader.row_factory = sqlite3.Row
-reader.execute("PRAGMA foreign_keys = ON")
-reader.execute("PRAGMA journal_mode = WAL")
-reader.execute("PRAGMA cache_size = -100000")
+# Connections are opened on first use, so importing this module in a worker process opens nothing
+reader = None
+writer = None
+read_local = threading.local()
 
-writer = sqlite3.connect(file)
-writer.row_factory = sqlite3.Row
-writer.execute("PRAGMA foreign_keys = ON")
-writer.execute("PRAGMA journal_mode = WAL")
-writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
-writer.execute("PRAGMA cache_size = -100000")
+
+def get_reader():
+    # The shared reader belongs to the main thread, other threads open their own
+    global reader
+    if threading.current_thread() is not threading.main_thread():
+        if not hasattr(read_local, "connection"):
+            read_local.connection = connect()
+        return read_local.connection
+
+    if reader is None:
+        reader = connect()
+    return reader
+
+
+def get_writer():
+    global writer
+    if writer is None:
+        writer = connect()
+        writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return writer
 
 
 def fetch(query, params=[]):
-    cursor = reader.cursor()
+    cursor = get_reader().cursor()
     try:
         cursor.execute(query, params)
         return cursor.fetchall()
@@ -27,26 +50,259 @@ def fetch(query, params=[]):
         cursor.close()
 
 
+class ReadPool:
+    def __init__(self, size=4, timeout=30, idle_check=60):
+        self.size = size
+        self.timeout = timeout
+        self.idle_check = idle_check
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+        self.open_connections = 0
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.total_wait = 0
+        self.max_wait = 0
+
+    async def connect(self):
+        connection = await aiosqlite.connect(file)
+        connection.row_factory = aiosqlite.Row
+        for pragma in pragmas + ["PRAGMA query_only = ON"]:
+            await connection.execute(pragma)
+        return connection
+
+    async def is_healthy(self, connection):
+        try:
+            await connection.execute("SELECT 1")
+            return True
+        except (sqlite3.Error, ValueError):
+            return False
+
+    async def discard(self, connection):
+        self.open_connections -= 1
+        try:
+            await connection.close()
+        except (sqlite3.Error, ValueError):
+            pass
+
+    async def get_connection(self):
+        # Reuses the most recently returned connection, opening a new one when none are idle
+        while self.idle:
+            connection, last_used = self.idle.pop()
+            if time.monotonic() - last_used < self.idle_check or await self.is_healthy(connection):
+                return connection
+            await self.discard(connection)
+
+        connection = await self.connect()
+        self.open_connections += 1
+        return connection
+
+    @asynccontextmanager
+    async def acquire(self):
+        # Each slot holds at most one connection, so releasing one always lets a waiter through
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"Timed out waiting for a database connection after {self.timeout}s")
+
+        try:
+            connection = await self.get_connection()
+        except BaseException:
+            self.slots.release()
+            raise
+
+        wait = time.monotonic() - start
+        self.acquisitions += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+        healthy = True
+        try:
+            yield connection
+        except sqlite3.DatabaseError:
+            # Query errors leave the connection usable, only broken ones are closed
+            healthy = await self.is_healthy(connection)
+            raise
+        finally:
+            if healthy:
+                self.idle.append((connection, time.monotonic()))
+            else:
+                await self.discard(connection)
+            self.slots.release()
+
+    def stats(self):
+        return dict(
+            size=self.size,
+            open=self.open_connections,
+            idle=len(self.idle),
+            acquisitions=self.acquisitions,
+            timeouts=self.timeouts,
+            average_wait=self.total_wait / self.acquisitions if self.acquisitions else 0,
+            max_wait=self.max_wait,
+        )
+
+    async def close(self):
+        while self.idle:
+            connection, _ = self.idle.pop()
+            await self.discard(connection)
+
+
+read_pool = ReadPool()
+
+
 async def fetch_async(query, params=[]):
-    async with aiosqlite.connect(file) as db:
-        db.row_factory = aiosqlite.Row
-        async with db.execute(query, params) as cursor:
+    async with read_pool.acquire() as connection:
+        async with connection.execute(query, params) as cursor:
             return await cursor.fetchall()
 
 
+def connect():
+    connection = sqlite3.connect(file)
+    connection.row_factory = sqlite3.Row
+    for pragma in pragmas:
+        connection.execute(pragma)
+    return connection
+
+
+# Async writes are queued and group committed by a single dedicated thread with its own connection
+write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db_writer")
+write_local = threading.local()
+
+
+def get_write_connection():
+    if not hasattr(write_local, "connection"):
+        write_local.connection = connect()
+    return write_local.connection
+
+
+def execute_batch(jobs):
+    # Runs every job in one transaction, isolating failures with a savepoint per job
+    # A job's query can also be a function, called with the cursor and its params
+    connection = get_write_connection()
+    cursor = connection.cursor()
+    results = []
+    try:
+        if not connection.in_transaction:
+            cursor.execute("BEGIN")
+        for query, params, many in jobs:
+            cursor.execute("SAVEPOINT job")
+            try:
+                if callable(query):
+                    results.append((query(cursor, *params), None))
+                elif many:
+                    cursor.executemany(query, params)
+                    results.append((None, None))
+                else:
+                    cursor.execute(query, params)
+                    results.append((None, None))
+            except Exception as e:
+                cursor.execute("ROLLBACK TO job")
+                results.append((None, e))
+            cursor.execute("RELEASE job")
+        connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return results
+
+
+class WriteQueue:
+    def __init__(self, interval=0.005, max_statements=500):
+        self.interval = interval
+        self.max_statements = max_statements
+        self.jobs = None
+        self.task = None
+        self.batches = 0
+        self.writes = 0
+
+    def submit(self, query, params=[], many=False):
+        if self.task is None or self.task.done():
+            self.jobs = asyncio.Queue()
+            self.task = asyncio.create_task(self.process())
+
+        future = asyncio.get_running_loop().create_future()
+        self.jobs.put_nowait((query, list(params), many, future))
+        return future
+
+    async def next_batch(self):
+        batch = [await self.jobs.get()]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.max_statements:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.jobs.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def process(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.next_batch()
+            jobs = [(query, params, many) for query, params, many, _ in batch]
+            try:
+                results = await loop.run_in_executor(write_executor, execute_batch, jobs)
+            except Exception as e:
+                results = [(None, e)] * len(batch)
+
+            self.batches += 1
+            self.writes += len(batch)
+            for (_, _, _, future), (result, error) in zip(batch, results):
+                if future.done():
+                    continue
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+
+write_queue = WriteQueue()
+
+
+async def run_async(query, params=[]):
+    await write_queue.submit(query, params)
+
+
+async def run_many_async(query, data):
+    await write_queue.submit(query, data, many=True)
+
+
+async def run_transaction_async(function, *args):
+    # Calls function(cursor, *args) on the writer thread, its statements commit or roll back together
+    return await write_queue.submit(function, args)
+
+
+def run_deferred(query, params=[]):
+    future = write_queue.submit(query, params)
+    future.add_done_callback(log_deferred_error)
+
+
+def log_deferred_error(future):
+    from utils.logging import log
+    if not future.cancelled() and future.exception():
+        log(f"Deferred write failed: {future.exception()}")
+
+
 def run(query, params=[]):
-    cursor = writer.cursor()
+    cursor = get_writer().cursor()
     try:
         cursor.execute(query, params)
-        writer.commit()
+        get_writer().commit()
     finally:
         cursor.close()
 
 
 def run_many(query, data):
-    cursor = writer.cursor()
+    cursor = get_writer().cursor()
     try:
         cursor.executemany(query, data)
-        writer.commit()
+        get_writer().commit()
     finally:
         cursor.close()
@@ -27,8 +27,8 @@ def get_race(universe, username, number):
     return race[0]
 
 
-def add_race(universe, username, race_number, typing_log):
-    db.run("""
+async def add_race(universe, username, race_number, typing_log):
+    await db.run_async("""
         INSERT OR IGNORE INTO deleted_races
         VALUES (?, ?, ?, ?)
     """, [universe, username, race_number, typing_log])
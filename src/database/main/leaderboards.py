@@ -0,0 +1,159 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import database.main.users as users
+from config import leaderboard_interval, leaderboard_cooldown
+from database.main.alts import get_alts
+from utils.logging import log_error
+
+snapshots = {}
+built_at = {}
+stale = set()
+last_refresh = 0
+refresh_task = None
+# Sync sources run here instead of on the event loop
+query_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboards")
+
+
+# Query for each snapshotted category, fetching extra users to leave room for alts and bans
+sources = {
+    "races": lambda: users.get_most("races", 30),
+    "wins": lambda: users.get_most("wins", 30),
+    "points": lambda: users.get_most_total_points(30),
+    "awards": lambda: users.get_most_awards(30),
+    "textbests": lambda: users.get_top_text_best(30),
+    "textstyped": lambda: users.get_most_texts_typed(30),
+    "textrepeats": lambda: users.get_most("text_repeat_times", 30),
+    "totaltextwpm": lambda: users.get_most("text_wpm_total", 30),
+    "wpm": lambda: users.get_best_wpm(50),
+    "racetime": lambda: users.get_most("total_time", 30),
+    "characters": lambda: users.get_most("characters", 30),
+    "captcha": lambda: users.get_most("wpm_verified", 50),
+    "performance": lambda: users.get_most_performance(),
+}
+
+
+def get_user_filters():
+    return {
+        "countries": users.get_countries(),
+        "alts": get_alts(),
+        "banned": set(users.get_disqualified_users()),
+    }
+
+
+def filter_users(user_list, user_filters=None):
+    # Top 20 users, skipping banned users and any alts of a user already listed
+    if user_filters is None:
+        user_filters = get_user_filters()
+    countries = user_filters["countries"]
+    alts = user_filters["alts"]
+    banned_users = user_filters["banned"]
+    filtered = []
+    added_users = set()
+
+    for user in user_list:
+        user = dict(user)
+        username = user["username"]
+        if username in banned_users:
+            continue
+        alt_accounts = {username} | set(alts.get(username, []))
+
+        if not alt_accounts & added_users:
+            user["country"] = countries.get(username, None)
+            filtered.append(user)
+            added_users.update(alt_accounts)
+            if len(filtered) == 20:
+                break
+
+    return filtered
+
+
+# Categories that change when races are imported, everything except awards
+import_categories = [category for category in sources if category != "awards"]
+
+
+def mark_stale(categories=None):
+    stale.update(sources if categories is None else categories)
+
+
+def get_due():
+    # Stale or expired categories, at most once per cooldown
+    now = time.time()
+    if now - last_refresh < leaderboard_cooldown:
+        return []
+
+    return [
+        category for category in sources
+        if category in stale or now - built_at.get(category, 0) > leaderboard_interval
+    ]
+
+
+def is_due():
+    return bool(get_due())
+
+
+async def run_source(function):
+    # Sync queries run on the query thread, async sources hand back a coroutine to await here
+    result = await asyncio.get_running_loop().run_in_executor(query_executor, function)
+    if inspect.isawaitable(result):
+        result = await result
+
+    return result
+
+
+async def build_category(category, user_filters):
+    stale.discard(category)
+    try:
+        leaders = await run_source(sources[category])
+    except Exception:
+        stale.add(category)
+        raise
+    snapshots[category] = filter_users(leaders, user_filters)
+    built_at[category] = time.time()
+
+    return snapshots[category]
+
+
+async def build_snapshots(categories):
+    global last_refresh
+    last_refresh = time.time()
+    user_filters = await run_source(get_user_filters)
+    for category in categories:
+        await build_category(category, user_filters)
+
+
+def refresh():
+    # Rebuilds the due categories unless a rebuild is already running
+    global refresh_task
+    if refresh_task is None or refresh_task.done():
+        categories = get_due()
+        if categories:
+            refresh_task = asyncio.create_task(build_snapshots(categories))
+            refresh_task.add_done_callback(log_refresh_error)
+
+    return refresh_task
+
+
+def log_refresh_error(task):
+    if not task.cancelled() and task.exception():
+        log_error("Leaderboard Refresh Failed", task.exception())
+
+
+async def get_leaders(category):
+    # Serves the last built snapshot, rebuilding in the background after imports or once it expires
+    if is_due():
+        refresh()
+
+    if category not in snapshots and refresh_task is not None and not refresh_task.done():
+        try:
+            await asyncio.shield(refresh_task)
+        except Exception:
+            # Logged by the refresh, the category is built directly below
+            pass
+
+    if category not in snapshots:
+        await build_category(category, await run_source(get_user_filters))
+
+    return snapshots[category]
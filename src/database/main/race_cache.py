@@ -0,0 +1,184 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from config import race_cache_size
+from database.main import db
+
+# Column name, SQL expression and array type
+race_columns = [
+    ("number", "number", np.int32),
+    ("timestamp", "timestamp", np.float64),
+    ("text_id", "text_id", np.int32),
+    ("wpm", "wpm", np.float64),
+    ("wpm_unlagged", "wpm_unlagged", np.float64),
+    ("wpm_adjusted", "wpm_adjusted", np.float64),
+    ("wpm_raw", "wpm_raw", np.float64),
+    ("wpm_pauseless", "wpm_pauseless", np.float64),
+    ("accuracy", "IFNULL(accuracy, 0)", np.float64),
+    ("points", "IFNULL(points, 0)", np.float64),
+    ("rank", "IFNULL(rank, 0)", np.int16),
+    ("racers", "IFNULL(racers, 0)", np.int16),
+    ("total_time", "IFNULL(total_time, 0)", np.float64),
+]
+race_cache = OrderedDict()
+race_cache_bytes = 0
+loading = {}
+invalidations = 0
+
+
+def get_watermark(username, universe):
+    row = db.fetch("""
+        SELECT MAX(number) FROM races
+        INDEXED BY idx_races_universe_username
+        WHERE universe = ?
+        AND username = ?
+    """, [universe, username])
+
+    return row[0][0] or 0
+
+
+def to_columns(race_list):
+    if not race_list:
+        return {name: np.empty(0, dtype=dtype) for name, _, dtype in race_columns}
+
+    return {
+        name: np.array(values, dtype=dtype)
+        for (name, _, dtype), values in zip(race_columns, zip(*race_list))
+    }
+
+
+def merge_columns(columns, new_columns):
+    # Appends new races, re-sorting by number only when they arrive out of order
+    merged = {name: np.concatenate((columns[name], new_columns[name])) for name in columns}
+    if len(columns["number"]) and len(new_columns["number"]) and new_columns["number"].min() <= columns["number"][-1]:
+        _, order = np.unique(merged["number"], return_index=True)
+        merged = {name: values[order] for name, values in merged.items()}
+
+    return merged
+
+
+def cache_columns(key, watermark, columns):
+    global race_cache_bytes
+    if key in race_cache:
+        race_cache_bytes -= race_cache[key]["bytes"]
+
+    size = sum(values.nbytes for values in columns.values())
+    race_cache[key] = {"watermark": watermark, "columns": columns, "bytes": size}
+    race_cache.move_to_end(key)
+    race_cache_bytes += size
+
+    while race_cache_bytes > race_cache_size and len(race_cache) > 1:
+        _, evicted = race_cache.popitem(last=False)
+        race_cache_bytes -= evicted["bytes"]
+
+
+async def fetch_columns(username, universe, after=None):
+    race_list = await db.fetch_async(f"""
+        SELECT {",".join(expression for _, expression, _ in race_columns)}
+        FROM races
+        INDEXED BY idx_races_universe_username
+        WHERE universe = ?
+        AND username = ?
+        {'AND number > ?' if after is not None else ''}
+        ORDER BY number
+    """, [universe, username] + ([after] if after is not None else []))
+
+    return to_columns(race_list)
+
+
+async def get_columns(username, universe):
+    # A user's races as one array per column, sorted by race number
+    # Races imported past the cached watermark are fetched and appended
+    from database.main.users import update_last_accessed
+    update_last_accessed(universe, username)
+
+    key = (universe, username)
+    watermark = get_watermark(username, universe)
+    entry = race_cache.get(key)
+
+    if entry is not None and entry["watermark"] >= watermark:
+        race_cache.move_to_end(key)
+        return entry["columns"]
+
+    # Races imported while fetching are collected by add_races and merged in afterwards,
+    # since the entry may have been extended or replaced in the meantime
+    generation = invalidations
+    pending = loading.setdefault(key, [])
+    try:
+        columns = await fetch_columns(username, universe, entry["watermark"] if entry else None)
+    finally:
+        if loading.get(key) is pending:
+            loading.pop(key, None)
+
+    if invalidations != generation:
+        return await get_columns(username, universe)
+
+    entry = race_cache.get(key)
+    if entry is not None:
+        columns = merge_columns(entry["columns"], columns)
+        watermark = max(watermark, entry["watermark"])
+    for new_columns in pending:
+        columns = merge_columns(columns, new_columns)
+        watermark = max(watermark, int(new_columns["number"].max()))
+    cache_columns(key, watermark, columns)
+
+    return columns
+
+
+def add_races(username, universe, race_list):
+    # Extends a cached user in place with freshly imported races
+    key = (universe, username)
+    entry = race_cache.get(key)
+    if (entry is None and key not in loading) or not race_list:
+        return
+
+    new_columns = to_columns([(
+        race["number"], race["timestamp"], race["text_id"], race["wpm"], race["unlagged"],
+        race["adjusted"], race["raw_adjusted"], race["pauseless_adjusted"], race["accuracy"] or 0,
+        race["points"] or 0, race["rank"] or 0, race["racers"] or 0, race["duration"] or 0,
+    ) for race in race_list])
+    if key in loading:
+        loading[key].append(new_columns)
+    if entry is not None:
+        watermark = max(entry["watermark"], int(new_columns["number"].max()))
+        cache_columns(key, watermark, merge_columns(entry["columns"], new_columns))
+
+
+def invalidate(username, universe):
+    global race_cache_bytes, invalidations
+    invalidations += 1
+    entry = race_cache.pop((universe, username), None)
+    if entry:
+        race_cache_bytes -= entry["bytes"]
+
+
+def filter_races(
+    columns, wpm="wpm", start_date=None, end_date=None, start_number=None, end_number=None,
+    universe="play", text_pool="all", order_by=None,
+):
+    # Same filters as races.get_races, with the chosen wpm metric exposed as "wpm"
+    from database.main.races import maintrack_text_pool
+
+    mask = np.ones(len(columns["number"]), dtype=bool)
+    if wpm in ["wpm_raw", "wpm_pauseless"]:
+        mask &= ~np.isnan(columns[wpm])
+    if text_pool != "all" and universe == "play":
+        mask &= np.isin(columns["text_id"], maintrack_text_pool)
+    if start_number:
+        mask &= columns["number"] >= start_number
+    if end_number:
+        mask &= columns["number"] <= end_number
+    if start_date:
+        mask &= columns["timestamp"] >= start_date
+    if end_date:
+        mask &= columns["timestamp"] < end_date
+
+    filtered = {name: values[mask] for name, values in columns.items()}
+    filtered["wpm"] = columns[wpm][mask]
+
+    if order_by and np.any(np.diff(filtered[order_by]) < 0):
+        order = np.argsort(filtered[order_by], kind="stable")
+        filtered = {name: values[order] for name, values in filtered.items()}
+
+    return filtered
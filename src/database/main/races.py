@@ -3,7 +3,7 @@ import zlib
 from collections import defaultdict
 
 import database.main.users as users
-from database.main import db
+from database.main import db, user_text_bests, user_wpm_histogram, user_activity, user_daily_stats, race_cache
 from utils import logs
 from utils.logging import log
 
@@ -11,26 +11,37 @@ with open("./data/maintrack.json", "r") as f:
     maintrack_text_pool = json.load(f)
 
 
-def add_races(races):
-    db.run_many(f"""
-        INSERT OR IGNORE INTO races
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, [(
-        race["universe"], race["username"], race["number"], race["text_id"],
-        race["wpm"], race["accuracy"], race["points"], race["characters"],
-        race["rank"], race["racers"], race["race_id"], race["timestamp"],
-        race["unlagged"], race["adjusted"], race["raw_adjusted"],
-        race["pauseless_adjusted"], race["start"], race["duration"],
-        race["correction_time"], race["pause_time"]
-    ) for race in races])
+async def add_races(race_list):
+    # Inserts the races and folds the ones that weren't stored yet into the rollups, all in one
+    # transaction, so a batch that fails partway is redone in full by the next import
+    return await db.run_transaction_async(insert_races, race_list)
 
 
-async def get_races(
-    username, columns="*", start_date=None, end_date=None, start_number=None, end_number=None,
-    order_by=None, reverse=False, limit=None, universe="play", text_pool="all",
-):
-    users.update_last_accessed(universe, username)
+def insert_races(cursor, race_list):
+    new_races = defaultdict(list)
+    for race in race_list:
+        cursor.execute("""
+            INSERT OR IGNORE INTO races
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            race["universe"], race["username"], race["number"], race["text_id"],
+            race["wpm"], race["accuracy"], race["points"], race["characters"],
+            race["rank"], race["racers"], race["race_id"], race["timestamp"],
+            race["unlagged"], race["adjusted"], race["raw_adjusted"],
+            race["pauseless_adjusted"], race["start"], race["duration"],
+            race["correction_time"], race["pause_time"]
+        ])
+        if cursor.rowcount:
+            new_races[(race["universe"], race["username"])].append(race)
+
+    for (universe, username), user_races in new_races.items():
+        for rollup in [user_text_bests, user_wpm_histogram, user_activity, user_daily_stats]:
+            rollup.apply_races(cursor, username, universe, user_races)
 
+    return [race for user_races in new_races.values() for race in user_races]
+
+
+def get_filters(columns, universe, text_pool, start_date, end_date, start_number, end_number):
     wpm_filter = ""
     if columns != "*":
         for column in columns:
@@ -39,47 +50,78 @@ async def get_races(
                 if column in ["wpm_raw", "wpm_pauseless"]:
                     wpm_filter = f"AND {column} IS NOT NULL"
         columns = ",".join([c for c in columns])
-    order = "DESC" if reverse else "ASC"
-
-    batch_size = 100_000
-    offset = 0
-
-    if limit:
-        limit_string = f"LIMIT {limit}"
-    else:
-        limit_string = f"LIMIT {batch_size} OFFSET {offset}"
 
     text_pool_string = (
         f"AND text_id IN ({",".join([str(tid) for tid in maintrack_text_pool])})"
         if text_pool != "all" and universe == "play" else ""
     )
 
-    race_list = []
+    filters = f"""
+        {text_pool_string}
+        {wpm_filter}
+        {f'AND number >= {start_number}' if start_number else ''}
+        {f'AND number <= {end_number}' if end_number else ''}
+        {f'AND timestamp >= {start_date}' if start_date else ''}
+        {f'AND timestamp < {end_date}' if end_date else ''}
+    """
+
+    return columns, filters
+
+
+async def get_races(
+    username, columns="*", start_date=None, end_date=None, start_number=None, end_number=None,
+    order_by=None, reverse=False, limit=None, universe="play", text_pool="all",
+):
+    users.update_last_accessed(universe, username)
+
+    columns, filters = get_filters(columns, universe, text_pool, start_date, end_date, start_number, end_number)
+    order = "DESC" if reverse else "ASC"
+
+    race_list = await db.fetch_async(f"""
+        SELECT {columns} FROM races
+        INDEXED BY idx_races_universe_username
+        WHERE universe = ?
+        AND username = ?
+        {filters}
+        {f'ORDER BY {order_by} {order}' if order_by else ''}
+        {f'LIMIT {limit}' if limit else ''}
+    """, [universe, username])
+
+    return race_list
+
+
+async def stream_races(
+    username, columns="*", start_date=None, end_date=None, start_number=None, end_number=None,
+    reverse=False, universe="play", text_pool="all", batch_size=100_000,
+):
+    # Yields batches of races in race number order, resuming each batch after the last seen number
+    users.update_last_accessed(universe, username)
+
+    if columns != "*" and "number" not in columns:
+        columns = columns + ["number"]
+    columns, filters = get_filters(columns, universe, text_pool, start_date, end_date, start_number, end_number)
+    order, comparison = ("DESC", "<") if reverse else ("ASC", ">")
+
+    last_number = None
     while True:
-        batch_races = await db.fetch_async(f"""
+        batch = await db.fetch_async(f"""
             SELECT {columns} FROM races
-            INDEXED BY idx_races_universe_username
             WHERE universe = ?
             AND username = ?
-            {text_pool_string}
-            {wpm_filter}
-            {f'AND number >= {start_number}' if start_number else ''}
-            {f'AND number <= {end_number}' if end_number else ''}
-            {f'AND timestamp >= {start_date}' if start_date else ''}
-            {f'AND timestamp < {end_date}' if end_date else ''}
-            {f'ORDER BY {order_by} {order}' if order_by else ''}
-            {limit_string}
+            {filters}
+            {f'AND number {comparison} {last_number}' if last_number is not None else ''}
+            ORDER BY number {order}
+            LIMIT {batch_size}
         """, [universe, username])
 
-        race_list += batch_races
-
-        if limit or not batch_races:
+        if not batch:
             break
 
-        offset += batch_size
-        limit_string = f"LIMIT {batch_size} OFFSET {offset}"
+        yield batch
 
-    return race_list
+        if len(batch) < batch_size:
+            break
+        last_number = batch[-1]["number"]
 
 
 async def get_race(username, number, universe, get_log=False, get_keystrokes=False, get_typos=False):
@@ -216,9 +258,12 @@ async def delete_race(username, race_number, universe="play"):
         AND number = ?
     """, [universe, username, race_number])
 
+    await user_text_bests.refresh_text(username, race["text_id"], universe)
+    await user_wpm_histogram.remove_race(username, universe, race["wpm_adjusted"])
+    await user_activity.remove_race(username, universe, race["timestamp"])
+    await user_daily_stats.refresh_day(username, universe, race["timestamp"])
+    race_cache.invalidate(username, universe)
+
     if universe == "play":
-        db.run("""
-            DELETE FROM text_results
-            WHERE username = ?
-            AND number = ?
-        """, [username, race_number])
+        from database.main.text_results import delete_result
+        delete_result(username, race_number)
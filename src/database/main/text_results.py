@@ -10,46 +10,134 @@ from database.main.alts import get_alts
 from database.main.users import get_disqualified_users
 
 
+top_10_index = None
+stale_text_ids = set()
+exclusions = None
+
+
+def get_exclusions():
+    # Alt groups keyed by their first member, and the set of banned users
+    global exclusions
+    if exclusions is None:
+        alt_keys = {username: group[0] for username, group in get_alts().items()}
+        exclusions = (alt_keys, set(get_disqualified_users()))
+
+    return exclusions
+
+
+def filter_scores(scores, n=10):
+    alt_keys, banned = get_exclusions()
+    seen = set()
+    unique_scores = []
+
+    for score in scores:
+        username = score["username"]
+        if username in banned:
+            continue
+        key = alt_keys.get(username, username)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique_scores.append(score)
+        if len(unique_scores) == n:
+            break
+
+    return unique_scores
+
+
+def invalidate_texts(text_ids):
+    stale_text_ids.update(text_ids)
+
+
+def invalidate_users(usernames):
+    # Only texts where one of the users currently places can change
+    if top_10_index is None:
+        return
+    usernames = set(usernames)
+    invalidate_texts([
+        text_id for text_id, top_10 in top_10_index.items()
+        if any(score["username"] in usernames for score in top_10)
+    ])
+
+
+def invalidate_alts(usernames):
+    global exclusions
+    exclusions = None
+    invalidate_users(usernames)
+
+
+def update_banned(username, banned):
+    global exclusions, top_10_index
+    if exclusions is not None:
+        if (username in exclusions[1]) == bool(banned):
+            return
+        if banned:
+            exclusions[1].add(username)
+        else:
+            exclusions[1].discard(username)
+
+    # Exclusions that were dropped are reloaded with the new ban status on the next lookup
+    if banned:
+        invalidate_users([username])
+    else:
+        # An unbanned user may place on any text, so rebuild everything
+        top_10_index = None
+
+
 def add_results(results):
     db.run_many("""
         INSERT OR IGNORE INTO text_results
         VALUES (?, ?, ?, ?, ?, ?, ?)
     """, results)
+    invalidate_texts(set(result[0] for result in results))
 
 
 def get_count():
     return db.fetch("SELECT COUNT(DISTINCT text_id) FROM text_results")[0][0]
 
 
-def get_top_10s():
-    results = db.fetch("SELECT * FROM text_results")
-    alts = get_alts()
-    banned = get_disqualified_users()
-
-    top_10s = defaultdict(list)
+def index_results(index, results, text_ids=()):
+    scores = {text_id: [] for text_id in text_ids}
     for result in results:
-        top_10s[result["text_id"]].append(result)
-
-    filtered_top_10s = {}
-    for text_id, scores in top_10s.items():
-        scores.sort(key=lambda x: x["wpm"], reverse=True)
-
-        unique_scores = []
-        for score in scores:
-            username = score["username"]
-            if username in banned:
-                continue
-            if username in alts:
-                existing_score = next((score for score in unique_scores if score["username"] in alts[username]), None)
-            else:
-                existing_score = next((score for score in unique_scores if score["username"] == username), None)
+        scores.setdefault(result["text_id"], []).append(result)
 
-            if not existing_score:
-                unique_scores.append(score)
-
-        filtered_top_10s[text_id] = unique_scores[:10]
+    for text_id, text_scores in scores.items():
+        if not text_scores:
+            index.pop(text_id, None)
+            continue
+        text_scores.sort(key=lambda x: x["wpm"], reverse=True)
+        index[text_id] = filter_scores(text_scores)
+
+
+async def get_top_10s():
+    # The index can be reset and texts invalidated while fetching, so stale texts
+    # are only dropped once their results are applied to the index they were fetched for
+    global top_10_index
+    while top_10_index is None or stale_text_ids:
+        index = top_10_index
+        text_ids = list(stale_text_ids)
+        stale_text_ids.clear()
+        try:
+            if index is None:
+                results = await db.fetch_async("SELECT * FROM text_results")
+            else:
+                results = await db.fetch_async(f"""
+                    SELECT * FROM text_results
+                    WHERE text_id IN ({",".join(["?"] * len(text_ids))})
+                """, text_ids)
+        except BaseException:
+            stale_text_ids.update(text_ids)
+            raise
+
+        if index is None:
+            top_10_index = {}
+            index_results(top_10_index, results)
+        elif top_10_index is index:
+            index_results(index, results, text_ids)
+        else:
+            stale_text_ids.update(text_ids)
 
-    return filtered_top_10s
+    return dict(top_10_index)
 
 
 def get_top_n(text_id, n=10, wpm="wpm_adjusted"):
@@ -76,29 +164,11 @@ def get_top_n(text_id, n=10, wpm="wpm_adjusted"):
             ORDER BY wpm DESC
         """, [text_id])
 
-    top_10 = []
-    alts = get_alts()
-    banned = get_disqualified_users()
-
-    for result in results:
-        username = result["username"]
-        if username in banned:
-            continue
-        if username in alts:
-            existing_score = next((score for score in top_10 if score["username"] in alts[username]), None)
-        else:
-            existing_score = next((score for score in top_10 if score["username"] == username), None)
-        if existing_score:
-            continue
-        top_10.append(result)
-        if len(top_10) == n:
-            break
+    return filter_scores(results, n)
 
-    return top_10
 
-
-def get_top_10_counts(username, text_pool="all"):
-    top_10s = get_top_10s()
+async def get_top_10_counts(username, text_pool="all"):
+    top_10s = await get_top_10s()
     top_10_counts = [0] * 10
 
     if text_pool == "maintrack":
@@ -106,17 +176,18 @@ def get_top_10_counts(username, text_pool="all"):
         top_10s = {key: top_10s[key] for key in top_10s if key in maintrack_text_pool}
 
     for top_10 in top_10s.values():
-        usernames = [race["username"] for race in top_10]
-        if username in usernames:
-            top_10_counts[usernames.index(username)] += 1
+        for position, race in enumerate(top_10):
+            if race["username"] == username:
+                top_10_counts[position] += 1
+                break
 
     return top_10_counts
 
 
-def get_top_n_counts(n=10):
+async def get_top_n_counts(n=10):
     top_10_users = defaultdict(int)
 
-    top_10s = get_top_10s()
+    top_10s = await get_top_10s()
     for top_10 in top_10s.values():
         for race in top_10[:n]:
             top_10_users[race["username"]] += 1
@@ -152,7 +223,7 @@ async def update_results(text_id):
         return
 
     scores = []
-    top_10_database = texts.get_top_10(text_id)
+    top_10_database = await texts.get_top_10(text_id)
     for score in top_10_database:
         scores.append((
             text_id, score["username"], score["number"], score["wpm_adjusted"],
@@ -181,11 +252,18 @@ async def update_results(text_id):
 
 
 def delete_result(username, race_number):
+    results = db.fetch("""
+        SELECT text_id FROM text_results
+        WHERE username = ?
+        AND number = ?
+    """, [username, race_number])
+
     db.run("""
         DELETE FROM text_results
         WHERE username = ?
         AND number = ?
     """, [username, race_number])
+    invalidate_texts([result["text_id"] for result in results])
 
 
 def delete_results(text_id):
@@ -193,6 +271,7 @@ def delete_results(text_id):
         DELETE FROM text_results
         WHERE text_id = ?
     """, [text_id])
+    invalidate_texts([text_id])
 
 
 def delete_user_results(username):
@@ -200,3 +279,4 @@ def delete_user_results(username):
         DELETE FROM text_results
         WHERE username = ?
     """, [username])
+    invalidate_users([username])
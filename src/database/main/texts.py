@@ -1,8 +1,55 @@
+import time
+from collections import OrderedDict
+
 from database.main import db
-from database.main.alts import get_alts
 from utils import urls
 from utils.text_difficulty import set_difficulties
 
+catalogue_ttl = 3600
+catalogue_size = 8
+catalogues = OrderedDict()
+catalogue_version = 0
+disabled_text_ids = None
+
+
+def invalidate_catalogues():
+    global catalogue_version, disabled_text_ids
+    catalogue_version += 1
+    catalogues.clear()
+    disabled_text_ids = None
+
+
+def get_catalogue(universe):
+    # Cached text listings per universe, evicted least recently used and refreshed after the TTL
+    catalogue = catalogues.get(universe)
+    if catalogue and catalogue["version"] == catalogue_version and catalogue["expires"] > time.time():
+        catalogues.move_to_end(universe)
+        return catalogue
+
+    texts = db.fetch("""
+        SELECT texts.*, text_universes.* FROM texts
+        JOIN text_universes USING (text_id)
+        WHERE universe = ?
+    """, [universe])
+
+    text_list = []
+    for text in texts:
+        text = dict(text)
+        text["ghost"] = urls.ghost(text["text_id"], universe)
+        text_list.append(text)
+
+    catalogue = dict(
+        version=catalogue_version,
+        expires=time.time() + catalogue_ttl,
+        texts=text_list,
+        views={},
+    )
+    catalogues[universe] = catalogue
+    if len(catalogues) > catalogue_size:
+        catalogues.popitem(last=False)
+
+    return catalogue
+
 
 def add_texts(text_list, universe):
     text_list = set_difficulties(text_list)
@@ -17,6 +64,8 @@ def add_texts(text_list, universe):
         VALUES (?, ?, ?, ?)
     """, [(universe, text["text_id"], 0, text["difficulty"]) for text in text_list])
 
+    invalidate_catalogues()
+
 
 def add_text(text, universe):
     db.run(f"""
@@ -32,6 +81,7 @@ def add_text(text, universe):
         VALUES (?, ?, ?, ?)
     """, [universe, text["tid"], 0, 0])
 
+    invalidate_catalogues()
     update_text_difficulties(universe)
 
 
@@ -51,35 +101,36 @@ def update_text(text):
         WHERE text_id = ?
     """, [text["tid"]])
 
+    invalidate_catalogues()
     for universe in universes:
         update_text_difficulties(universe[0])
 
 
-def get_texts(as_dictionary=False, get_disabled=True, universe="play", text_pool="all"):
+def get_texts(as_dictionary=False, get_disabled=True, universe="play", text_pool="all", read_only=False):
     from database.main.races import maintrack_text_pool
-    text_pool_string = (
-        f"AND text_id IN ({",".join([str(tid) for tid in maintrack_text_pool])})"
-        if text_pool != "all" and universe == "play" else ""
-    )
+    text_pool = text_pool if universe == "play" else "all"
+    catalogue = get_catalogue(universe)
+    view_key = (get_disabled, text_pool)
 
-    texts = db.fetch(f"""
-        SELECT texts.*, text_universes.* FROM texts
-        JOIN text_universes USING (text_id)
-        WHERE universe = ?
-        {'AND disabled = 0' * (not get_disabled)}
-        {text_pool_string}
-    """, [universe])
+    if view_key not in catalogue["views"]:
+        text_list = catalogue["texts"]
+        if not get_disabled:
+            text_list = [text for text in text_list if not text["disabled"]]
+        if text_pool != "all":
+            text_pool_ids = set(maintrack_text_pool)
+            text_list = [text for text in text_list if text["text_id"] in text_pool_ids]
+        catalogue["views"][view_key] = (text_list, {text["text_id"]: text for text in text_list})
 
-    text_list = []
-    for text in texts:
-        text = dict(text)
-        text["ghost"] = urls.ghost(text["text_id"], universe)
-        text_list.append(text)
+    text_list, text_dict = catalogue["views"][view_key]
+
+    # Read only callers share the cached dicts, everyone else gets their own copies
+    if read_only:
+        return text_dict if as_dictionary else text_list
 
     if as_dictionary:
-        return {text["text_id"]: text for text in text_list}
+        return {text_id: dict(text) for text_id, text in text_dict.items()}
 
-    return text_list
+    return [dict(text) for text in text_list]
 
 
 def get_text(text_id, universe="play"):
@@ -110,17 +161,20 @@ def get_text_count(universe="play"):
 
 
 def get_disabled_text_ids():
-    texts = db.fetch("""
-        SELECT text_id FROM text_universes
-        WHERE disabled = 1
-    """)
+    global disabled_text_ids
+    if disabled_text_ids is None:
+        texts = db.fetch("""
+            SELECT text_id FROM text_universes
+            WHERE disabled = 1
+        """)
+        disabled_text_ids = frozenset(text["text_id"] for text in texts)
 
-    return [text["text_id"] for text in texts]
+    return disabled_text_ids
 
 
-def get_top_10(text_id):
-    from database.main.users import get_disqualified_users
-    results = db.fetch("""
+async def get_top_10(text_id):
+    from database.main.text_results import filter_scores
+    results = await db.fetch_async("""
         SELECT * FROM races
         WHERE universe = "play"
         AND text_id = ?
@@ -128,25 +182,7 @@ def get_top_10(text_id):
 
     results.sort(key=lambda x: x["wpm_adjusted"], reverse=True)
 
-    top_10 = []
-    alts = get_alts()
-    banned = set(get_disqualified_users())
-
-    for result in results:
-        username = result["username"]
-        if username in banned:
-            continue
-        if username in alts:
-            existing_score = next((score for score in top_10 if score["username"] in alts[username]), None)
-        else:
-            existing_score = next((score for score in top_10 if score["username"] == username), None)
-        if existing_score:
-            continue
-        top_10.append(result)
-        if len(top_10) == 10:
-            break
-
-    return top_10
+    return filter_scores(results)
 
 
 async def _toggle_text(text_id, state):
@@ -160,6 +196,7 @@ async def _toggle_text(text_id, state):
         AND text_id = ?
     """, [state, text_id])
 
+    invalidate_catalogues()
     if state == 0:
         await update_results(text_id)
     else:
@@ -173,7 +210,7 @@ async def _toggle_text(text_id, state):
     """, [text_id])
 
     for username in outdated_users:
-        update_text_stats(str(username[0]), "play")
+        await update_text_stats(str(username[0]), "play")
 
 
 async def enable_text(text_id):
@@ -220,3 +257,5 @@ def update_text_difficulties(universe):
         WHERE universe = ?
         AND text_id = ?
     """, results)
+
+    invalidate_catalogues()
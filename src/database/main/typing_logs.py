@@ -10,8 +10,8 @@ def decompress(log):
     return zlib.decompress(log).decode("utf-8")
 
 
-def add_logs(typing_logs):
-    db.run_many(f"""
+async def add_logs(typing_logs):
+    await db.run_many_async(f"""
         INSERT OR IGNORE INTO typing_logs
         VALUES (?, ?, ?, ?, 0)
     """, [(
@@ -0,0 +1,136 @@
+import math
+from collections import Counter
+
+from database.main import db
+
+
+def get_bucket(timestamp):
+    timestamp = int(timestamp)
+    return timestamp // 86400, timestamp % 86400 // 3600
+
+
+def get_hour_of_week(day, hour):
+    # Day 0 (January 1st, 1970) was a Thursday, weeks start on Sunday
+    return (day + 4) % 7 * 24 + hour
+
+
+built_query = """
+    SELECT 1 FROM user_activity
+    WHERE universe = ?
+    AND username = ?
+    LIMIT 1
+"""
+rebuild_queries = ["""
+    DELETE FROM user_activity
+    WHERE universe = ?
+    AND username = ?
+""", """
+    INSERT INTO user_activity
+    SELECT universe, username, CAST(timestamp AS INTEGER) / 86400 AS day,
+        CAST(timestamp AS INTEGER) % 86400 / 3600 AS hour, COUNT(*)
+    FROM races
+    INDEXED BY idx_races_universe_username
+    WHERE universe = ?
+    AND username = ?
+    GROUP BY day, hour
+"""]
+
+
+def is_built(username, universe):
+    row = db.fetch(built_query, [universe, username])
+
+    return bool(row)
+
+
+async def rebuild(username, universe):
+    for query in rebuild_queries:
+        await db.run_async(query, [universe, username])
+
+
+def apply_races(cursor, username, universe, race_list):
+    # Inside races.add_races' transaction
+    if not cursor.execute(built_query, [universe, username]).fetchone():
+        for query in rebuild_queries:
+            cursor.execute(query, [universe, username])
+        return
+
+    counts = Counter(get_bucket(race["timestamp"]) for race in race_list)
+    cursor.executemany("""
+        INSERT INTO user_activity
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (universe, username, day, hour) DO UPDATE SET
+            races = races + excluded.races
+    """, [(universe, username, day, hour, races) for (day, hour), races in counts.items()])
+
+
+async def remove_race(username, universe, timestamp):
+    day, hour = get_bucket(timestamp)
+    await db.run_async("""
+        UPDATE user_activity
+        SET races = races - 1
+        WHERE universe = ?
+        AND username = ?
+        AND day = ?
+        AND hour = ?
+    """, [universe, username, day, hour])
+
+
+async def delete_user(username, universe):
+    await db.run_async("""
+        DELETE FROM user_activity
+        WHERE universe = ?
+        AND username = ?
+    """, [universe, username])
+
+
+def count_races(timestamps):
+    hour_counts = [0] * 168
+    for timestamp in timestamps:
+        hour_counts[get_hour_of_week(*get_bucket(timestamp))] += 1
+
+    return hour_counts
+
+
+async def get_activity(username, universe, start_date=None, end_date=None):
+    # Race counts per UTC hour of the week, whole days come from the rollup
+    # and any partial days at the edges of the range are counted from races
+    if not is_built(username, universe):
+        await rebuild(username, universe)
+
+    first_day = math.ceil(start_date / 86400) if start_date else None
+    last_day = math.floor(end_date / 86400) if end_date else None
+    edges = []
+    if first_day is not None and last_day is not None and first_day > last_day:
+        edges.append((start_date, end_date))
+        first_day = last_day
+    else:
+        if first_day is not None:
+            edges.append((start_date, first_day * 86400))
+        if last_day is not None:
+            edges.append((last_day * 86400, end_date))
+
+    rollup = await db.fetch_async(f"""
+        SELECT day, hour, races FROM user_activity
+        WHERE universe = ?
+        AND username = ?
+        {'AND day >= ?' if first_day is not None else ''}
+        {'AND day < ?' if last_day is not None else ''}
+    """, [universe, username] + [day for day in [first_day, last_day] if day is not None])
+
+    hour_counts = [0] * 168
+    for day, hour, races in rollup:
+        hour_counts[get_hour_of_week(day, hour)] += races
+
+    for start, end in edges:
+        timestamps = await db.fetch_async("""
+            SELECT timestamp FROM races
+            INDEXED BY idx_races_universe_username
+            WHERE universe = ?
+            AND username = ?
+            AND timestamp >= ?
+            AND timestamp < ?
+        """, [universe, username, start, end])
+        for i, races in enumerate(count_races(row[0] for row in timestamps)):
+            hour_counts[i] += races
+
+    return hour_counts
@@ -0,0 +1,159 @@
+import math
+from collections import defaultdict
+
+from database.main import db
+
+# typing_time is the race time implied by adjusted WPM, as used by racehistory
+aggregate_columns = """
+    CAST(timestamp AS INTEGER) / 86400 AS day, COUNT(*) AS races,
+    IFNULL(SUM(points), 0) AS points, SUM(racers > 1 AND rank = 1) AS wins,
+    IFNULL(SUM(characters), 0) AS characters, IFNULL(SUM(total_time), 0) AS total_time,
+    SUM(CASE WHEN wpm_adjusted > 0 THEN ROUND(characters * 12000.0 / wpm_adjusted) ELSE 0 END) / 1000 AS typing_time,
+    IFNULL(SUM(wpm_adjusted), 0) AS wpm_total, IFNULL(MAX(wpm_adjusted), 0) AS wpm_best,
+    IFNULL(SUM(accuracy), 0) AS accuracy_total
+"""
+
+
+built_query = """
+    SELECT 1 FROM user_daily_stats
+    WHERE universe = ?
+    AND username = ?
+    LIMIT 1
+"""
+rebuild_queries = ["""
+    DELETE FROM user_daily_stats
+    WHERE universe = ?
+    AND username = ?
+""", f"""
+    INSERT INTO user_daily_stats
+    SELECT universe, username, {aggregate_columns}
+    FROM races
+    INDEXED BY idx_races_universe_username
+    WHERE universe = ?
+    AND username = ?
+    GROUP BY day
+"""]
+
+
+def is_built(username, universe):
+    row = db.fetch(built_query, [universe, username])
+
+    return bool(row)
+
+
+async def rebuild(username, universe):
+    for query in rebuild_queries:
+        await db.run_async(query, [universe, username])
+
+
+def apply_races(cursor, username, universe, race_list):
+    # Inside races.add_races' transaction
+    if not cursor.execute(built_query, [universe, username]).fetchone():
+        for query in rebuild_queries:
+            cursor.execute(query, [universe, username])
+        return
+
+    days = defaultdict(lambda: [0, 0, 0, 0, 0, 0, 0, 0, 0])
+    for race in race_list:
+        wpm = race["adjusted"] or 0
+        stats = days[int(race["timestamp"]) // 86400]
+        stats[0] += 1
+        stats[1] += race["points"] or 0
+        stats[2] += race["racers"] > 1 and race["rank"] == 1
+        stats[3] += race["characters"] or 0
+        stats[4] += race["duration"] or 0
+        stats[5] += round(race["characters"] * 12000 / wpm) / 1000 if wpm > 0 else 0
+        stats[6] += wpm
+        stats[7] = max(stats[7], wpm)
+        stats[8] += race["accuracy"] or 0
+
+    cursor.executemany("""
+        INSERT INTO user_daily_stats
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (universe, username, day) DO UPDATE SET
+            races = races + excluded.races,
+            points = points + excluded.points,
+            wins = wins + excluded.wins,
+            characters = characters + excluded.characters,
+            total_time = total_time + excluded.total_time,
+            typing_time = typing_time + excluded.typing_time,
+            wpm_total = wpm_total + excluded.wpm_total,
+            wpm_best = MAX(wpm_best, excluded.wpm_best),
+            accuracy_total = accuracy_total + excluded.accuracy_total
+    """, [(universe, username, day, *stats) for day, stats in days.items()])
+
+
+async def refresh_day(username, universe, timestamp):
+    day = int(timestamp) // 86400
+    await db.run_async("""
+        DELETE FROM user_daily_stats
+        WHERE universe = ?
+        AND username = ?
+        AND day = ?
+    """, [universe, username, day])
+
+    await db.run_async(f"""
+        INSERT INTO user_daily_stats
+        SELECT universe, username, {aggregate_columns}
+        FROM races
+        INDEXED BY idx_races_universe_username
+        WHERE universe = ?
+        AND username = ?
+        AND timestamp >= ?
+        AND timestamp < ?
+        GROUP BY day
+    """, [universe, username, day * 86400, (day + 1) * 86400])
+
+
+async def delete_user(username, universe):
+    await db.run_async("""
+        DELETE FROM user_daily_stats
+        WHERE universe = ?
+        AND username = ?
+    """, [universe, username])
+
+
+async def get_days(username, universe, start_date=None, end_date=None):
+    # Daily totals in order, whole days come from the rollup and any
+    # partial days at the edges of the range are aggregated from races
+    if not is_built(username, universe):
+        await rebuild(username, universe)
+
+    first_day = math.ceil(start_date / 86400) if start_date else None
+    last_day = math.floor(end_date / 86400) if end_date else None
+    edges = []
+    if first_day is not None and last_day is not None and first_day > last_day:
+        edges.append((start_date, end_date))
+        first_day = last_day
+    else:
+        if first_day is not None:
+            edges.append((start_date, first_day * 86400))
+        if last_day is not None:
+            edges.append((last_day * 86400, end_date))
+
+    days = await db.fetch_async(f"""
+        SELECT day, races, points, wins, characters, total_time,
+            typing_time, wpm_total, wpm_best, accuracy_total
+        FROM user_daily_stats
+        WHERE universe = ?
+        AND username = ?
+        AND races > 0
+        {'AND day >= ?' if first_day is not None else ''}
+        {'AND day < ?' if last_day is not None else ''}
+    """, [universe, username] + [day for day in [first_day, last_day] if day is not None])
+
+    for start, end in edges:
+        if start >= end:
+            continue
+        days += await db.fetch_async(f"""
+            SELECT {aggregate_columns}
+            FROM races
+            INDEXED BY idx_races_universe_username
+            WHERE universe = ?
+            AND username = ?
+            AND timestamp >= ?
+            AND timestamp < ?
+            GROUP BY day
+        """, [universe, username, start, end])
+
+    return sorted(days, key=lambda day: day["day"])
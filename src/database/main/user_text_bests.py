@@ -0,0 +1,149 @@
+from database.main import db
+
+built_query = """
+    SELECT 1 FROM user_text_bests
+    WHERE universe = ?
+    AND username = ?
+    LIMIT 1
+"""
+rebuild_queries = ["""
+    DELETE FROM user_text_bests
+    WHERE universe = ?
+    AND username = ?
+""", """
+    INSERT INTO user_text_bests
+    SELECT universe, username, text_id, MAX(wpm_adjusted), number,
+        timestamp, accuracy, points, COUNT(*)
+    FROM races
+    INDEXED BY idx_races_universe_username_text_id
+    WHERE universe = ?
+    AND username = ?
+    GROUP BY text_id
+"""]
+
+
+def is_built(username, universe):
+    row = db.fetch(built_query, [universe, username])
+
+    return bool(row)
+
+
+async def rebuild(username, universe):
+    for query in rebuild_queries:
+        await db.run_async(query, [universe, username])
+
+
+def apply_races(cursor, username, universe, race_list):
+    # Folds newly inserted races into the user's text bests, inside races.add_races' transaction
+    if not cursor.execute(built_query, [universe, username]).fetchone():
+        for query in rebuild_queries:
+            cursor.execute(query, [universe, username])
+        return
+
+    text_bests = {}
+    for race in race_list:
+        text_id = race["text_id"]
+        if text_id not in text_bests:
+            text_bests[text_id] = [race, 1]
+        else:
+            text_bests[text_id][1] += 1
+            if race["adjusted"] > text_bests[text_id][0]["adjusted"]:
+                text_bests[text_id][0] = race
+
+    cursor.executemany("""
+        INSERT INTO user_text_bests
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (universe, username, text_id) DO UPDATE SET
+            number = CASE WHEN excluded.wpm > wpm THEN excluded.number ELSE number END,
+            timestamp = CASE WHEN excluded.wpm > wpm THEN excluded.timestamp ELSE timestamp END,
+            accuracy = CASE WHEN excluded.wpm > wpm THEN excluded.accuracy ELSE accuracy END,
+            points = CASE WHEN excluded.wpm > wpm THEN excluded.points ELSE points END,
+            wpm = MAX(wpm, excluded.wpm),
+            times_typed = times_typed + excluded.times_typed
+    """, [(
+        universe, username, text_id, race["adjusted"], race["number"],
+        race["timestamp"], race["accuracy"], race["points"], times_typed,
+    ) for text_id, (race, times_typed) in text_bests.items()])
+
+
+async def refresh_text(username, text_id, universe):
+    if not is_built(username, universe):
+        return
+
+    await db.run_async("""
+        DELETE FROM user_text_bests
+        WHERE universe = ?
+        AND username = ?
+        AND text_id = ?
+    """, [universe, username, text_id])
+
+    await db.run_async("""
+        INSERT INTO user_text_bests
+        SELECT universe, username, text_id, MAX(wpm_adjusted), number,
+            timestamp, accuracy, points, COUNT(*)
+        FROM races
+        INDEXED BY idx_races_universe_username_text_id
+        WHERE universe = ?
+        AND username = ?
+        AND text_id = ?
+        GROUP BY text_id
+    """, [universe, username, text_id])
+
+
+async def get_text_bests(username, universe, race_stats=False, text_pool_string=""):
+    columns = "text_id, wpm"
+    if race_stats:
+        columns = "text_id, wpm, number, timestamp, accuracy, points"
+
+    text_bests = await db.fetch_async(f"""
+        SELECT {columns} FROM user_text_bests
+        WHERE universe = ?
+        AND username = ?
+        {text_pool_string}
+        ORDER BY wpm DESC
+    """, [universe, username])
+
+    return text_bests
+
+
+async def get_text_stats(username, universe):
+    stats = (await db.fetch_async("""
+        SELECT COUNT(*) AS texts_typed, IFNULL(SUM(wpm), 0) AS text_wpm_total
+        FROM user_text_bests
+        WHERE universe = ?
+        AND username = ?
+        AND text_id NOT IN (
+            SELECT text_id FROM text_universes
+            WHERE disabled = 1
+        )
+    """, [universe, username]))[0]
+
+    texts_typed = stats["texts_typed"]
+    text_wpm_total = stats["text_wpm_total"]
+
+    return {
+        "texts_typed": texts_typed,
+        "text_best_average": text_wpm_total / texts_typed if texts_typed else 0,
+        "text_wpm_total": text_wpm_total,
+    }
+
+
+async def get_repeated_quote(username, universe):
+    repeated_quote = await db.fetch_async("""
+        SELECT text_id, times_typed
+        FROM user_text_bests
+        WHERE universe = ?
+        AND username = ?
+        ORDER BY times_typed DESC
+        LIMIT 1
+    """, [universe, username])
+
+    return repeated_quote[0]
+
+
+async def delete_user(username, universe):
+    await db.run_async("""
+        DELETE FROM user_text_bests
+        WHERE universe = ?
+        AND username = ?
+    """, [universe, username])
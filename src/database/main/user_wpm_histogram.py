@@ -0,0 +1,189 @@
+import asyncio
+from collections import defaultdict
+
+from database.main import db, user_text_bests
+
+bucket_query = """
+    SELECT universe, username, wpm, SUM(races), SUM(texts) FROM (
+        SELECT universe, username, CAST(wpm_adjusted AS INTEGER) AS wpm, COUNT(*) AS races, 0 AS texts
+        FROM races
+        {index}
+        WHERE wpm_adjusted IS NOT NULL
+        {filter}
+        GROUP BY universe, username, CAST(wpm_adjusted AS INTEGER)
+        UNION ALL
+        SELECT universe, username, CAST(MAX(wpm_adjusted) AS INTEGER), 0, 1
+        FROM races
+        {index}
+        WHERE wpm_adjusted IS NOT NULL
+        {filter}
+        GROUP BY universe, username, text_id
+    )
+    GROUP BY universe, username, wpm
+"""
+
+
+built_query = """
+    SELECT 1 FROM user_wpm_histogram
+    WHERE universe = ?
+    AND username = ?
+    LIMIT 1
+"""
+
+
+def get_rebuild_queries(username, universe):
+    return [("""
+        DELETE FROM user_wpm_histogram
+        WHERE universe = ?
+        AND username = ?
+    """, [universe, username]), ("INSERT INTO user_wpm_histogram " + bucket_query.format(
+        index="INDEXED BY idx_races_universe_username_text_id",
+        filter="AND universe = ? AND username = ?",
+    ), [universe, username] * 2)]
+
+
+def get_text_queries(username, universe, text_bests_built):
+    # Counting from the user's text bests when they're built, otherwise from their races
+    text_bests = "user_text_bests"
+    params = [universe, username]
+    if not text_bests_built:
+        params += [universe, username]
+        text_bests = """(
+            SELECT universe, username, MAX(wpm_adjusted) AS wpm FROM races
+            INDEXED BY idx_races_universe_username_text_id
+            WHERE universe = ?
+            AND username = ?
+            GROUP BY text_id
+        )"""
+
+    return [("""
+        UPDATE user_wpm_histogram
+        SET texts = 0
+        WHERE universe = ?
+        AND username = ?
+    """, [universe, username]), (f"""
+        INSERT INTO user_wpm_histogram
+        SELECT universe, username, CAST(wpm AS INTEGER), 0, COUNT(*)
+        FROM {text_bests}
+        WHERE universe = ?
+        AND username = ?
+        AND wpm IS NOT NULL
+        GROUP BY CAST(wpm AS INTEGER)
+        ON CONFLICT (universe, username, wpm) DO UPDATE SET
+            texts = excluded.texts
+    """, params), ("""
+        DELETE FROM user_wpm_histogram
+        WHERE universe = ?
+        AND username = ?
+        AND races <= 0
+        AND texts = 0
+    """, [universe, username])]
+
+
+def is_built(username, universe):
+    row = db.fetch(built_query, [universe, username])
+
+    return bool(row)
+
+
+async def rebuild(username, universe):
+    for query, params in get_rebuild_queries(username, universe):
+        await db.run_async(query, params)
+
+
+async def backfill(batch_size=20):
+    # Fills the histogram for users who haven't imported since it was added, a few users per write
+    # so imports aren't queued behind a single pass over every race
+    user_list = await db.fetch_async("""
+        SELECT DISTINCT universe, username FROM races
+        INDEXED BY idx_races_universe_username
+    """)
+    built = {tuple(user) for user in await db.fetch_async("""
+        SELECT DISTINCT universe, username FROM user_wpm_histogram
+    """)}
+    user_list = [tuple(user) for user in user_list if tuple(user) not in built]
+
+    backfilled = 0
+    for i in range(0, len(user_list), batch_size):
+        backfilled += await db.run_transaction_async(backfill_users, user_list[i:i + batch_size])
+        await asyncio.sleep(0)
+
+    return backfilled
+
+
+def backfill_users(cursor, user_list):
+    # Users rebuilt by an import in the meantime already have fresh rows
+    backfilled = 0
+    for universe, username in user_list:
+        if not cursor.execute(built_query, [universe, username]).fetchone():
+            for query, params in get_rebuild_queries(username, universe):
+                cursor.execute(query, params)
+            backfilled += cursor.rowcount > 0
+
+    return backfilled
+
+
+def apply_races(cursor, username, universe, race_list):
+    # Inside races.add_races' transaction, after user_text_bests has taken the same races
+    if not cursor.execute(built_query, [universe, username]).fetchone():
+        for query, params in get_rebuild_queries(username, universe):
+            cursor.execute(query, params)
+        return
+
+    buckets = defaultdict(int)
+    for race in race_list:
+        if race["adjusted"] is not None:
+            buckets[int(race["adjusted"])] += 1
+
+    cursor.executemany("""
+        INSERT INTO user_wpm_histogram
+        VALUES (?, ?, ?, ?, 0)
+        ON CONFLICT (universe, username, wpm) DO UPDATE SET
+            races = races + excluded.races
+    """, [(universe, username, wpm, races) for wpm, races in buckets.items()])
+
+    for query, params in get_text_queries(username, universe, True):
+        cursor.execute(query, params)
+
+
+async def remove_race(username, universe, wpm):
+    if wpm is None:
+        return
+
+    await db.run_async("""
+        UPDATE user_wpm_histogram
+        SET races = races - 1
+        WHERE universe = ?
+        AND username = ?
+        AND wpm = ?
+    """, [universe, username, int(wpm)])
+
+    await refresh_texts(username, universe)
+
+
+async def refresh_texts(username, universe):
+    for query, params in get_text_queries(username, universe, user_text_bests.is_built(username, universe)):
+        await db.run_async(query, params)
+
+
+async def get_counts_over(wpm, column, universe="play"):
+    # Suffix sum of each user's buckets, exact for whole number thresholds
+    top = await db.fetch_async(f"""
+        SELECT h.username, u.country, SUM(h.{column}) AS {column}_over
+        FROM user_wpm_histogram h
+        JOIN users u USING (username)
+        WHERE universe = ?
+        AND wpm >= ?
+        GROUP BY username
+        HAVING {column}_over > 0
+    """, [universe, wpm])
+
+    return top
+
+
+async def delete_user(username, universe):
+    await db.run_async("""
+        DELETE FROM user_wpm_histogram
+        WHERE universe = ?
+        AND username = ?
+    """, [universe, username])
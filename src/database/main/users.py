@@ -1,30 +1,32 @@
 import time
 
-from database.main import texts, db
+import numpy as np
+
+from database.main import texts, db, user_text_bests, user_wpm_histogram, user_activity, user_daily_stats, race_cache
 from database.main.races import maintrack_text_pool
 from database.main.texts import filter_disabled, get_disabled_text_ids
 from utils import dates
 from utils.logging import log
-from utils.stats import get_text_stats, calculate_text_bests, calculate_total_performance
+from utils.stats import calculate_text_bests, calculate_total_performances
 from utils.strings import get_date_query_string
 
 
-def create_user_data(racer):
-    db.run("""
+async def create_user_data(racer):
+    await db.run_async("""
         INSERT INTO users (username, joined) VALUES (?, ?)
     """, [racer["username"], racer["joined_at"]])
 
 
-def create_user_stats(racer):
-    db.run("""
+async def create_user_stats(racer):
+    await db.run_async("""
         INSERT INTO user_stats
         (universe, username, points_retroactive, total_time, characters, last_accessed)
         VALUES (?, ?, ?, ?, ?, datetime('now'))
     """, [racer["universe"], racer["username"], 0, 0, 0])
 
 
-def update_user_data(racer):
-    db.run("""
+async def update_user_data(racer):
+    await db.run_async("""
         UPDATE users
         SET display_name = ?, premium = ?, country = ?,
         avatar = ?, last_updated = ?
@@ -35,8 +37,9 @@ def update_user_data(racer):
     ])
 
 
-def update_user_stats(racer):
-    db.run("""
+async def update_user_stats(racer):
+    previous = get_user_stats(racer["username"], racer["universe"])
+    await db.run_async("""
         UPDATE user_stats
         SET wpm_average = ?, wpm_best = ?, wpm_verified = ?,
         races = ?, wins = ?, points = ?, disqualified = ?
@@ -47,9 +50,16 @@ def update_user_stats(racer):
         racer["total_wins"], racer["points"], racer["dqd"], racer["universe"], racer["username"],
     ])
 
+    if racer["universe"] == "play":
+        from database.main.text_results import update_banned
+        update_banned(racer["username"], racer["dqd"])
+        if previous and bool(previous["disqualified"]) != bool(racer["dqd"]):
+            from database.main.leaderboards import mark_stale
+            mark_stale()
 
-def update_user_aggregate_stats(username, universe, points_retroactive, total_time, characters):
-    db.run("""
+
+async def update_user_aggregate_stats(username, universe, points_retroactive, total_time, characters):
+    await db.run_async("""
         UPDATE user_stats
         SET
             points_retroactive = points_retroactive + ?,
@@ -121,7 +131,7 @@ def get_user_stats(username, universe):
 
 
 def update_last_accessed(universe, username):
-    db.run("""
+    db.run_deferred("""
         UPDATE user_stats
         SET last_accessed = datetime('now')
         WHERE universe = ?
@@ -198,8 +208,8 @@ def get_most(column, limit):
     return top
 
 
-def get_best_wpm(limit):
-    top = db.fetch("""
+async def get_best_wpm(limit):
+    top = await db.fetch_async("""
         SELECT username, MAX(wpm_adjusted) as wpm FROM races
         WHERE universe = 'play'
         GROUP BY username
@@ -319,14 +329,17 @@ def get_most_awards(limit):
 
 
 async def get_most_texts_over(wpm, limit=10):
-    top = await db.fetch_async("""
-        SELECT r.username, u.country, COUNT(DISTINCT text_id) AS texts_over
-        FROM races r
-        JOIN users u USING (username)
-        WHERE universe = "play"
-        AND wpm_adjusted >= ?
-        GROUP BY username
-    """, [wpm])
+    if float(wpm).is_integer():
+        top = await user_wpm_histogram.get_counts_over(wpm, "texts")
+    else:
+        top = await db.fetch_async("""
+            SELECT r.username, u.country, COUNT(DISTINCT text_id) AS texts_over
+            FROM races r
+            JOIN users u USING (username)
+            WHERE universe = "play"
+            AND wpm_adjusted >= ?
+            GROUP BY username
+        """, [wpm])
 
     banned = get_disqualified_users()
     top.sort(key=lambda x: -x["texts_over"])
@@ -344,14 +357,17 @@ async def get_most_texts_over(wpm, limit=10):
 
 
 async def get_most_races_over(wpm, limit=10):
-    top = await db.fetch_async("""
-        SELECT r.username, u.country, COUNT(username) AS races_over
-        FROM races r
-        JOIN users u USING (username)
-        WHERE universe = "play"
-        AND wpm_adjusted >= ?
-        GROUP BY username
-    """, [wpm])
+    if float(wpm).is_integer():
+        top = await user_wpm_histogram.get_counts_over(wpm, "races")
+    else:
+        top = await db.fetch_async("""
+            SELECT r.username, u.country, COUNT(username) AS races_over
+            FROM races r
+            JOIN users u USING (username)
+            WHERE universe = "play"
+            AND wpm_adjusted >= ?
+            GROUP BY username
+        """, [wpm])
 
     banned = get_disqualified_users()
     top.sort(key=lambda x: -x["races_over"])
@@ -369,7 +385,7 @@ async def get_most_races_over(wpm, limit=10):
 
 
 async def get_most_performance():
-    text_list = texts.get_texts(as_dictionary=True)
+    text_list = texts.get_texts(as_dictionary=True, read_only=True)
     user_list = await db.fetch_async("""
         SELECT * FROM user_stats
         WHERE universe = "play"
@@ -377,11 +393,33 @@ async def get_most_performance():
         AND disqualified = 0
     """)
 
-    top = []
-    for i, user in enumerate(user_list):
-        text_bests = get_text_bests(user["username"])
-        performance = calculate_total_performance(text_bests, text_list)
-        top.append({**user, "performance": performance})
+    user_indexes = {user["username"]: i for i, user in enumerate(user_list)}
+
+    # Loading every qualifying user's text bests at once, falling back to races for any not built yet
+    text_bests = [tuple(row) for row in await db.fetch_async("""
+        SELECT username, text_id, wpm
+        FROM user_text_bests
+        JOIN user_stats USING (universe, username)
+        WHERE universe = "play"
+        AND text_best_average > 170
+        AND disqualified = 0
+        AND text_id NOT IN (
+            SELECT text_id FROM text_universes
+            WHERE disabled = 1
+        )
+    """) if row["username"] in user_indexes]
+    built = {username for username, _, _ in text_bests}
+    for username in user_indexes.keys() - built:
+        text_bests += [(username, row["text_id"], row["wpm"]) for row in await get_text_bests(username)]
+
+    performances = calculate_total_performances(
+        np.fromiter((user_indexes[username] for username, _, _ in text_bests), np.int64, len(text_bests)),
+        np.fromiter((text_id for _, text_id, _ in text_bests), np.int64, len(text_bests)),
+        np.fromiter((wpm for _, _, wpm in text_bests), np.float64, len(text_bests)),
+        text_list, len(user_list),
+    )
+
+    top = [{**user, "performance": float(performance)} for user, performance in zip(user_list, performances)]
     top.sort(key=lambda x: -x["performance"])
 
     return top
@@ -410,16 +448,17 @@ def update_stats(universe, username, wpm_average, wpm_best, wpm_verified, races,
     ])
 
 
-def update_text_stats(username, universe):
-    text_bests = get_text_bests(username, universe=universe, wpm="wpm_adjusted")
+async def update_text_stats(username, universe):
+    if not user_text_bests.is_built(username, universe):
+        await user_text_bests.rebuild(username, universe)
     try:
-        repeated_quote = get_repeated_quote(username, universe)
+        repeated_quote = await user_text_bests.get_repeated_quote(username, universe)
     except:
         log(f"Text Stats Update Failed <@155481579005804544> ({username}, {universe})")
         return
-    stats = get_text_stats(text_bests)
+    stats = await user_text_bests.get_text_stats(username, universe)
 
-    db.run(f"""
+    await db.run_async(f"""
         UPDATE user_stats
         SET texts_typed = ?, text_best_average = ?, text_wpm_total = ?,
         text_repeat_times = ?, text_repeat_id = ?
@@ -460,11 +499,18 @@ async def delete_user(username, universe):
         AND username = ?
     """, [universe, username])
 
+    await user_text_bests.delete_user(username, universe)
+    await user_wpm_histogram.delete_user(username, universe)
+    await user_activity.delete_user(username, universe)
+    await user_daily_stats.delete_user(username, universe)
+    race_cache.invalidate(username, universe)
+
     if universe == "play":
-        db.run("DELETE FROM text_results WHERE username = ?", [username])
+        from database.main.text_results import delete_user_results
+        delete_user_results(username)
 
 
-def get_text_bests(username, race_stats=False, universe="play", until=None, wpm="wpm_adjusted", text_pool="all"):
+async def get_text_bests(username, race_stats=False, universe="play", until=None, wpm="wpm_adjusted", text_pool="all"):
     columns = "text_id"
     if race_stats:
         columns = f"text_id, {wpm} AS wpm, number, timestamp, accuracy, points"
@@ -473,11 +519,15 @@ def get_text_bests(username, race_stats=False, universe="play", until=None, wpm=
         f"AND text_id IN ({",".join([str(tid) for tid in maintrack_text_pool])})"
         if text_pool != "all" and universe == "play" else ""
     )
+    if wpm == "wpm_adjusted" and not until and user_text_bests.is_built(username, universe):
+        text_bests = await user_text_bests.get_text_bests(username, universe, race_stats, text_pool_string)
+        return filter_disabled(text_bests)
+
     column_filter = ""
     if wpm in ["wpm_raw", "wpm_pauseless"]:
         column_filter = f"AND {wpm} IS NOT NULL"
 
-    text_bests = db.fetch(f"""
+    text_bests = await db.fetch_async(f"""
         SELECT {columns}, MAX({wpm}) AS wpm
         FROM races
         WHERE universe = ?
@@ -508,15 +558,15 @@ async def get_text_bests_time_travel(username, universe, user, race_stats=False,
     return text_bests
 
 
-def get_repeated_quote(username, universe):
-    repeated_quote = db.fetch(f"""
+async def get_repeated_quote(username, universe):
+    repeated_quote = (await db.fetch_async(f"""
         SELECT text_id, COUNT(*) AS times_typed
         FROM races
         WHERE universe = ?
         AND username = ?
         GROUP BY text_id
         ORDER BY times_typed DESC
-    """, [universe, username])[0]
+    """, [universe, username]))[0]
 
     return repeated_quote
 
@@ -538,7 +588,7 @@ def get_unraced_texts(username, universe="play", text_pool="all"):
     """, [universe, username])
 
     user_texts = set([text["text_id"] for text in user_texts])
-    text_list = get_texts(get_disabled=False, universe=universe, text_pool=text_pool)
+    text_list = get_texts(get_disabled=False, universe=universe, text_pool=text_pool, read_only=True)
 
     return [text for text in text_list if text["text_id"] not in user_texts]
 
@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 
 from dateutil.relativedelta import relativedelta
 
-from graphs.core import plt, color_graph, file_name
+from graphs.core import color_graph, subplots, save
 from utils import dates
 
 
@@ -27,7 +27,7 @@ def render(user, username, competitions):
         timestamps[rank - 1].append(medal["timestamp"])
         periods[rank - 1].append(period_index)
 
-    fig, ax = plt.subplots()
+    fig, ax = subplots()
     ax.scatter(x=timestamps[0], y=periods[0], color="#ffb600", zorder=30)
     ax.scatter(x=timestamps[1], y=periods[1], color="#c0c0c0", zorder=20)
     ax.scatter(x=timestamps[2], y=periods[2], color="#cd7f32", zorder=10)
@@ -52,8 +52,4 @@ def render(user, username, competitions):
 
     color_graph(ax, user)
 
-    file = file_name(f"awards_{username}")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, f"awards_{username}")
@@ -2,12 +2,12 @@ import numpy as np
 from matplotlib import patches
 from matplotlib.ticker import FuncFormatter
 
-from graphs.core import plt, color_graph, universe_title, file_name
+from graphs.core import plt, color_graph, universe_title, subplots, save
 from utils.strings import format_big_number
 
 
 def render(user, username, activity, universe):
-    fig, ax = plt.subplots()
+    fig, ax = subplots()
     days = range(len(activity))
 
     color = user["colors"]["line"]
@@ -25,11 +25,7 @@ def render(user, username, activity, universe):
 
     color_graph(ax, user)
 
-    file = file_name(f"bar_{username}")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, f"bar_{username}")
 
 
 def apply_cmap(ax, user, labels, values, top_values=None, width=0.8):
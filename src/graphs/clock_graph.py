@@ -1,12 +1,12 @@
 import numpy as np
 from matplotlib import pyplot as plt
 
-from graphs.core import color_graph, universe_title, file_name
+from graphs.core import color_graph, universe_title, Figure, save
 
 
 def render(user, username, activity, universe, offset=0):
     color = user["colors"]["line"]
-    fig = plt.figure()
+    fig = Figure()
     ax = fig.add_subplot(111, polar=True)
 
     num_bars = len(activity)
@@ -36,15 +36,11 @@ def render(user, username, activity, universe, offset=0):
     title = f"Daily Activity {offset_string} - {username}"
 
     ax.set_title(universe_title(title, universe))
-    plt.tight_layout()
+    fig.tight_layout()
 
     color_graph(ax, user)
 
-    file = file_name(f"activity_{username}")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, f"activity_{username}")
 
 
 def apply_cmap(ax, user, activity, offset):
@@ -1,12 +1,12 @@
 import numpy as np
 
-from graphs.core import plt, color_graph, file_name
+from graphs.core import plt, color_graph, subplots, save
 
 
 def render(user, user1, user2, universe):
     username1, data1 = user1
     username2, data2 = user2
-    fig, (ax1, ax2) = plt.subplots(1, 2)
+    fig, (ax1, ax2) = subplots(1, 2)
 
     color = user["colors"]["line"]
     counts1, groups1 = np.histogram(data1, bins="auto")
@@ -44,16 +44,12 @@ def render(user, user1, user2, universe):
     color_graph(ax1, user)
     color_graph(ax2, user)
 
-    plt.subplots_adjust(wspace=0, hspace=0)
+    fig.subplots_adjust(wspace=0, hspace=0)
 
     fig.suptitle(f"Text Bests Comparison{(' | Universe: ' + universe) * (universe != 'play')}", color=user["colors"]["text"])
     fig.text(0.5, 0.025, "Number of Texts", ha="center", color=user["colors"]["text"])
 
-    file = file_name(f"compare_{username1}_{username2}")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, f"compare_{username1}_{username2}")
 
 
 def apply_cmap(ax, user, counts, groups, extent):
@@ -1,5 +1,6 @@
 import textwrap
 from datetime import datetime, timezone
+from io import BytesIO
 
 import matplotlib
 matplotlib.use("Agg")
@@ -9,6 +10,7 @@ from PIL import Image
 from matplotlib import rcParams, image as mpimg
 from matplotlib.collections import LineCollection
 from matplotlib.colors import LinearSegmentedColormap, to_rgb
+from matplotlib.figure import Figure
 from matplotlib.legend_handler import HandlerLine2D
 from matplotlib.legend_handler import HandlerLineCollection
 from matplotlib.lines import Line2D
@@ -21,6 +23,7 @@ rcParams["axes.prop_cycle"] = plt.cycler(color=graph_palette)
 rcParams["font.family"] = "sans-serif"
 rcParams["font.sans-serif"] = ["Exo 2"]
 rcParams["font.size"] = 11
+background_users = [bot_owner, 247492668131770369]
 cmap_keegant = LinearSegmentedColormap.from_list("keegant", ["#0094FF", "#FF00DC"])
 matplotlib.colormaps.register(cmap_keegant)
 
@@ -57,31 +60,26 @@ def date_x_ticks(ax, min_timestamp, max_timestamp):
 
 
 def interpolate_segments(x, y):
-    x_segments = []
-    y_segments = []
-
-    for i in range(len(y) - 1):
-        x_range = x[-1] - x[0]
-        x_difference = x[i + 1] - x[i]
-        if x_difference == 0:
-            continue
-        x_size = x_range / x_difference
-        segment_count = max(int(50 / x_size), 2)
-        if segment_count == 2 and i < len(y) - 2:
-            x_segments.append(x[i])
-            y_segments.append(y[i])
-            continue
-
-        segments = np.linspace(y[i], y[i + 1], segment_count)
-        for v in segments[:-1]:
-            y_segments.append(v)
+    # Splits wide segments into evenly spaced points so colormapped lines blend smoothly
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) < 2:
+        return x, y
+
+    x_differences = np.diff(x)
+    x_range = x[-1] - x[0]
+    if x_range:
+        point_counts = np.maximum((50 * x_differences / x_range).astype(np.int64), 2) - 1
+    else:
+        point_counts = np.ones(len(x_differences), dtype=np.int64)
+    point_counts[x_differences == 0] = 0
 
-        segments = np.linspace(x[i], x[i + 1], segment_count)
-        for v in segments[:-1]:
-            x_segments.append(v)
+    segments = np.repeat(np.arange(len(x_differences)), point_counts)
+    segment_starts = np.cumsum(point_counts) - point_counts
+    fractions = (np.arange(len(segments)) - segment_starts[segments]) / point_counts[segments]
 
-    y_segments.append(y[-1])
-    x_segments.append(x[-1])
+    x_segments = np.append(x[segments] + x_differences[segments] * fractions, x[-1])
+    y_segments = np.append(y[segments] + np.diff(y)[segments] * fractions, y[-1])
 
     return x_segments, y_segments
 
@@ -228,6 +226,16 @@ def crop_to_ax_width(img_path, target_w):
     return np.array(cropped)
 
 
+def get_theme(user):
+    # Everything about a user that changes how their graphs look, including the
+    # username some graphs highlight
+    user_id = int(user["id"])
+    return (
+        sorted(user["colors"].items()), user_id if user_id in background_users else None,
+        user.get("username"),
+    )
+
+
 def universe_title(title, universe):
     if universe != "play":
         separator = " | " if "\n" in title else "\n"
@@ -240,6 +248,20 @@ def file_name(name):
     return f"{name}_{round(dates.now().timestamp() * 1000)}.png"
 
 
+def subplots(*args, **kwargs):
+    fig = Figure()
+    return fig, fig.subplots(*args, **kwargs)
+
+
+def save(fig, name):
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png")
+    buffer.seek(0)
+    buffer.name = file_name(name)
+
+    return buffer
+
+
 def color_distance(color1, color2):
     rgb1 = to_rgb(color1)
     rgb2 = to_rgb(color2)
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+def lttb(x, y, threshold=1000):
+    # Largest-Triangle-Three-Buckets, returns the indices of the points to keep
+    length = len(y)
+    if length <= threshold or threshold < 3:
+        return np.arange(length)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, length - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = length - 1
+
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else length
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[selected] - average_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (average_y - y[selected])
+        )
+        selected = start + int(areas.argmax())
+        indices[i + 1] = selected
+
+    return indices
+
+
+def min_max(y, buckets=1000):
+    # Indices of the lowest and highest point in each bucket, in order
+    length = len(y)
+    if length <= buckets * 2:
+        return np.arange(length)
+
+    size = -(-length // buckets)
+    buckets = -(-length // size)
+    grid = np.full(buckets * size, np.nan)
+    grid[:length] = y
+    grid = grid.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+
+    return np.unique(np.concatenate((
+        offsets + np.nanargmin(grid, axis=1),
+        offsets + np.nanargmax(grid, axis=1),
+    )))
+
+
+def scatter_indices(y, limit=10000):
+    # A uniform sample to keep the point density, plus each bucket's extremes so outliers survive
+    length = len(y)
+    if length <= limit:
+        return np.arange(length)
+
+    stride = np.linspace(0, length - 1, limit // 2).astype(np.int64)
+    extremes = min_max(y, limit // 20)
+
+    return np.union1d(stride, extremes)
+
+
+def line(x, y, threshold=1000):
+    indices = lttb(x, y, threshold)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
@@ -1,23 +1,33 @@
 import numpy as np
 
-from graphs.core import plt, color_graph, file_name, universe_title
+from graphs import downsample
+from graphs.core import color_graph, universe_title, subplots, save
 
 
 def moving_average(y, window=20):
     if len(y) < window:
         return y
-    return np.convolve(y, np.ones(window) / window, mode="valid")
+    sums = np.cumsum(np.insert(np.asarray(y, dtype=np.float64), 0, 0))
+    return (sums[window:] - sums[:-window]) / window
+
+
+def downsample_averages(x, r1_avg, r2_avg):
+    # Both lines share the x values, so keep the union of each line's points
+    indices = np.union1d(downsample.lttb(x, r1_avg), downsample.lttb(x, r2_avg))
+    return x[indices], r1_avg[indices], r2_avg[indices]
 
 
 def render(user, title, data, universe="play"):
-    x = range(1, len(data) + 1)
-    r1_wpm = [pair[0]["wpm"] for pair in data]
-    r2_wpm = [pair[1]["wpm"] for pair in data]
+    x = np.arange(1, len(data) + 1)
+    r1_wpm = np.array([pair[0]["wpm"] for pair in data])
+    r2_wpm = np.array([pair[1]["wpm"] for pair in data])
 
-    fig, ax = plt.subplots()
+    fig, ax = subplots()
 
-    ax.scatter(x, r2_wpm, color="#55ACEE", s=2, label=data[0][1]["username"])
-    ax.scatter(x, r1_wpm, color="#DD2E44", s=2, label=data[0][0]["username"])
+    r1_points = downsample.scatter_indices(r1_wpm)
+    r2_points = downsample.scatter_indices(r2_wpm)
+    ax.scatter(x[r2_points], r2_wpm[r2_points], color="#55ACEE", s=2, label=data[0][1]["username"])
+    ax.scatter(x[r1_points], r1_wpm[r1_points], color="#DD2E44", s=2, label=data[0][0]["username"])
 
     if len(x) > 1:
         window = max(5, len(x) // 20)
@@ -25,7 +35,8 @@ def render(user, title, data, universe="play"):
         r1_avg = moving_average(r1_wpm, window)
         r2_avg = moving_average(r2_wpm, window)
 
-        x_avg = range(window, len(x) + 1)
+        x_avg = np.arange(window, len(x) + 1)
+        x_avg, r1_avg, r2_avg = downsample_averages(x_avg, r1_avg, r2_avg)
 
         ax.plot(x_avg, r2_avg, color=user["colors"]["graphbackground"], linewidth=4)
         ax.plot(x_avg, r2_avg, color="#55ACEE", linewidth=1.5)
@@ -40,8 +51,4 @@ def render(user, title, data, universe="play"):
 
     ax.set_title(universe_title(title, universe))
 
-    file = file_name("encounters")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, "encounters")
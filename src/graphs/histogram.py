@@ -1,12 +1,12 @@
 import numpy as np
 from matplotlib.ticker import FuncFormatter
 
-from graphs.core import plt, color_graph, universe_title, file_name
+from graphs.core import plt, color_graph, universe_title, subplots, save
 from utils.strings import format_big_number
 
 
 def render(user, username, values, category, y_label, bins, universe):
-    fig, ax = plt.subplots()
+    fig, ax = subplots()
     counts, groups = np.histogram(values, bins=bins)
 
     color = user["colors"]["line"]
@@ -31,11 +31,7 @@ def render(user, username, values, category, y_label, bins, universe):
     color_graph(ax, user)
 
     category = category.replace(" ", "_")
-    file = file_name(f"{category.lower()}_histogram_{username}")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, f"{category.lower()}_histogram_{username}")
 
 
 def apply_cmap(ax, user, counts, groups):
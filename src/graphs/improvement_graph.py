@@ -2,42 +2,39 @@ import numpy as np
 from matplotlib.colors import hex2color
 from matplotlib.ticker import FuncFormatter
 
-from graphs.core import plt, color_graph, date_x_ticks, interpolate_segments, file_name
+from graphs import downsample
+from graphs.core import color_graph, date_x_ticks, interpolate_segments, subplots, save
 from utils.strings import format_big_number
 
 
 def render(user, wpm, title, timeframe="", timestamps=None, universe="play"):
     text_graph = "Text #" in title
     wpm = np.array(wpm)
-    best_index, best = max(enumerate(wpm), key=lambda x: x[1])
-    worst_index, worst = min(enumerate(wpm), key=lambda x: x[1])
+    best_index, worst_index = int(wpm.argmax()), int(wpm.argmin())
+    best, worst = wpm[best_index], wpm[worst_index]
 
-    fig, ax = plt.subplots()
-
-    downsample_factor = max(len(wpm) // 100000, 1)
-    downsampled_indices = np.arange(0, len(wpm), downsample_factor)
-    downsampled_wpm = wpm[downsampled_indices]
+    fig, ax = subplots()
 
     max_window = 50 if text_graph else 500
     window_size = min(max(len(wpm) // 15, 1), max_window)
 
-    if len(wpm) > 10000:
-        downsample_factor *= 10
-
-    moving_wpm = np.convolve(wpm, np.ones(window_size) / window_size, mode="valid")[0::downsample_factor]
-    x_points = np.arange(window_size - 1, len(wpm))[0::downsample_factor]
+    moving_wpm = np.convolve(wpm, np.ones(window_size) / window_size, mode="valid")
+    line_indices = downsample.lttb(np.arange(len(moving_wpm)), moving_wpm)
+    moving_wpm = moving_wpm[line_indices]
+    x_points = line_indices + window_size - 1
+    point_indices = downsample.scatter_indices(wpm)
 
     if timestamps:
         timestamps = np.array(timestamps)
-        downsampled_indices = [timestamps[d] for d in downsampled_indices]
-        x_points = [timestamps[r] for r in x_points]
+        point_x = timestamps[point_indices]
+        x_points = timestamps[x_points]
         ax.scatter(timestamps[worst_index], worst, color="#FA3244", marker=".", zorder=10)
         ax.scatter(timestamps[best_index], best, color="#53D76A", marker=".", zorder=10)
         date_x_ticks(ax, min(timestamps), max(timestamps))
 
     else:
-        downsampled_indices = [d + 1 for d in downsampled_indices]
-        x_points = [r + 1 for r in x_points]
+        point_x = point_indices + 1
+        x_points = x_points + 1
         ax.scatter(worst_index + 1, worst, color="#FA3244", marker=".", zorder=10)
         ax.scatter(best_index + 1, best, color="#53D76A", marker=".", zorder=10)
         ax.xaxis.set_major_formatter(FuncFormatter(format_big_number))
@@ -45,7 +42,7 @@ def render(user, wpm, title, timeframe="", timestamps=None, universe="play"):
     bg_color = hex2color(user["colors"]["graphbackground"])
     point_color = "white" if np.mean(bg_color) < 0.5 else "black"
 
-    ax.scatter(downsampled_indices, downsampled_wpm, alpha=0.1, s=25, color=point_color, edgecolors="none")
+    ax.scatter(point_x, wpm[point_indices], alpha=0.1, s=25, color=point_color, edgecolors="none")
 
     segment_count = 50 // (len(moving_wpm) - 1) if len(moving_wpm) > 1 else 1
     if segment_count > 1:
@@ -66,8 +63,4 @@ def render(user, wpm, title, timeframe="", timestamps=None, universe="play"):
 
     color_graph(ax, user)
 
-    file = file_name("improvement")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, "improvement")
@@ -1,34 +1,26 @@
 from matplotlib.ticker import FuncFormatter
 
-from graphs.core import plt, color_graph, interpolate_segments, date_x_ticks, file_name, filter_palette
+from graphs import downsample
+from graphs.core import plt, color_graph, interpolate_segments, date_x_ticks, filter_palette, subplots, save
 from utils.strings import format_big_number
 
 
 def render(user, lines, title, x_label, y_label):
-    fig, ax = plt.subplots()
+    fig, ax = subplots()
 
     caller = user["username"]
     caller_index = 0
     ax.set_prop_cycle(plt.cycler(color=filter_palette(user["colors"]["line"])))
     for i, l in enumerate(lines):
         username, x, y = l[:3]
-        first_x, first_y = x[0], y[0]
-        last_x, last_y = x[-1], y[-1]
-        if len(x) > 10000:
-            x = x[::len(x) // 1000]
-            y = y[::len(y) // 1000]
-        x.insert(0, first_x)
-        x.append(last_x)
-        y.insert(0, first_y)
-        y.append(last_y)
-
+        x, y = downsample.line(x, y)
         x, y = interpolate_segments(x, y)
         ax.plot(x, y, label=username)
 
         if username == caller:
             caller_index = i
 
-    plt.grid()
+    ax.grid()
     ax.set_title(title)
     ax.set_xlabel(x_label)
     ax.set_ylabel(y_label)
@@ -41,8 +33,4 @@ def render(user, lines, title, x_label, y_label):
 
     color_graph(ax, user, caller_index)
 
-    file = file_name("line")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, "line")
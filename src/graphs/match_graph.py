@@ -2,11 +2,11 @@ from collections import defaultdict
 
 import numpy as np
 
-from graphs.core import plt, color_graph, universe_title, file_name, filter_palette
+from graphs.core import plt, color_graph, universe_title, filter_palette, subplots, save
 
 
 def render(user, rankings, title, y_label, universe="play", limit_y=True, typos=[], markers=[]):
-    fig, ax = plt.subplots()
+    fig, ax = subplots()
     caller_index = 0
     starts = []
     remaining = []
@@ -95,8 +95,4 @@ def render(user, rankings, title, y_label, universe="play", limit_y=True, typos=
 
     color_graph(ax, user, caller_index, match=True)
 
-    file = file_name("match")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, "match")
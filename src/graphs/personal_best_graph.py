@@ -2,13 +2,15 @@ import numpy as np
 from matplotlib.colors import hex2color
 from matplotlib.ticker import FuncFormatter
 
-from graphs.core import plt, color_graph, date_x_ticks, interpolate_segments, universe_title, file_name
+from graphs import downsample
+from graphs.core import color_graph, date_x_ticks, interpolate_segments, universe_title, subplots, save
 from utils.strings import format_big_number
 
 
 def render(user, username, x, y, category, universe):
-    fig, ax = plt.subplots()
+    fig, ax = subplots()
 
+    x, y = downsample.line(x, y)
     x_segments, y_segments = interpolate_segments(x, y)
     ax.plot(x_segments, y_segments)
 
@@ -24,14 +26,10 @@ def render(user, username, x, y, category, universe):
         date_x_ticks(ax, x[0], x[-1])
 
     ax.set_ylabel("WPM")
-    plt.grid()
+    ax.grid()
     title = f"Personal Best Over {category.title()} - {username}"
     ax.set_title(universe_title(title, universe))
 
     color_graph(ax, user)
 
-    file = file_name(f"personal_bests_{username}_{category}")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, f"personal_bests_{username}_{category}")
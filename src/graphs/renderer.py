@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from config import render_workers, render_cache_size
+from utils import workers
+
+render_executor = None
+render_cache = OrderedDict()
+render_cache_bytes = 0
+
+
+def get_render_executor():
+    global render_executor
+    if render_executor is None:
+        render_executor = ProcessPoolExecutor(max_workers=render_workers, mp_context=workers.get_context())
+    return render_executor
+
+
+def get_cache_key(render_function):
+    # Hashes the graph function and its inputs, with users reduced to their theme
+    # so identical graphs requested by different users share an entry
+    from graphs.core import get_theme
+    args = [
+        get_theme(arg) if isinstance(arg, dict) and "colors" in arg else arg
+        for arg in render_function.args
+    ]
+    function = render_function.func
+    try:
+        data = pickle.dumps((function.__module__, function.__qualname__, args, render_function.keywords))
+    except Exception:
+        return None
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_image(key, image):
+    global render_cache_bytes
+    render_cache[key] = image
+    render_cache_bytes += len(image[1])
+
+    while render_cache_bytes > render_cache_size and render_cache:
+        _, (_, evicted) = render_cache.popitem(last=False)
+        render_cache_bytes -= len(evicted)
+
+
+async def render(render_function):
+    key = get_cache_key(render_function) if hasattr(render_function, "func") else None
+    if key in render_cache:
+        render_cache.move_to_end(key)
+        file_name, image = render_cache[key]
+        buffer = BytesIO(image)
+        buffer.name = file_name
+        return buffer
+
+    buffer = await render_uncached(render_function)
+    if key:
+        cache_image(key, (buffer.name, buffer.getvalue()))
+
+    return buffer
+
+
+async def render_uncached(render_function):
+    # Draws in a worker process, falling back to a thread when the arguments can't be pickled
+    try:
+        pickle.dumps(render_function)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return await asyncio.to_thread(render_function)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_render_executor(), render_function)
@@ -1,4 +1,4 @@
-from graphs.core import plt, color_graph, file_name
+from graphs.core import color_graph, subplots, save
 
 
 def render(user):
@@ -8,19 +8,15 @@ def render(user):
     x2 = [i for i in range(50)]
     y2 = [i + 50 for i in x2]
 
-    fig, ax = plt.subplots()
+    fig, ax = subplots()
     ax.plot(x, y, label="Data")
     ax.plot(x2, y2, label="Raw Speed", color=user["colors"]["raw"], zorder=10)
 
-    plt.grid()
+    ax.grid()
     ax.set_title("Sample Graph")
     ax.set_xlabel("X-Axis")
     ax.set_ylabel("Y-Axis")
 
     color_graph(ax, user, 0, True)
 
-    file = file_name("sample")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, "sample")
@@ -1,9 +1,9 @@
 from graphs import bar_graph
-from graphs.core import plt, color_graph, universe_title, file_name
+from graphs.core import plt, color_graph, universe_title, subplots, save
 
 
 def render(user, segments, title, x_label, universe):
-    fig, ax = plt.subplots()
+    fig, ax = subplots()
     x = range(1, len(segments) + 1)
     y = []
     raw_y = []
@@ -28,13 +28,9 @@ def render(user, segments, title, x_label, universe):
 
     ax.set_ylabel("WPM")
     ax.set_xlabel(x_label)
-    plt.grid()
+    ax.grid()
     ax.set_title(universe_title(title, universe))
 
     color_graph(ax, user)
 
-    file = file_name("segments")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, "segments")
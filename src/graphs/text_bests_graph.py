@@ -1,12 +1,14 @@
 from matplotlib.ticker import FuncFormatter
 
-from graphs.core import plt, color_graph, date_x_ticks, interpolate_segments, universe_title, file_name
+from graphs import downsample
+from graphs.core import color_graph, date_x_ticks, interpolate_segments, universe_title, subplots, save
 from utils.strings import format_big_number
 
 
 def render(user, username, x, y, category, universe):
-    fig, ax = plt.subplots()
-    x_segments, y_segments = interpolate_segments(x, y)
+    fig, ax = subplots()
+    x_line, y_line = downsample.line(x, y)
+    x_segments, y_segments = interpolate_segments(x_line, y_line)
     ax.plot(x_segments, y_segments)
 
     if category == "races":
@@ -21,7 +23,7 @@ def render(user, username, x, y, category, universe):
         ax.xaxis.set_major_formatter(FuncFormatter(format_big_number))
 
     ax.set_ylabel("WPM")
-    plt.grid()
+    ax.grid()
     title = f"Text Bests Over {category.title()} - {username}"
     ax.set_title(universe_title(title, universe))
 
@@ -33,8 +35,4 @@ def render(user, username, x, y, category, universe):
     color_graph(ax, user)
 
     category = category.replace(" ", "_")
-    file = file_name(f"text_bests_{username}_{category}")
-    plt.savefig(file)
-    plt.close(fig)
-
-    return file
+    return save(fig, f"text_bests_{username}_{category}")
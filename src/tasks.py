@@ -6,6 +6,7 @@ from aiohttp import ClientResponseError
 from dateutil.relativedelta import relativedelta
 
 import database.main.competition_results as competition_results
+import database.main.leaderboards as leaderboards
 import database.main.texts as texts
 import database.main.users as users
 from api.competitions import get_competition
@@ -14,8 +15,8 @@ from api.texts import get_text
 from api.users import get_racer
 from commands.account.download import run as download
 from commands.locks import import_lock
-from database.main import db, text_results
-from utils.logging import log
+from database.main import db, text_results, user_wpm_histogram
+from utils.logging import log, log_error
 from utils.stats import calculate_text_performances
 
 
@@ -27,50 +28,35 @@ async def import_competitions():
     now = datetime.now(utc)
     podium_users = set()
     get_podium = lambda comp: [user["username"] for user in comp["competitors"][:3]]
-
-    day_end = datetime.fromtimestamp(latest["day"]["end_time"], tz=utc)
-    offset = relativedelta(days=1, seconds=grace_period)
-    day_check = day_end + offset
-    while day_check < now:
-        start = day_check - offset
-        log(f"Importing new daily competition: {start}")
-        competition = await get_competition(start, "day")
-        competition_results.add_results(competition)
-        podium_users.update(get_podium(competition))
-        day_check += relativedelta(days=1)
-
-    week_end = datetime.fromtimestamp(latest["week"]["end_time"], tz=utc)
-    offset = relativedelta(weeks=1, seconds=grace_period)
-    week_check = week_end + offset
-    while week_check < now:
-        start = week_check - offset
-        log(f"Importing new weekly competition: {week_check - offset}")
-        competition = await get_competition(start, "week")
-        competition_results.add_results(competition)
-        podium_users.update(get_podium(competition))
-        week_check += relativedelta(weeks=1)
-
-    month_end = datetime.fromtimestamp(latest["month"]["end_time"], tz=utc)
-    offset = relativedelta(months=1, seconds=grace_period)
-    month_check = month_end + offset
-    while month_check < now:
-        start = month_check - offset
-        log(f"Importing new monthly competition: {month_check - offset}")
-        competition = await get_competition(start, "month")
-        competition_results.add_results(competition)
-        podium_users.update(get_podium(competition))
-        month_check += relativedelta(months=1)
-
-    year_end = datetime.fromtimestamp(latest["year"]["end_time"], tz=utc)
-    offset = relativedelta(years=1, seconds=grace_period)
-    year_check = year_end + offset
-    while year_check < now:
-        start = year_check - offset
-        log(f"Importing new yearly competition: {year_check - offset}")
-        competition = await get_competition(start, "year")
+    periods = {"day": "daily", "week": "weekly", "month": "monthly", "year": "yearly"}
+
+    missing = []
+    for period in ["day", "week", "month", "year"]:
+        period_end = datetime.fromtimestamp(latest[period]["end_time"], tz=utc)
+        step = relativedelta(**{f"{period}s": 1})
+        offset = step + relativedelta(seconds=grace_period)
+        period_check = period_end + offset
+        while period_check < now:
+            missing.append((period_check - offset, period))
+            period_check += step
+
+    # Scraping every missing period at once, requests are bounded by the scrape semaphore
+    # Periods after a failed fetch are left for the next run, since imports resume from the latest stored one
+    competitions = await asyncio.gather(
+        *[get_competition(start, period) for start, period in missing],
+        return_exceptions=True,
+    )
+    failed = set()
+    for (start, period), competition in zip(missing, competitions):
+        if period in failed:
+            continue
+        if isinstance(competition, Exception):
+            failed.add(period)
+            log_error(f"Failed to import {periods[period]} competition: {start}", competition)
+            continue
+        log(f"Importing new {periods[period]} competition: {start}")
         competition_results.add_results(competition)
         podium_users.update(get_podium(competition))
-        year_check += relativedelta(years=1)
 
     log("Updating award counts")
     awards_list = await competition_results.get_awards()
@@ -81,6 +67,7 @@ async def import_competitions():
         third = awards["day"]["third"] + awards["week"]["third"] + awards["month"]["third"] + awards["year"]["third"]
         users.update_awards(username, first, second, third)
 
+    leaderboards.mark_stale(["awards"])
     log("Finished importing competitions")
 
 
@@ -99,7 +86,7 @@ async def update_important_users():
 async def import_top_tens():
     from api.texts import get_top_results
 
-    text_ids = [str(text["text_id"]) for text in texts.get_texts(get_disabled=False)]
+    text_ids = [str(text["text_id"]) for text in texts.get_texts(get_disabled=False, read_only=True)]
     for text_id in text_ids:
         top_10 = await get_top_results(text_id)
         results = [(
@@ -132,7 +119,7 @@ async def update_top_tens():
     log("Updating top tens")
     await import_top_tens()
     await text_results.import_users()
-    top_10s = text_results.get_top_10s()
+    top_10s = await text_results.get_top_10s()
     user_list = set()
     for top_10 in top_10s.values():
         for score in top_10:
@@ -151,7 +138,7 @@ async def update_top_tens():
 
     log("Calculating top tens")
     for username in user_list:
-        text_bests = get_text_bests(username, race_stats=True)
+        text_bests = await get_text_bests(username, race_stats=True)
         for race in text_bests:
             text_id = race["text_id"]
             wpm = race["wpm"]
@@ -213,7 +200,7 @@ async def update_texts():
 
 async def demolish_cheaters():
     text_bests = []
-    top_10s = text_results.get_top_10s()
+    top_10s = await text_results.get_top_10s()
     for text_id, results in top_10s.items():
         text_bests.append(dict(results[0]))
 
@@ -227,3 +214,67 @@ async def demolish_cheaters():
         except:
             pass
         await asyncio.sleep(3)
+
+
+def create_rollup_tables():
+    db.run("""
+        CREATE TABLE IF NOT EXISTS user_text_bests (
+            universe TEXT NOT NULL,
+            username TEXT NOT NULL,
+            text_id INTEGER NOT NULL,
+            wpm REAL,
+            number INTEGER,
+            timestamp REAL,
+            accuracy REAL,
+            points REAL,
+            times_typed INTEGER NOT NULL,
+            PRIMARY KEY (universe, username, text_id)
+        )
+    """)
+
+    db.run("""
+        CREATE TABLE IF NOT EXISTS user_activity (
+            universe TEXT NOT NULL,
+            username TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            hour INTEGER NOT NULL,
+            races INTEGER NOT NULL,
+            PRIMARY KEY (universe, username, day, hour)
+        )
+    """)
+
+    db.run("""
+        CREATE TABLE IF NOT EXISTS user_daily_stats (
+            universe TEXT NOT NULL,
+            username TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            races INTEGER NOT NULL,
+            points REAL NOT NULL,
+            wins INTEGER NOT NULL,
+            characters INTEGER NOT NULL,
+            total_time REAL NOT NULL,
+            typing_time REAL NOT NULL,
+            wpm_total REAL NOT NULL,
+            wpm_best REAL NOT NULL,
+            accuracy_total REAL NOT NULL,
+            PRIMARY KEY (universe, username, day)
+        )
+    """)
+
+    # Race and text best counts per user, bucketed by whole adjusted WPM
+    db.run("""
+        CREATE TABLE IF NOT EXISTS user_wpm_histogram (
+            universe TEXT NOT NULL,
+            username TEXT NOT NULL,
+            wpm INTEGER NOT NULL,
+            races INTEGER NOT NULL,
+            texts INTEGER NOT NULL,
+            PRIMARY KEY (universe, username, wpm)
+        )
+    """)
+
+
+async def backfill_wpm_histogram():
+    backfilled = await user_wpm_histogram.backfill()
+    if backfilled:
+        log(f"Backfilled WPM histograms for {backfilled:,} users")
@@ -1,9 +1,10 @@
-import os
+from io import BytesIO
 
 from discord import Embed, ButtonStyle, File
 from discord.ui import View, Button
 
-from utils import urls, strings, files
+from graphs import renderer
+from utils import urls, strings
 
 
 class Page:
@@ -94,8 +95,6 @@ class Message(View):
                 self.update_footer(embed, f"Text Pool: {self.text_pool.title()}")
             self.embeds.append(embed)
 
-        if self.pages[self.index].render:
-            self.update_image()
         if self.page_count > 1:
             if self.paginated:
                 self.add_navigation_buttons()
@@ -196,8 +195,6 @@ class Message(View):
                 return await interaction.response.defer()
 
             self.index = index
-            if self.pages[self.index].render:
-                self.update_image()
             self.clear_items()
             self.add_buttons()
 
@@ -205,14 +202,18 @@ class Message(View):
 
         return callback
 
-    def update_image(self):
+    async def update_image(self):
         index = self.index
         if index not in self.cache:
             page = self.pages[index]
-            file_name = page.render()
-            self.cache[index] = file_name
+            buffer = await renderer.render(page.render)
+            self.cache[index] = (buffer.name, buffer.getvalue())
+
+        self.embeds[index].set_image(url=f"attachment://{self.cache[index][0]}")
 
-        self.embeds[index].set_image(url=f"attachment://{self.cache[index]}")
+    def get_file(self):
+        file_name, image = self.cache[self.index]
+        return File(BytesIO(image), filename=file_name)
 
     async def update_embed(self, interaction):
         if self.ctx.author.id != interaction.user.id:
@@ -223,9 +224,8 @@ class Message(View):
             "view": self,
         }
         if self.pages[self.index].render:
-            file_name = self.cache[self.index]
-            file = File(file_name, filename=os.path.basename(file_name))
-            kwargs["attachments"] = [file]
+            await self.update_image()
+            kwargs["attachments"] = [self.get_file()]
         else:
             kwargs["attachments"] = []
         await interaction.response.edit_message(**kwargs)
@@ -237,17 +237,14 @@ class Message(View):
             "content": self.content,
         }
         if self.pages[self.index].render:
-            file_name = self.cache[self.index]
-            file = File(file_name, filename=os.path.basename(file_name))
-            kwargs["files"] = [file]
+            await self.update_image()
+            kwargs["files"] = [self.get_file()]
         self.message = await self.ctx.send(**kwargs)
 
     async def on_timeout(self):
         await super().on_timeout()
         if len(self.pages) > 1:
             await self.message.edit(view=None)
-        for file in self.cache.values():
-            files.remove_file(file)
 
 
 def get_pages(data_list, formatter, page_count=10, per_page=10):
@@ -1,9 +1,13 @@
 import re
+import zlib
 
 from api.users import get_stats
 from database.main import club_races
+from utils import vectorized_logs
 from utils.stats import calculate_wpm
 
+sub_action_pattern = re.compile(r"(\d+[+\-$].)")
+
 
 def separate_delays(log, old=False):
     quote = []
@@ -57,7 +61,7 @@ async def get_log_details(race, get_keystrokes=False, get_typos=False):
     if not action_data:
         log_details = get_old_log_stats(delay_data, race["quote"], multiplier)
     else:
-        log_details = get_log_stats(delay_data, action_data, multiplier, get_typos)
+        log_details = vectorized_logs.get_log_stats(delay_data, action_data, multiplier, get_typos)
 
     for key, value in log_details.items():
         race[key] = value
@@ -74,7 +78,7 @@ async def get_log_details(race, get_keystrokes=False, get_typos=False):
         username = race["username"]
         stats = await get_stats(username)
         if not stats["disqualified"]:
-            club_races.add_race(username, race["number"], race)
+            await club_races.add_race(username, race["number"], race)
 
     if not get_keystrokes or not action_data:
         return race
@@ -216,6 +220,31 @@ def get_log_stats(delay_data, action_data, multiplier=12000, typos=False):
     return details
 
 
+def get_import_stats(typing_log, quote, multiplier):
+    try:
+        delay_data, action_data = split_log(typing_log)
+    except TypeError:
+        typing_log = zlib.decompress(typing_log).decode("utf-8")
+        delay_data, action_data = split_log(typing_log)
+
+    if not action_data:
+        log_details = get_old_log_stats(delay_data, quote, multiplier)
+    else:
+        log_details = vectorized_logs.get_log_stats(delay_data, action_data, multiplier)
+
+    # Only returning the columns stored per race to keep results small across processes
+    import_stats = {key: log_details[key] for key in [
+        "unlagged", "adjusted", "duration", "raw_adjusted", "pauseless_adjusted",
+        "start", "correction_time", "pause_time",
+    ] if key in log_details}
+
+    return typing_log, import_stats
+
+
+def get_import_stats_batch(jobs):
+    return [get_import_stats(*job) for job in jobs]
+
+
 def get_keystroke_wpm(delays, multiplier, adjusted=False):
     average_wpm = []
     duration = 0
@@ -233,6 +262,9 @@ def get_keystroke_wpm(delays, multiplier, adjusted=False):
 
 
 def get_mistakes(quote, action_list):
+    # Replays the keystrokes word by word, tracking how much of the text box matches the current
+    # word so each sub-action only rechecks from the edited position
+    # Actions record the completed quote length and the text box, the replay page joins them into the input
     typos = []
     typo_flag = False
     quote_words = [word + " " for word in quote.split(" ")]
@@ -240,33 +272,35 @@ def get_mistakes(quote, action_list):
     processed_actions = []
 
     current_word_index = 0
-    completed_words = []
+    current_word = quote_words[0]
+    completed_length = 0
     text_box = []
+    matched = 0
 
     for action in action_list:
         delay, action = action.split(",", 1)
         delay = int(delay)
-        sub_list = re.findall(r"(\d+[+\-$].)", action)
 
-        for sub_action in sub_list:
+        for sub_action in sub_action_pattern.findall(action):
             operator = sub_action[-2]
             index, char = int(sub_action[:-2]), sub_action[-1]
 
             if operator == "+":
+                index = min(index, len(text_box))
                 text_box.insert(index, char)
             elif operator == "$":
                 text_box[index] = char
             else:
                 text_box.pop(index)
 
-            current_word = quote_words[current_word_index]
-            text_string = "".join(text_box)
+            if index <= matched:
+                matched = match_length(text_box, current_word, index)
 
-            is_typo = text_string[:len(current_word)] != current_word[:len(text_string)]
+            is_typo = matched < min(len(text_box), len(current_word))
 
             if is_typo and not typo_flag and operator != "-":
                 typo_flag = True
-                typo_index = len("".join(completed_words) + "".join(text_box)) - 1
+                typo_index = completed_length + len(text_box) - 1
                 word = current_word.rstrip()
                 typos.append((current_word_index, typo_index, word))
             elif not is_typo and typo_flag:
@@ -275,19 +309,32 @@ def get_mistakes(quote, action_list):
         processed_actions.append({
             "typoFlag": typo_flag,
             "timeDelta": delay,
-            "input": "".join(completed_words) + "".join(text_box),
-            "targetWord": quote_words[current_word_index].strip(),
+            "completed": completed_length,
+            "textBox": "".join(text_box),
+            "targetWord": current_word.strip(),
         })
 
-        while "".join(text_box).startswith(quote_words[current_word_index]):
-            completed_words.append(quote_words[current_word_index])
+        while matched == len(current_word) <= len(text_box):
+            completed_length += len(current_word)
             current_word_index += 1
-            text_box = list("".join(text_box)[len(quote_words[current_word_index - 1]):])
+            text_box = text_box[len(current_word):]
 
             if current_word_index >= len(quote_words):
                 break
 
-        if "".join(completed_words) == quote:
+            current_word = quote_words[current_word_index]
+            matched = match_length(text_box, current_word)
+
+        if completed_length == len(quote):
             break
 
     return typos, processed_actions
+
+
+def match_length(text_box, word, start=0):
+    # Length of the common prefix of the text box and the word, known to match up to start
+    end = min(len(text_box), len(word))
+    while start < end and text_box[start] == word[start]:
+        start += 1
+
+    return start
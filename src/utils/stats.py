@@ -1,6 +1,11 @@
+import numpy as np
+
 from database.main import texts
 from database.main.texts import filter_disabled
 
+performance_weights = np.empty(0)
+difficulty_lookup = (None, None)
+
 
 def calculate_points(quote, wpm):
     return (wpm / 60) * len(quote.split(" "))
@@ -67,25 +72,48 @@ def calculate_performance(wpm, difficulty):
     return wpm ** 1.5 * difficulty ** 1.2
 
 
+def get_performance_weights(count):
+    # Geometric weights for ranked scores, grown as needed and shared between calls
+    global performance_weights
+    if len(performance_weights) < count:
+        performance_weights = 0.95 ** np.arange(max(count, 2 * len(performance_weights)))
+
+    return performance_weights[:count]
+
+
+def get_difficulty_lookup(text_list):
+    # Difficulties indexed by text ID, rebuilt whenever the text catalogue is
+    global difficulty_lookup
+    if difficulty_lookup[0] is not text_list:
+        lookup = np.zeros(max(text_list, default=0) + 1, dtype=np.float64)
+        lookup[list(text_list)] = [text["difficulty"] or 0 for text in text_list.values()]
+        difficulty_lookup = (text_list, lookup)
+
+    return difficulty_lookup[1]
+
+
 def calculate_total_performance(text_bests, text_list):
-    scores = []
-    for race in text_bests:
-        text_id = race["text_id"]
-        wpm = race["wpm"]
-        difficulty = text_list[text_id]["difficulty"]
-        performance = calculate_performance(wpm, difficulty)
-        scores.append({**race, "performance": performance})
+    lookup = get_difficulty_lookup(text_list)
+    text_ids = np.fromiter((race["text_id"] for race in text_bests), np.int64, len(text_bests))
+    wpms = np.fromiter((race["wpm"] for race in text_bests), np.float64, len(text_bests))
+    scores = -np.sort(-calculate_performance(wpms, lookup[text_ids]))
 
-    scores.sort(key=lambda x: -x["performance"])
-    total_performance = 0
-    for i, score in enumerate(scores):
-        total_performance += score["performance"] * (0.95 ** i)
+    return float(scores @ get_performance_weights(len(scores)))
 
-    return total_performance
+
+def calculate_total_performances(user_indexes, text_ids, wpms, text_list, user_count):
+    # Weighted performance for many users at once, each row being one of a user's text bests
+    scores = calculate_performance(wpms, get_difficulty_lookup(text_list)[text_ids])
+    order = np.lexsort((-scores, user_indexes))
+    user_indexes = user_indexes[order]
+    ranks = np.arange(len(order)) - np.searchsorted(user_indexes, user_indexes)
+    weights = get_performance_weights(ranks.max(initial=0) + 1)[ranks]
+
+    return np.bincount(user_indexes, weights=scores[order] * weights, minlength=user_count)
 
 
 def calculate_text_performances(text_bests, universe="play"):
-    text_dict = texts.get_texts(True, False, universe)
+    text_dict = texts.get_texts(True, False, universe, read_only=True)
     min_difficulty = min(text["difficulty"] for text in text_dict.values())
     max_difficulty = max(text["difficulty"] for text in text_dict.values())
     for i in range(len(text_bests)):
@@ -104,20 +132,3 @@ def calculate_text_performances(text_bests, universe="play"):
         })
         text_bests[i] = score
 
-
-def get_top_disjoint_windows(windows, count=10):
-    top_windows = []
-    used_ranges = []
-    for start_index, end_index, race_count in windows:
-        overlap = False
-        for s, e in used_ranges:
-            if not (end_index <= s or start_index >= e):
-                overlap = True
-                break
-        if not overlap:
-            top_windows.append((start_index, end_index, race_count))
-            used_ranges.append((start_index, end_index))
-            if len(top_windows) == count:
-                break
-
-    return top_windows
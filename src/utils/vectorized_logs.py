@@ -0,0 +1,156 @@
+import re
+
+import numpy as np
+
+from utils.stats import calculate_wpm
+
+delay_pattern = re.compile(r"(-?\d+)|\x08(.)|(.)")
+action_pattern = re.compile(r"\d+,(?:\d+[+\-$].?)+,")
+operation_pattern = re.compile(r"\d+[+\-$].?")
+
+
+def separate_delays(delay_data):
+    matches = delay_pattern.findall(delay_data)
+    quote = "".join([escaped or char for delay, escaped, char in matches if not delay])
+    delays = np.array([delay for delay, _, _ in matches if delay], dtype=np.int64)
+    np.maximum(delays, 0, out=delays)
+
+    return quote, delays
+
+
+def distribute_start_lag(delays):
+    # Also returns which delays became floats, as logs.distribute_start_lag leaves the rest as ints
+    delays = delays.astype(np.float64)
+    over = np.flatnonzero(delays[1:] > 1)
+    lagged_chars = int(over[0]) + 1 if over.size else len(delays)
+    delays[:lagged_chars] = delays[0] / lagged_chars
+
+    return delays, np.arange(len(delays)) < lagged_chars
+
+
+def to_list(values, floats):
+    # Python values typed like the list based engine, so sums add up in exactly the same way
+    return [value if is_float else int(value) for value, is_float in zip(values.tolist(), floats.tolist())]
+
+
+def tokenize_actions(actions):
+    # Flattens keystrokes into stack events, substitutions being a removal followed by an insertion
+    pushes = []
+    event_delays = []
+    characters = 0
+    for keystroke in actions:
+        delay = int(keystroke[:keystroke.index(",")])
+        for operation in operation_pattern.findall(keystroke):
+            operator = operation[-2]
+            if operator == "$":
+                pushes += [False, True]
+                event_delays += [delay, 0]
+            else:
+                pushes.append(operator == "+")
+                event_delays.append(delay)
+                if operator != "-":
+                    characters += 1
+            delay = 0
+
+    return np.array(pushes, dtype=bool), np.array(event_delays, dtype=np.int64), characters
+
+
+def get_raw_delays(pushes, event_delays):
+    # Replays the keystroke stack: heights follow a running sum clamped at zero, and a
+    # pushed delay survives if the stack never drops below its slot afterwards
+    steps = np.where(pushes, 1, -1)
+    totals = np.cumsum(steps)
+    heights = totals - np.minimum(np.minimum.accumulate(totals), 0)
+    lowest_after = np.minimum.accumulate(heights[::-1])[::-1]
+    surviving = pushes & (lowest_after >= heights)
+
+    return event_delays[surviving]
+
+
+def get_log_stats(delay_data, action_data, multiplier=12000, typos=False):
+    quote, delays = separate_delays(delay_data)
+    duration = int(delays.sum())
+    delays, delay_floats = distribute_start_lag(delays)
+    distributed = bool(delay_floats[1:2].any())
+    delay_list = to_list(delays, delay_floats)
+
+    # Real Speeds
+    start = delay_list[0]
+    unlagged = calculate_wpm(delay_list, duration, multiplier)
+    adjusted = calculate_wpm(delay_list, duration, multiplier, start)
+
+    details = dict(
+        quote=quote,
+        delays=delay_list,
+        duration=duration,
+        unlagged=unlagged,
+        adjusted=adjusted,
+        start=start,
+        distributed=distributed,
+    )
+
+    actions = action_pattern.findall(action_data)
+    if typos:
+        from utils.logs import get_mistakes
+        details["typos"], details["processed_actions"] = get_mistakes(quote, actions)
+
+    # Raw Speeds
+    pushes, event_delays, characters = tokenize_actions(actions)
+    raw_delays = get_raw_delays(pushes, event_delays)
+    if raw_delays.sum() == 0:
+        return details
+    raw_delays, raw_floats = distribute_start_lag(raw_delays)
+
+    # Removing trailing delays
+    if len(raw_delays) > len(delays):
+        last_delay = np.flatnonzero(raw_delays)[-1]
+        end = max(last_delay + 1, len(delays))
+        raw_delays, raw_floats = raw_delays[:end], raw_floats[:end]
+
+    # Taking the fastest time per character
+    overlap = min(len(raw_delays), len(delays))
+    faster = delays[:overlap] < raw_delays[:overlap]
+    raw_delays[:overlap] = np.where(faster, delays[:overlap], raw_delays[:overlap])
+    raw_floats[:overlap] = np.where(faster, delay_floats[:overlap], raw_floats[:overlap])
+
+    # Finding pauses
+    raw_delay_list = to_list(raw_delays, raw_floats)
+    raw_start = raw_delay_list[0]
+    average = sum(raw_delay_list[1:]) / max(len(raw_delay_list) - 1, 1)
+    paused = (raw_delays[1:] >= average * 5).tolist()
+    pauseless_delays = [raw_start] + [
+        average if is_paused else delay for delay, is_paused in zip(raw_delay_list[1:], paused)
+    ]
+    pauses = [i + 1 for i, is_paused in enumerate(paused) if is_paused]
+
+    raw_duration = sum(raw_delay_list)
+    raw_unlagged = calculate_wpm(raw_delay_list, raw_duration, multiplier)
+    raw_adjusted = calculate_wpm(raw_delay_list, raw_duration, multiplier, raw_start)
+    correction_time = round(duration - raw_duration)
+    correction_percent = correction_time / duration if duration else 0
+
+    pauseless_duration = sum(pauseless_delays)
+    pauseless_unlagged = calculate_wpm(pauseless_delays, pauseless_duration, multiplier)
+    pauseless_adjusted = calculate_wpm(pauseless_delays, pauseless_duration, multiplier, pauseless_delays[0])
+    pause_time = round(raw_duration - pauseless_duration)
+    pause_percent = pause_time / raw_duration if raw_duration else 0
+
+    details.update(dict(
+        raw_start=raw_start,
+        raw_duration=raw_duration,
+        raw_delays=raw_delay_list,
+        raw_unlagged=raw_unlagged,
+        raw_adjusted=raw_adjusted,
+        correction_time=correction_time,
+        correction_percent=correction_percent,
+        pauseless_duration=pauseless_duration,
+        pauseless_delays=pauseless_delays,
+        pauseless_unlagged=pauseless_unlagged,
+        pauseless_adjusted=pauseless_adjusted,
+        pause_time=pause_time,
+        pause_percent=pause_percent,
+        pauses=pauses,
+        characters=characters,
+    ))
+
+    return details
@@ -0,0 +1,117 @@
+from bisect import bisect_left
+
+import numpy as np
+
+
+def get_start_times(timestamps, total_times, text_ids, wpms, text_lengths):
+    # When a race started, estimated from the text length for races without a logged time
+    lookup = np.zeros(max(text_lengths, default=0) + 1, dtype=np.float64)
+    lookup[list(text_lengths)] = list(text_lengths.values())
+    text_ids = np.asarray(text_ids, dtype=np.int64)
+    known = (text_ids >= 0) & (text_ids < len(lookup))
+    lengths = np.where(known, lookup[np.where(known, text_ids, 0)], 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estimated = np.where(wpms > 0, lengths * 12 / wpms, 0)
+
+    return timestamps - np.where(total_times > 0, total_times / 1000, estimated)
+
+
+def prefix_sums(values):
+    sums = np.zeros(len(values) + 1, dtype=np.float64)
+    np.cumsum(values, out=sums[1:])
+    return sums
+
+
+def window_sums(values, size):
+    # Sums of every run of `size` consecutive values
+    sums = prefix_sums(values)
+    return sums[size:] - sums[:-size]
+
+
+def fastest_race_windows(timestamps, start_times, number):
+    # Time taken to complete every run of `number` races
+    starts = np.arange(len(timestamps) - number + 1)
+    ends = starts + number
+
+    return starts, ends, timestamps[ends - 1] - start_times[starts]
+
+
+def fastest_sum_windows(timestamps, start_times, values, target):
+    # For each starting race, the shortest run of races whose values add up to the target
+    sums = prefix_sums(values)
+    ends = np.searchsorted(sums, sums[:-1] + target, side="left")
+    starts = np.flatnonzero(ends < len(sums))
+    ends = ends[starts]
+
+    return starts, ends, timestamps[ends - 1] - start_times[starts]
+
+
+def duration_counts(timestamps, start_times, seconds):
+    # For each starting race, how many races finished within the duration
+    starts = np.arange(len(timestamps))
+    ends = np.searchsorted(timestamps, start_times + seconds, side="right")
+    counts = ends - starts
+    starts = np.flatnonzero(counts > 0)
+
+    return starts, ends[starts], counts[starts]
+
+
+def duration_sums(timestamps, start_times, values, seconds):
+    # For each ending race, the total value of the races that started within the duration
+    earliest = np.maximum.accumulate(start_times)
+    starts = np.searchsorted(earliest, timestamps - seconds, side="left")
+    ends = np.arange(1, len(timestamps) + 1)
+    valid = starts < ends
+    starts, ends = starts[valid], ends[valid]
+    sums = prefix_sums(values)
+
+    return starts, ends, sums[ends] - sums[starts]
+
+
+def sessions(timestamps, start_times, seconds):
+    # Splits races wherever the break before a race is at least the given length,
+    # returning each session's race count and time spent between its races
+    gaps = timestamps[1:] - start_times[:-1]
+    breaks = gaps >= seconds
+    session_ids = np.concatenate(([0], np.cumsum(breaks)))
+    session_count = session_ids[-1] + 1
+
+    starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+    ends = np.append(starts[1:], len(timestamps))
+    counts = ends - starts
+    durations = np.bincount(session_ids[1:], weights=np.where(breaks, 0, gaps), minlength=session_count)
+
+    return starts, ends, counts, durations
+
+
+def top_disjoint(starts, ends, values, count=10, reverse=True, chunk_size=4096):
+    # Greedily picks the best windows that share no races, ends are exclusive
+    # Ties keep their original order
+    order = np.argsort(-values if reverse else values, kind="stable")
+    chosen_starts = []
+    chosen_ends = []
+    top = []
+
+    for offset in range(0, len(order), chunk_size):
+        candidates = order[offset:offset + chunk_size]
+        if chosen_starts:
+            candidate_starts = starts[candidates, None]
+            candidate_ends = ends[candidates, None]
+            overlaps = (candidate_starts < np.array(chosen_ends)) & (candidate_ends > np.array(chosen_starts))
+            candidates = candidates[~overlaps.any(axis=1)]
+
+        for index in candidates:
+            start, end = int(starts[index]), int(ends[index])
+            position = bisect_left(chosen_starts, start)
+            if position > 0 and chosen_ends[position - 1] > start:
+                continue
+            if position < len(chosen_starts) and chosen_starts[position] < end:
+                continue
+
+            chosen_starts.insert(position, start)
+            chosen_ends.insert(position, end)
+            top.append((start, end, values[index].item()))
+            if len(top) == count:
+                return top
+
+    return top
@@ -0,0 +1,12 @@
+import multiprocessing
+
+# Imported once by the fork server, so each worker starts with them loaded
+worker_modules = ["utils.logs", "graphs.core"]
+
+
+def get_context():
+    # Forking a process that's running database and discord threads can inherit held locks,
+    # so workers are forked from a clean server process instead
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(worker_modules)
+    return context
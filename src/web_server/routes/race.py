@@ -3,8 +3,7 @@ from datetime import datetime
 import aiohttp_jinja2
 
 from api.races import get_universe_multiplier
-from api.users import get_stats
-from commands.account.download import run as download
+from commands.account.download import sync_user
 from database.main import users, races, texts
 from utils.stats import calculate_wpm
 from utils.strings import get_segments
@@ -28,8 +27,7 @@ async def race_page(request):
     if not db_stats:
         raise ValueError("Import Required")
 
-    stats = await get_stats(username, universe=universe)
-    await download(racer=stats, universe=universe)
+    stats = await sync_user(username, universe)
 
     race_info = await races.get_race(username, race_number, universe, get_log=True, get_typos=True)
     if not race_info:
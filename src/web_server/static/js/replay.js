@@ -72,12 +72,13 @@ const cumulativeRawTimes = [];
     }
 }
 
-// Pre-calculate cumulative timestamp for every action (for O(1) lookup)
+// Pre-calculate cumulative timestamp and typed text for every action (for O(1) lookup)
 {
     let runningTime = 0;
     actionList.forEach(action => {
         runningTime += action.timeDelta;
         action.timestamp = runningTime;
+        action.input = quote.slice(0, action.completed) + action.textBox;
     });
 }
 